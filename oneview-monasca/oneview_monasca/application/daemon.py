@@ -18,12 +18,19 @@
 """Creates and start a coordinator to start the application.
 """
 
+from oneview_monasca.manager.session_pool import OneViewSessionPool
+from oneview_monasca.manager.alert_index import AlertIndex
+from oneview_monasca.manager.alert_cache import AlertCache
 from oneview_monasca.manager.manager_oneview import ManagerOneView
 from oneview_monasca.manager.manager_monasca import ManagerMonasca
+from oneview_monasca.manager.sender import MetricSender
+from oneview_monasca.manager.spool import MetricSpool
 from oneview_monasca.eventbus.node_discovery import EventBUS
 from oneview_monasca.eventbus.priority import PriorityENUM
 from oneview_monasca.publisher.keeper import Keeper
 from oneview_monasca.publisher.puller import Puller
+from oneview_monasca.shared.retry_policy import RetryPolicy
+from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import log as logging
 from oneview_monasca.publisher.scmb import SCMB
 from oneview_monasca.shared import utils
@@ -51,6 +58,22 @@ class Daemon(object):
         self._keeper = None
         self._puller = None
         self._scmb = None
+        self._sender = None
+        self._spool = None
+        # The OneView session shared by all publishers
+        self._session_pool = OneViewSessionPool(
+            self._get_option('oneview', 'session_ttl', const.ONEVIEW_SESSION_TTL)
+        )
+        # The alerts of the server hardware shared by all publishers
+        self._alert_cache = AlertCache(
+            ttl=self._get_option('oneview', 'alert_cache_ttl', const.ALERT_CACHE_TTL),
+            max_size=self._get_option('oneview', 'alert_cache_size', const.ALERT_CACHE_SIZE)
+        )
+        # The active alerts kept up to date by the SCMB, if enabled
+        self._alert_index = AlertIndex() if self._get_option('DEFAULT', 'scmb_alerts', 'false') == 'true' else None
+        # The retry budget and circuit breaker of each dependency, shared by all managers
+        self._oneview_policy = self._get_retry_policy('oneview', 'oneview')
+        self._monasca_policy = self._get_retry_policy('openstack', 'monasca')
 
         # Setting debug mode
         self.debug = True if conf.DEFAULT.debug == 'true' else False
@@ -63,6 +86,9 @@ class Daemon(object):
 
         utils.print_log_message('Info', 'Creating Publishers', LOG)
         # Create publishers.
+        if self.spool is not None:
+            self.spool.replay()
+        self.sender.start()
         self.keeper.publish()
         self.puller.publish()
         self.scmb.publish()
@@ -98,11 +124,55 @@ class Daemon(object):
         self.keeper.stop()
         self.puller.stop()
         self.scmb.stop()
+        self.sender.stop()
+        if self.spool is not None:
+            self.spool.stop()
         # Discarding publishers reference in Daemon
-        self.scmb = self.puller = self.keeper = None
+        self.scmb = self.puller = self.keeper = self.sender = self.spool = None
 
         utils.print_log_message('Info', 'Oneview Monasca Daemon stopped, preparing to re-initialize', LOG)
 
+    def _get_option(self, section, option, default=None):
+        """Get an optional value from the configuration file
+
+        :param section: the name of the configuration section
+        :param option: the name of the option into the section
+        :param default: the value returned if the option is not set
+        """
+        try:
+            return getattr(getattr(self._conf, section), option)
+        except AttributeError:
+            return default
+
+    def _get_retry_policy(self, section, name):
+        """Get the retry policy of a dependency configured in its section
+
+        :param section: the name of the configuration section of the dependency
+        :param name: the name of the dependency
+        """
+        return RetryPolicy(
+            name,
+            base_wait=self._get_option(section, 'retry_base_wait', const.RETRY_BASE_WAIT),
+            max_wait=self._get_option(section, 'retry_max_wait', const.RETRY_MAX_WAIT),
+            budget_ratio=self._get_option(section, 'retry_budget_ratio', const.RETRY_BUDGET_RATIO),
+            budget_size=self._get_option(section, 'retry_budget_size', const.RETRY_BUDGET_SIZE),
+            failure_threshold=self._get_option(section, 'breaker_failure_threshold', const.BREAKER_FAILURE_THRESHOLD),
+            reset_timeout=self._get_option(section, 'breaker_reset_timeout', const.BREAKER_RESET_TIMEOUT)
+        )
+
+    def _get_retry_policies(self):
+        """Get the retry policies of the agent and of the drivers, with its component
+        """
+        policies = [
+            (const.AGENT_METRIC_COMPONENT, self._oneview_policy), (const.AGENT_METRIC_COMPONENT, self._monasca_policy)
+        ]
+        return policies + self.eventbus.retry_policies()
+
+    def _get_agent_metrics(self):
+        """Get the metrics of the statistics of the agent components, if they are running
+        """
+        return self._puller.metrics() if self._puller is not None else {}
+
     def _get_manager_oneview(self):
         """Get a instance of Manager Oneview
         """
@@ -111,7 +181,11 @@ class Daemon(object):
             username=self._conf.oneview.username,
             password=self._conf.oneview.password,
             max_attempt=self._conf.DEFAULT.auth_retry_limit,
-            certificates_directory=self._conf.DEFAULT.scmb_certificate_dir
+            certificates_directory=self._conf.DEFAULT.scmb_certificate_dir,
+            session_pool=self._session_pool,
+            alert_cache=self._alert_cache,
+            alert_index=self._alert_index,
+            retry_policy=self._oneview_policy
         )
 
     def _get_manager_monasca(self):
@@ -123,7 +197,8 @@ class Daemon(object):
             password=self._conf.openstack.auth_password,
             project_name=self._conf.openstack.auth_tenant_name,
             api_version=self._conf.openstack.monasca_api_version,
-            debug=self.debug
+            debug=self.debug,
+            retry_policy=self._monasca_policy
         )
 
     @property
@@ -135,6 +210,58 @@ class Daemon(object):
 
         return self._eventbus
 
+    @property
+    def sender(self):
+        """Get a instance of the metric sender
+        """
+        if self._sender is None:
+            self._sender = MetricSender(
+                self._get_manager_monasca(),
+                queue_size=self._get_option('DEFAULT', 'send_queue_size', const.SENDER_QUEUE_SIZE),
+                batch_size=self._get_option('DEFAULT', 'send_batch_size', const.SENDER_BATCH_SIZE),
+                linger_time=self._get_option('DEFAULT', 'send_linger_time', const.SENDER_LINGER_TIME),
+                overflow_policy=self._get_option('DEFAULT', 'send_overflow_policy', const.SENDER_OVERFLOW_POLICY),
+                workers=self._get_option('DEFAULT', 'send_workers', const.SENDER_WORKERS),
+                spill=self.spool.append if self.spool is not None else None,
+                debug=self.debug
+            )
+
+        return self._sender
+
+    @sender.setter
+    def sender(self, value):
+        """Set sender property with input value
+
+        :param value: the new value of sender property
+        """
+        self._sender = value
+
+    @property
+    def spool(self):
+        """Get a instance of the metric spool, if a spool directory is set
+        """
+        spool_dir = self._get_option('DEFAULT', 'spool_dir')
+        if self._spool is None and spool_dir:
+            self._spool = MetricSpool(
+                self._get_manager_monasca(),
+                spool_dir,
+                segment_size=self._get_option('DEFAULT', 'spool_segment_size', const.SPOOL_SEGMENT_SIZE),
+                max_size=self._get_option('DEFAULT', 'spool_max_size', const.SPOOL_MAX_SIZE),
+                replay_rate=self._get_option('DEFAULT', 'spool_replay_rate', const.SPOOL_REPLAY_RATE),
+                replay_interval=self._get_option('DEFAULT', 'spool_replay_interval', const.SPOOL_REPLAY_INTERVAL),
+                debug=self.debug
+            )
+
+        return self._spool
+
+    @spool.setter
+    def spool(self, value):
+        """Set spool property with input value
+
+        :param value: the new value of spool property
+        """
+        self._spool = value
+
     @property
     def keeper(self):
         """Get a instance of keeper
@@ -142,8 +269,15 @@ class Daemon(object):
         if self._keeper is None:
             self._keeper = Keeper(
                 self._get_manager_oneview(),
-                self._get_manager_monasca(),
+                self.sender,
                 self._conf.DEFAULT.batch_publishing_interval,
+                change_only=self._get_option('DEFAULT', 'change_only_emission', 'false') == 'true',
+                meta_ttl=self._get_option('DEFAULT', 'alert_meta_ttl', const.KEEPER_META_TTL),
+                prefetch_threshold=self._get_option(
+                    'DEFAULT', 'alert_prefetch_threshold', const.ALERT_PREFETCH_THRESHOLD
+                ),
+                retry_policies=self._get_retry_policies,
+                agent_metrics=self._get_agent_metrics,
                 debug=self.debug
             )
 
@@ -166,6 +300,14 @@ class Daemon(object):
                 self._get_manager_oneview(),
                 self._conf.DEFAULT.periodic_refresh_interval,
                 self.crash_callback,
+                bulk_collection=self._get_option('DEFAULT', 'bulk_status_collection', 'false') == 'true',
+                fetch_workers=self._get_option('DEFAULT', 'status_fetch_workers', const.PULLER_FETCH_WORKERS),
+                appliance_concurrency=self._get_option(
+                    'DEFAULT', 'appliance_concurrency', const.PULLER_APPLIANCE_CONCURRENCY
+                ),
+                publish_batch_size=self._get_option(
+                    'DEFAULT', 'status_publish_batch_size', const.PULLER_PUBLISH_BATCH_SIZE
+                ),
                 debug=self.debug
             )
 
@@ -184,11 +326,27 @@ class Daemon(object):
         """Get a instance of scmb
         """
         if self._scmb is None:
+            # The durable queue is shared by the agents of the same group
+            durable_queue = None
+            if self._get_option('DEFAULT', 'scmb_durable_queue', 'false') == 'true':
+                durable_queue = const.SCMB_DURABLE_QUEUE_PREFIX + self._conf.tooz.group_name
+
             self._scmb = SCMB(
                 self._get_manager_oneview(),
                 self._conf.oneview.host,
                 self._conf.DEFAULT.auth_retry_limit,
                 self.crash_callback,
+                workers=self._get_option('DEFAULT', 'scmb_workers', const.SCMB_WORKERS),
+                queue_size=self._get_option('DEFAULT', 'scmb_queue_size', const.SCMB_QUEUE_SIZE),
+                coalesce_window=self._get_option('DEFAULT', 'scmb_coalesce_window', const.SCMB_COALESCE_WINDOW),
+                alert_index=self._alert_index,
+                resource_bindings=self._get_option('DEFAULT', 'scmb_resource_bindings', 'false') == 'true',
+                binding_threshold=self._get_option('DEFAULT', 'scmb_binding_threshold', const.SCMB_BINDING_THRESHOLD),
+                durable_queue=durable_queue,
+                prefetch_count=self._get_option('DEFAULT', 'scmb_prefetch_count', const.SCMB_PREFETCH_COUNT),
+                async_consumer=self._get_option('DEFAULT', 'scmb_async_consumer', 'false') == 'true',
+                heartbeat=self._get_option('DEFAULT', 'scmb_heartbeat', const.SCMB_HEARTBEAT),
+                alert_cache=self._alert_cache if self._alert_cache.enabled else None,
                 debug=self.debug
             )
 
@@ -33,7 +33,8 @@ class EventBUS(object):
     """
     This class is responsible for receiving events from multiple plugins,
     set the metrics by a single identifier (server_hardware_uuid) and publish to
-    listeners.
+    listeners. The listeners receive frozensets of immutable node snapshots,
+    that are replaced (never changed) when the metrics of a node change.
     """
     _metaclass__ = utils.SingletonType
 
@@ -101,6 +102,16 @@ class EventBUS(object):
         except Exception as e:
             utils.print_log_message('Error', e, LOG)
 
+    def retry_policies(self):
+        """
+        Get the retry policies of the dependencies of the drivers.
+
+        :rtype: A list with a (driver name, RetryPolicy) tuple by retry policy.
+        """
+        return [
+            (name, policy) for name, driver in self._drivers.items() for policy in getattr(driver, 'retry_policies', ())
+        ]
+
     def length_subscribers(self, priority=None):
         """
         Get length of the subscribers.
@@ -114,29 +125,39 @@ class EventBUS(object):
 
         return len(self._subscribers[PriorityENUM.HIGH]) + len(self._subscribers[PriorityENUM.LOW])
 
+    @staticmethod
+    def _snapshot(node, metrics):
+        """
+        Create an immutable snapshot of a node with the given metrics. The
+        snapshot is a shallow copy of the node and its metrics are a frozenset
+        that shares the metric objects, instead of copies of them.
+        """
+        snapshot = copy.copy(node)
+        snapshot.metrics = metrics
+        return snapshot
+
     def _copy_event(self, node):
         """
-        Ensure that it is Immutable.
+        Ensure that it is Immutable. The stored snapshot is reused when the
+        node brings no new metrics, so only the changed nodes allocate.
         """
-        if node.server_hardware_uuid in self._events:
-            new_node = copy.deepcopy(self._events[node.server_hardware_uuid])
-            # update set _events, adding metrics from node
-            new_node.metrics.update(node.metrics)
+        stored_node = self._events.get(node.server_hardware_uuid)
+        if stored_node is None:
+            new_node = self._snapshot(node, frozenset(node.metrics))
+        elif stored_node.metrics.issuperset(node.metrics):
+            return stored_node
         else:
-            new_node = copy.deepcopy(node)
+            # update set _events, adding metrics from node
+            new_node = self._snapshot(stored_node, stored_node.metrics.union(node.metrics))
 
         self._events[node.server_hardware_uuid] = new_node
+        return new_node
 
     def _resolve_available_metrics(self, nodes):
         """
         Group metrics by server hardware UUID.
         """
-        updated_nodes = set()
-        for node in nodes:
-            self._copy_event(node)
-            updated_nodes.add(self._events[node.server_hardware_uuid])
-
-        return updated_nodes
+        return frozenset(self._copy_event(node) for node in nodes)
 
     def _resolve_unavailable_metrics(self, nodes):
         """
@@ -144,11 +165,15 @@ class EventBUS(object):
         """
         updated_nodes = set()
         for node in nodes:
+            stored_node = self._events[node.server_hardware_uuid]
             # Update set events, removing elements found in nodes
-            self._events[node.server_hardware_uuid].metrics.difference_update(node.metrics)
-            updated_nodes.add(self._events[node.server_hardware_uuid])
+            metrics = stored_node.metrics.difference(node.metrics)
+            if len(metrics) != len(stored_node.metrics):
+                stored_node = self._snapshot(stored_node, metrics)
+                self._events[node.server_hardware_uuid] = stored_node
+            updated_nodes.add(stored_node)
 
-        return updated_nodes
+        return frozenset(updated_nodes)
 
     def available(self, nodes):
         """
@@ -192,7 +217,7 @@ class EventBUS(object):
         utils.print_log_message('Info', 'Subscribe %s with priority %s' % (subscriber, priority), LOG)
         self._subscribers[priority].add(subscriber)
         if len(self._events.values()) > 0:
-            subscriber.available(set(self._events.values()))
+            subscriber.available(frozenset(self._events.values()))
 
     def unsubscribe(self, subscriber):
         """
@@ -20,8 +20,8 @@ This module is auxiliary function to check agent configuration file correctness
 """
 
 from oneview_client import client
-from ironicclient import client as ironic
 from monascaclient import client as monclient, ksclient
+from oneview_monasca.shared.keystone_session import KeystoneSession
 from oneview_monasca.shared.section_read import SectionRead
 from oneview_monasca.shared import log as logging
 from oneview_monasca.shared import utils, constants
@@ -73,16 +73,19 @@ def validate_config(config_file, shell=False):
         config_file.openstack.monasca_api_version
     )
 
+    # The authenticated Keystone session is carried by the configuration to the Ironic plugin
+    setattr(config_file, constants.IRONIC_SESSION, None)
     try:
-        _chk_ironic_credentials(
+        keystone_session = _chk_ironic_credentials(
             config_file.ironic.auth_url, config_file.ironic.admin_user,
             config_file.ironic.admin_password, config_file.ironic.admin_tenant_name,
             config_file.ironic.insecure, config_file.ironic.ironic_api_version,
             config_file.ironic.project_name, config_file.ironic.region_name,
             config_file.ironic.user_domain_id, config_file.ironic.project_domain_id,
             config_file.ironic.ironic_url, config_file.ironic.project_id,
-            config_file.ironic.user_domain_name, config_file.project_domain_name
+            config_file.ironic.user_domain_name, config_file.ironic.project_domain_name
         )
+        setattr(config_file, constants.IRONIC_SESSION, keystone_session.get_session())
     except InvalidConfigFileException:
         raise
     except Exception:
@@ -144,29 +147,18 @@ def _chk_ironic_credentials(auth_url, username, password, tenant_name, insecure,
     :param project_id: The cloud project id
     :param user_domain_name: The cloud user domain name
     :param project_domain_name: The project domain name
+    :return: the authenticated Keystone session
     """
-    kwargs = {
-        'os_username': username,
-        'os_password': password,
-        'os_auth_url': auth_url,
-        'os_tenant_name': tenant_name,
-        'os_ironic_api_version': api_version,
-        'os_project_name': project_name,
-        'os_region_name': region_name,
-        'os_user_domain_id': user_domain_id,
-        'os_project_domain_id': project_domain_id,
-        'ironic_url': ironic_url,
-        'os_project_id': project_id,
-        'os_user_domain_name': user_domain_name,
-        'os_project_domain_name': project_domain_name 
-    }
-    if insecure.lower() == 'true':
-        kwargs['insecure'] = True
+    keystone_session = KeystoneSession(
+        auth_url, username, password, tenant_name, insecure, project_name, user_domain_id,
+        project_domain_id, project_id, user_domain_name, project_domain_name
+    )
+    keystone_session.get_client(
+        constants.API_VERSION, ironic_url=ironic_url, os_region_name=region_name,
+        os_ironic_api_version=api_version
+    )
 
-    try:
-        ironic.get_client(constants.API_VERSION, **kwargs)
-    except:
-        raise
+    return keystone_session
 
 
 def _chk_openstack_credentials(auth_url, username, password, project_name, api_version):
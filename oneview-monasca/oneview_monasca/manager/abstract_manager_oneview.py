@@ -40,6 +40,17 @@ class AbstractManagerOneView(object):
         """
         raise NotImplementedError("Method not implemented, subclasses should implement this!")
 
+    @abc.abstractmethod
+    def get_server_hardware_states(self, uuids, modified_since=None):
+        """ Get the status of many server hardware at once.
+
+            :param uuids: A collection with the uuids of the interest server hardware.
+            :param modified_since: A timestamp string, if set only the server hardware modified after it are requested.
+
+            :returns A dict that maps each uuid found to a tuple with its status and modified timestamp.
+        """
+        raise NotImplementedError("Method not implemented, subclasses should implement this!")
+
     @abc.abstractmethod
     def get_server_hardware(self, uuid):
         """ Get a instance of a server hardware from oneview.
@@ -60,6 +71,14 @@ class AbstractManagerOneView(object):
         """
         raise NotImplementedError("Method not implemented, subclasses should implement this!")
 
+    @abc.abstractmethod
+    def prefetch_server_hardware_alerts(self, states):
+        """Request the alerts of many Oneview resources at once, to be used by the next alerts lookups.
+
+            :param states: a dict that maps the uuid of each resource to its status.
+        """
+        raise NotImplementedError("Method not implemented, subclasses should implement this!")
+
     @abc.abstractmethod
     def get_certificates(self):
         """ Get a hpOneView SDK connection.
@@ -0,0 +1,112 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide a cache of the alerts meta values of the server hardware,
+that can be shared between many Manager OneView instances to avoid an alerts
+query by status update.
+"""
+
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared.stats import Stats
+from collections import OrderedDict
+from threading import Lock
+
+import time
+
+
+class AlertCache(object):
+    """
+    This class keeps the alerts meta values of each server hardware together
+    with the status they were requested for. An entry is reused only while
+    the status does not change and its TTL does not expire. Above the max
+    size, the least recently used entries are evicted.
+
+    Statistics:
+        hits: The number of lookups served by the cache.
+        misses: The number of lookups not found, expired or with a different status.
+        evictions: The number of entries removed because the cache is full.
+        size: The current number of entries.
+    """
+    def __init__(self, ttl=const.ALERT_CACHE_TTL, max_size=const.ALERT_CACHE_SIZE):
+        self._ttl = int(ttl)
+        self._max_size = int(max_size)
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.stats = Stats()
+
+    @property
+    def enabled(self):
+        """ If the alerts meta values are kept by the cache """
+        return self._ttl > 0
+
+    def get(self, uuid, status):
+        """ Get the cached alerts meta values of a server hardware.
+
+        :param uuid: the server hardware uuid.
+        :param status: the current status of the server hardware.
+        :return: a dict with the alerts meta values, or None if it must be requested again.
+        """
+        self._lock.acquire()
+        try:
+            entry = self._entries.pop(uuid, None)
+            if entry is None or entry[0] != status or time.time() - entry[2] >= self._ttl:
+                self.stats.increment('misses')
+                self.stats.set('size', len(self._entries))
+                return None
+
+            # Move the entry to the end, as the most recently used
+            self._entries[uuid] = entry
+            self.stats.increment('hits')
+            return entry[1]
+        finally:
+            self._lock.release()
+
+    def put(self, uuid, status, meta):
+        """ Store the alerts meta values of a server hardware.
+
+        :param uuid: the server hardware uuid.
+        :param status: the status the alerts were requested for.
+        :param meta: a dict with the alerts meta values.
+        """
+        self._lock.acquire()
+        self._entries.pop(uuid, None)
+        self._entries[uuid] = (status, meta, time.time())
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.stats.increment('evictions')
+
+        self.stats.set('size', len(self._entries))
+        self._lock.release()
+
+    def clear(self):
+        """ Remove the alerts meta values of all server hardware """
+        self._lock.acquire()
+        self._entries.clear()
+        self.stats.set('size', 0)
+        self._lock.release()
+
+    def invalidate(self, uuid):
+        """ Remove the alerts meta values of a server hardware.
+
+        :param uuid: the server hardware uuid.
+        """
+        self._lock.acquire()
+        self._entries.pop(uuid, None)
+        self.stats.set('size', len(self._entries))
+        self._lock.release()
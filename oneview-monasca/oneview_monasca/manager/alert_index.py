@@ -0,0 +1,137 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide an in-memory index of the active OneView alerts, kept up to
+date by the SCMB alerts messages, so the alerts of a resource can be known
+without a request to OneView.
+"""
+
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared.stats import Stats
+from collections import OrderedDict
+from threading import Lock
+
+
+class AlertIndex(object):
+    """
+    This class keeps the uri of the active alerts of each resource. The index
+    is only ready after it is rebuilt from a full list of active alerts, and
+    stops being ready when the SCMB messages can be lost (e.g. the connection
+    with SCMB dropped), until it is rebuilt again.
+
+    Statistics:
+        updates: The number of alerts changes applied.
+        rebuilds: The number of times the index was rebuilt.
+        size: The current number of active alerts.
+    """
+    def __init__(self):
+        # The active alerts uri of each resource uri, in the order they were received
+        self._alerts = {}
+        # The resource uri of each active alert uri
+        self._resources = {}
+        self._ready = False
+        # The alerts changes applied while the full list of active alerts is requested, or None
+        self._pending = None
+        self._lock = Lock()
+        self.stats = Stats()
+
+    @property
+    def ready(self):
+        """ If the index reflects the active alerts of OneView """
+        return self._ready
+
+    def get_alerts(self, resource_uri):
+        """ Get the active alerts of a resource.
+
+        :param resource_uri: the uri of the resource.
+        :return: a list with the uri of the active alerts of the resource.
+        """
+        self._lock.acquire()
+        alerts = list(self._alerts.get(resource_uri, ()))
+        self._lock.release()
+        return alerts
+
+    def update(self, alert, change_type=None):
+        """ Apply the change of an alert received from SCMB.
+
+        :param alert: a dict with the alert resource.
+        :param change_type: the SCMB change type of the alert (e.g. Created, Updated or Deleted).
+        """
+        self._lock.acquire()
+        self._apply(alert, change_type)
+        if self._pending is not None:
+            self._pending.append((alert, change_type))
+
+        self.stats.increment('updates')
+        self.stats.set('size', len(self._resources))
+        self._lock.release()
+
+    def prepare_rebuild(self):
+        """ Keep the alerts changes applied from now on, to be applied again over the
+        full list of active alerts, which can be older than them, when it is rebuilt.
+        """
+        self._lock.acquire()
+        self._pending = []
+        self._lock.release()
+
+    def rebuild(self, alerts):
+        """ Replace the content of the index with a full list of active alerts, making it ready.
+        The alerts changes kept since the rebuild was prepared are applied again, in order.
+
+        :param alerts: a list of dicts with the active alerts resources.
+        """
+        self._lock.acquire()
+        self._alerts, self._resources = {}, {}
+        for alert in alerts:
+            if alert.get('alertState', 'Active') in const.ALERT_ACTIVE_STATES:
+                self._add(alert)
+
+        for alert, change_type in self._pending or ():
+            self._apply(alert, change_type)
+        self._pending = None
+
+        self._ready = True
+        self.stats.increment('rebuilds')
+        self.stats.set('size', len(self._resources))
+        self._lock.release()
+
+    def invalidate(self):
+        """ Mark the index as not ready, until it is rebuilt """
+        self._ready = False
+        self._pending = None
+
+    def _apply(self, alert, change_type):
+        """ Apply the change of an alert to the index. The caller must hold the lock """
+        self._remove(alert['uri'])
+        if change_type != 'Deleted' and alert.get('alertState') in const.ALERT_ACTIVE_STATES:
+            self._add(alert)
+
+    def _add(self, alert):
+        """ Add an active alert to the index. The caller must hold the lock """
+        resource_uri = alert.get('resourceUri')
+        if resource_uri:
+            self._alerts.setdefault(resource_uri, OrderedDict())[alert['uri']] = None
+            self._resources[alert['uri']] = resource_uri
+
+    def _remove(self, alert_uri):
+        """ Remove an alert from the index, if present. The caller must hold the lock """
+        resource_uri = self._resources.pop(alert_uri, None)
+        if resource_uri is not None:
+            del self._alerts[resource_uri][alert_uri]
+            if not self._alerts[resource_uri]:
+                del self._alerts[resource_uri]
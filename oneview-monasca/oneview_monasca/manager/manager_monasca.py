@@ -19,10 +19,20 @@
 
 from monascaclient import client as monclient, ksclient
 from oneview_monasca.manager.abstract_manager_monasca import AbstractManagerMonasca
+from oneview_monasca.shared.retry_policy import RetryPolicy
+from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
 from oneview_monasca.shared import utils
+from monascaclient.common import http
+from threading import Lock
+from datetime import datetime
 
 import monascaclient.exc as exc
+import calendar
+import requests
+import socket
+import time
 
 LOG = logging.get_logger(__name__)
 
@@ -30,7 +40,7 @@ LOG = logging.get_logger(__name__)
 class ManagerMonasca(AbstractManagerMonasca):
     """ The Monasca Manager """
 
-    def __init__(self, auth_url, username, password, project_name, api_version, debug=False):
+    def __init__(self, auth_url, username, password, project_name, api_version, debug=False, retry_policy=None):
         super(ManagerMonasca, self).__init__()
 
         utils.print_log_message('Info', 'Initialize Monasca Manager', LOG)
@@ -42,26 +52,91 @@ class ManagerMonasca(AbstractManagerMonasca):
         self.project_name = project_name
         self.api_version = api_version
 
-    def _get_monasca_client(self):
-        """Provide a Monasca client according a configuration file
+        # The Monasca client is reused until the Keystone token is near to expire
+        self._lock = Lock()
+        self._monasca_client = None
+        self._token_expiration = 0
+        self._session = requests.Session()
+        self.stats = Stats()
+        # The failed requests are spooled instead of retried, but are not sent while the circuit is open
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy('monasca')
 
-        :returns: Monasca client.
+    def _authenticate(self):
+        """Authenticate to Keystone using the credentials of the configuration file
+
+        :returns: the Keystone token and the Monasca endpoint.
         """
         message = "Using OpenStack credentials specified in the configuration file to get Monasca Client"
         utils.print_log_message('Debug', message, LOG, self.debug)
 
-        # Authenticate to Keystone
         ks = ksclient.KSClient(
             auth_url=self.auth_url,
             username=self.username,
             password=self.password,
             project_name=self.project_name
         )
-        # Monasca Client
-        monasca_client = monclient.Client(
-            self.api_version, ks.monasca_url, token=ks.token
-        )
-        return monasca_client
+        token, monasca_url = ks.token, ks.monasca_url
+
+        self._token_expiration = self._get_token_renewal(ks)
+        self.stats.increment('authentications')
+
+        message = 'Authenticated to Keystone [%(stats)s]' % {'stats': self.stats}
+        utils.print_log_message('Info', message, LOG)
+        return token, monasca_url
+
+    @staticmethod
+    def _get_token_renewal(ks):
+        """Get the time to renew the token of an authenticated Keystone client, a margin before
+        the expiry told by Keystone. The token TTL is assumed when Keystone does not tell it.
+
+        :param ks: the authenticated Keystone client.
+        :returns: the time (in seconds since the epoch) to request a new token.
+        """
+        now = time.time()
+        auth_ref = getattr(getattr(ks, '_keystone', None), 'auth_ref', None)
+        expires = getattr(auth_ref, 'expires', None)
+
+        lifetime = const.KEYSTONE_TOKEN_TTL
+        if isinstance(expires, datetime):
+            lifetime = calendar.timegm(expires.utctimetuple()) - now
+
+        # A token that lives less than twice the margin is renewed at the half of its life
+        return now + lifetime - min(const.KEYSTONE_TOKEN_EXPIRY_MARGIN, lifetime / 2.0)
+
+    def _renew_token(self):
+        """Get a new Keystone token when Monasca rejects the cached one
+
+        :returns: the new Keystone token.
+        """
+        self._lock.acquire()
+        try:
+            token, _ = self._authenticate()
+            return token
+        finally:
+            self._lock.release()
+
+    def _get_monasca_client(self):
+        """Provide a Monasca client according a configuration file, reusing the
+        cached one while its Keystone token is not near to expire.
+
+        :returns: Monasca client.
+        """
+        self._lock.acquire()
+        try:
+            if self._monasca_client is None or time.time() >= self._token_expiration:
+                token, monasca_url = self._authenticate()
+
+                # Monasca Client
+                self._monasca_client = monclient.Client(self.api_version, monasca_url, token=token)
+
+                # Posting the metrics through a persistent HTTP session
+                http_client = MonascaHTTPClient(monasca_url, self._session, self._renew_token, token=token)
+                self._monasca_client.http_client = http_client
+                self._monasca_client.metrics.client = http_client
+
+            return self._monasca_client
+        finally:
+            self._lock.release()
 
     def send_metrics(self, measurements):
         """ Update a list of metric dictionary  measurements to be in the
@@ -82,13 +157,75 @@ class ManagerMonasca(AbstractManagerMonasca):
             monasca_metric_list.append(new_metric)
 
         batch_metrics = {'jsonbody': monasca_metric_list}
+        self._retry_policy.execute(self._create_metrics, 1, batch_metrics)
+
+        utils.print_log_message('Info', 'Finished send metric - method send_metrics', LOG)
+
+    def _create_metrics(self, batch_metrics):
+        """ Post a batch of metrics to Monasca.
+
+        :param batch_metrics: the arguments of the Monasca metrics create request.
+        """
         try:
             monasca_client = self._get_monasca_client()
             monasca_client.metrics.create(**batch_metrics)
         except exc.HTTPException as httpex:
             utils.print_log_message('Error', httpex.message, LOG)
+            # Only the metrics rejected by Monasca are discarded, the others can be sent again
+            if not self._is_rejected(httpex):
+                raise
         except Exception as ex:
             utils.print_log_message('Error', ex.message, LOG)
             raise
 
-        utils.print_log_message('Info', 'Finished send metric - method send_metrics', LOG)
+    @staticmethod
+    def _is_rejected(httpex):
+        """ Check if Monasca answered with a client error, that will happen again if
+        the same metrics are sent.
+
+        :param httpex: The HTTP exception raised by the Monasca client.
+        """
+        return isinstance(httpex.code, int) and 400 <= httpex.code < 500 and \
+            not isinstance(httpex, exc.HTTPUnauthorized)
+
+
+class MonascaHTTPClient(http.HTTPClient):
+    """ A Monasca HTTP client that keeps the connections alive between the requests
+    and asks the Manager Monasca for a new token when the current one is rejected.
+    """
+    def __init__(self, endpoint, session, renew_token, **kwargs):
+        super(MonascaHTTPClient, self).__init__(endpoint, **kwargs)
+
+        self._session = session
+        self._renew_token = renew_token
+
+    def re_authenticate(self):
+        """ Called by the HTTP client when a request is unauthorized, before trying it again.
+        """
+        try:
+            self.auth_token = self._renew_token()
+        except Exception as ex:
+            raise exc.KeystoneException(ex)
+
+    def _make_request(self, method, url, allow_redirects, timeout, **kwargs):
+        """ Send a request through the persistent session.
+        """
+        endpoint = self.endpoint_url + url
+        try:
+            resp = self._session.request(
+                method, endpoint, allow_redirects=allow_redirects, timeout=timeout, **kwargs
+            )
+        except socket.gaierror as ex:
+            message = 'Error finding address for %(url)s: %(ex)s' % {'url': endpoint, 'ex': ex}
+            raise exc.InvalidEndpoint(message=message)
+        except requests.Timeout as ex:
+            message = 'Error %(method)s timeout request to %(url)s %(ex)s' % {
+                'method': method, 'url': endpoint, 'ex': ex
+            }
+            raise exc.RequestTimeoutError(message=message)
+        except (socket.error, requests.ConnectionError) as ex:
+            message = 'Failed to connect to %(url)s, error was %(ex)s' % {'url': endpoint, 'ex': ex}
+            raise exc.CommunicationError(message=message)
+
+        self.log_http_response(resp)
+        return resp
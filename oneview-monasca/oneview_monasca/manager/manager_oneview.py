@@ -21,16 +21,21 @@ OneView Manager that is used to create a channel between the OneView Rest API
 and the publishers.
 """
 
+from hpOneView.resources.servers.server_hardware import ServerHardware
+from oneview_monasca.manager.session_pool import OneViewSessionPool
+from oneview_monasca.manager.alert_cache import AlertCache
 from oneview_monasca.shared.exceptions import LoginFailException
+from oneview_monasca.shared.exceptions import SessionRejectedException
 from oneview_monasca.shared.exceptions import HTTPFailException
+from oneview_monasca.shared.retry_policy import RetryPolicy
 from abstract_manager_oneview import AbstractManagerOneView
 from oneview_monasca.shared import constants as const
-from hpOneView import connection, security, activity
 from hpOneView.exceptions import HPOneViewException
-from hpOneView.oneview_client import OneViewClient
 from oneview_monasca.shared import log as logging
+from hpOneView import security, activity
 from oneview_monasca.shared import utils
 
+import urllib
 import ssl
 
 LOG = logging.get_logger(__name__)
@@ -40,7 +45,8 @@ class ManagerOneView(AbstractManagerOneView):
     """
     The concrete Manager OneView class
     """
-    def __init__(self, host, username, password, max_attempt=0, certificates_directory=None):
+    def __init__(self, host, username, password, max_attempt=0, certificates_directory=None, session_pool=None,
+                 alert_cache=None, alert_index=None, retry_policy=None):
         super(ManagerOneView, self).__init__()
 
         self._host = host
@@ -48,6 +54,19 @@ class ManagerOneView(AbstractManagerOneView):
         self._password = password
         self._max_attempt = int(max_attempt)
         self._directory = certificates_directory
+        # The OneView sessions can be shared with another managers
+        self._session_pool = session_pool if session_pool is not None else OneViewSessionPool()
+        # The alerts can be shared with another managers too
+        self._alert_cache = alert_cache if alert_cache is not None else AlertCache()
+        # If there is an alerts index kept by the SCMB, the alerts are taken from it while it is ready
+        self._alert_index = alert_index
+        # The calls to the OneView appliance share the retry budget and the circuit breaker of another managers
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy('oneview')
+
+    @property
+    def host(self):
+        """ The OneView appliance host of this manager """
+        return self._host
 
     def get_server_hardware_status(self, uuid, status=None):
         """ Get server hardware status and returns
@@ -68,6 +87,56 @@ class ManagerOneView(AbstractManagerOneView):
 
         return None, None
 
+    def get_server_hardware_states(self, uuids, modified_since=None):
+        """ Get the status of many server hardware at once, paging through the
+        server hardware collection instead of requesting each resource.
+
+        :param uuids: A collection with the uuids of the interest server hardware.
+        :param modified_since: A timestamp string, if set only the server hardware modified after it are requested.
+
+        :returns A dict that maps each uuid found to a tuple with its status and modified timestamp.
+        """
+        query_filter = const.SERVER_HARDWARE_MODIFIED_FILTER % modified_since if modified_since else None
+
+        states = {}
+        for server_hardware in self.get_server_hardware_collection(query_filter=query_filter):
+            uuid = server_hardware.get('uuid')
+            if uuid in uuids and server_hardware.get('status') in const.METRIC_VALUE_PARSER:
+                status, timestamp = server_hardware['status'], server_hardware.get('modified')
+                states[uuid] = const.METRIC_VALUE_PARSER[status], timestamp
+
+        return states
+
+    def get_server_hardware_collection(self, page_size=const.SERVER_HARDWARE_PAGE_SIZE, query_filter=None):
+        """ Get all server hardware from oneview, page by page, keeping only
+        the uuid, status and modified fields of each one.
+
+        :param page_size: The number of server hardware requested by page.
+        :param query_filter: A OneView filter expression, if set only the matching server hardware are requested.
+
+        :returns A list of dicts with the uuid, status and modified fields.
+        :raise LoginFailException if a client is no authenticated in Oneview Rest Api.
+        :raises Exception if burst the max attempts.
+        """
+        collection, start = [], 0
+
+        while True:
+            page = self._run_by_retry(self._get_server_hardware_page, start, page_size, query_filter)
+            members = page.get('members') or []
+
+            for member in members:
+                collection.append({
+                    'uuid': member.get('uuid'),
+                    'status': member.get('status'),
+                    'modified': member.get('modified')
+                })
+
+            start += len(members)
+            if not members or not page.get('nextPageUri') or start >= page.get('total', 0):
+                break
+
+        return collection
+
     def get_server_hardware(self, uuid):
         """Call the function get_server_hardware encapsulate into run_by_retry function
 
@@ -91,6 +160,62 @@ class ManagerOneView(AbstractManagerOneView):
         """
         return self._run_by_retry(self._get_server_hardware_alerts, resource_uri, status)
 
+    def prefetch_server_hardware_alerts(self, states, page_size=const.ALERT_PAGE_SIZE):
+        """ Request all active alerts at once, page by page, and fill the alerts
+        cache of many server hardware, instead of a query by server hardware.
+
+        :param states: A dict that maps the uuid of each interest server hardware to its status.
+        :param page_size: The number of alerts requested by page.
+
+        :raise LoginFailException if a client is no authenticated in Oneview Rest Api.
+        :raises Exception if burst the max attempts.
+        """
+        # The alerts index kept by the SCMB already has all active alerts
+        if self._alert_index is not None and self._alert_index.ready:
+            return
+
+        states = dict(
+            (uuid, status) for uuid, status in states.items()
+            if status is not None and status != const.METRIC_VALUE_PARSER['OK']
+        )
+        if not states:
+            return
+
+        meta_values = dict((uuid, {}) for uuid in states)
+        for alert in self.get_active_alerts(page_size):
+            resource_uri = alert.get('resourceUri') or ''
+            uuid = resource_uri[len(const.ONEVIEW_URI_PREFIX):]
+
+            if resource_uri.startswith(const.ONEVIEW_URI_PREFIX) and uuid in meta_values:
+                if len(meta_values[uuid]) < const.MAX_VALUE_META_LEN:
+                    meta_values[uuid][alert['uri']] = self._host + '#/activity/r' + alert['uri']
+
+        for uuid, status in states.items():
+            self._alert_cache.put(uuid, status, meta_values[uuid])
+
+    def get_active_alerts(self, page_size=const.ALERT_PAGE_SIZE):
+        """ Get all active alerts from oneview, page by page.
+
+        :param page_size: The number of alerts requested by page.
+
+        :returns A list of dicts with the active alerts.
+        :raise LoginFailException if a client is no authenticated in Oneview Rest Api.
+        :raises Exception if burst the max attempts.
+        """
+        alerts = []
+
+        start = 0
+        while True:
+            page = self._run_by_retry(self._get_alerts_page, start, page_size)
+            members = page.get('members') or []
+            alerts.extend(members)
+
+            start += len(members)
+            if not members or not page.get('nextPageUri') or start >= page.get('total', 0):
+                break
+
+        return alerts
+
     def get_connection(self):
         """Call the function get_connection encapsulate into run_by_retry function
 
@@ -155,12 +280,9 @@ class ManagerOneView(AbstractManagerOneView):
         :param uuid: the id associated oneview server hardware resource.
         :return: a instance of a oneview server hardware resource.
         """
-        client = OneViewClient({
-            'ip': self._host,
-            'credentials': {'userName': self._username, 'password': self._password}
-        })
+        server_hardware = ServerHardware(self._get_connection())
         try:
-            return client.server_hardware.get(uuid)
+            return server_hardware.get(uuid)
         except HPOneViewException as hpex:
             if const.RESOURCE_NOT_FOUND in str(hpex):
                 utils.print_log_message('Info', hpex.msg.replace('\n', ' '), LOG)
@@ -168,8 +290,43 @@ class ManagerOneView(AbstractManagerOneView):
             else:
                 raise
 
+    def _get_server_hardware_page(self, start, count, query_filter=None):
+        """ Get a single page of the server hardware collection
+
+        :param start: The index of the first server hardware in the page.
+        :param count: The max number of server hardware in the page.
+        :param query_filter: A OneView filter expression of the server hardware in the page.
+
+        :return: a dict with the page members and the collection paging information.
+        """
+        uri = '%(uri)s?start=%(start)d&count=%(count)d&fields=%(fields)s' % {
+            'uri': const.SERVER_HARDWARE_URI, 'start': start, 'count': count,
+            'fields': const.SERVER_HARDWARE_STATUS_FIELDS
+        }
+        if query_filter:
+            uri += '&filter=' + urllib.quote(query_filter)
+        return self._get_connection().get(uri) or {}
+
+    def _get_alerts_page(self, start, count, resource_uri=None):
+        """ Get a single page of the active alerts collection
+
+        :param start: The index of the first alert in the page.
+        :param count: The max number of alerts in the page.
+        :param resource_uri: The uri of the resource of the alerts in the page, or None for all resources.
+
+        :return: a dict with the page members and the collection paging information.
+        """
+        uri = '%(uri)s?start=%(start)d&count=%(count)d&filter=%(filter)s' % {
+            'uri': const.ALERTS_URI, 'start': start, 'count': count, 'filter': urllib.quote(const.ALERT_ACTIVE_FILTER)
+        }
+        # The filters of a request are all applied
+        if resource_uri:
+            uri += '&filter=' + urllib.quote(const.ALERT_RESOURCE_FILTER % resource_uri)
+        return self._get_connection().get(uri) or {}
+
     def _get_server_hardware_alerts(self, resource_uuid, status):
-        """Get the alerts associated an Oneview resource when it is not OK
+        """Get the alerts associated an Oneview resource when it is not OK,
+        from the alerts cache while its status does not change
 
         :param resource_uuid: the server hardware uuid for the resource
         :param status: the status associated with input resource.
@@ -177,33 +334,85 @@ class ManagerOneView(AbstractManagerOneView):
         :return: a dict that contains all alerts associated with input resource.
         """
         if status is None or status == const.METRIC_VALUE_PARSER['OK']:
+            self._alert_cache.invalidate(resource_uuid)
             return {}
 
-        act = self.get_activity()
-        oneview_uri = const.ONEVIEW_URI_PREFIX + resource_uuid
-        alerts = act.get_alerts(const.ALERT_BASE_URL + oneview_uri)
+        if self._alert_index is not None and self._alert_index.ready:
+            alerts = self._alert_index.get_alerts(const.ONEVIEW_URI_PREFIX + resource_uuid)
+            return dict(
+                (alert_uri, self._host + '#/activity/r' + alert_uri) for alert_uri in alerts[:const.MAX_VALUE_META_LEN]
+            )
+
+        meta_values = self._alert_cache.get(resource_uuid, status)
+        if meta_values is not None:
+            return meta_values
+
+        # Only the alerts kept as meta values are requested
+        page = self._get_alerts_page(0, const.MAX_VALUE_META_LEN, const.ONEVIEW_URI_PREFIX + resource_uuid)
 
         meta_values = {}
-        for alert in alerts:
-            if len(meta_values) < const.MAX_VALUE_META_LEN:
-                meta_values[alert['uri']] = self._host + '#/activity/r' + alert['uri']
-            else:
-                break
+        for alert in page.get('members') or []:
+            meta_values[alert['uri']] = self._host + '#/activity/r' + alert['uri']
 
+        self._alert_cache.put(resource_uuid, status, meta_values)
         return meta_values
 
     def _get_connection(self):
-        """ Get a hpOneView SDK connection
+        """ Get a hpOneView SDK connection from the session pool
 
         :return: a connection to communicate with Oneview Rest Api
         """
-        con = connection(self._host)
-        con.login({'userName': self._username, 'password': self._password})
+        return self._session_pool.get_connection(
+            self._host, {'userName': self._username, 'password': self._password}, self._accept_eula
+        )
+
+    @staticmethod
+    def _accept_eula(con):
+        """ Accept the OneView EULA, if it was not accepted yet
 
+        :param con: a new connection to communicate with Oneview Rest Api
+        """
         if con.get_eula_status():
             con.set_eula(supportAccess='no')
 
-        return con
+    def _run_by_session(self, func, *args):
+        """ Run a function that uses the pooled session by the retry policy, opening the session
+        again if its token was rejected. The session is opened out of the retry policy, so each
+        attempt of the policy is a single call.
+
+        :param func: A function that will be executed.
+        :param args: A list of params to rum input function.
+
+        :returns the input function output.
+        """
+        try:
+            return self._retry_policy.execute(self._run_by_token, self._max_attempt, func, *args)
+        except SessionRejectedException:
+            utils.print_log_message('Info', 'OneView session rejected, opening a new session', LOG)
+            self._session_pool.invalidate(self._host, {'userName': self._username, 'password': self._password})
+
+        try:
+            return self._retry_policy.execute(self._run_by_token, self._max_attempt, func, *args)
+        except SessionRejectedException as ex:
+            raise ex.error
+
+    @staticmethod
+    def _run_by_token(func, *args):
+        """ Run a function that uses the pooled session, telling apart the rejection of its token,
+        that is not retried by the retry policy.
+
+        :param func: A function that will be executed.
+        :param args: A list of params to rum input function.
+
+        :returns the input function output.
+        :raise SessionRejectedException if the session token was rejected.
+        """
+        try:
+            return func(*args)
+        except HPOneViewException as hpex:
+            if OneViewSessionPool.is_unauthorized(hpex):
+                raise SessionRejectedException(hpex)
+            raise
 
     def _validate_certificates(self):
         """ Validate the current SCMB certificates
@@ -230,7 +439,7 @@ class ManagerOneView(AbstractManagerOneView):
         :raises Exception if burst the max attempts.
         """
         try:
-            return utils.try_execute(func, self._max_attempt, 2000, *args)
+            return self._run_by_session(func, *args)
         except HPOneViewException as hpex:
             if const.HTTP_ERROR_400 in str(hpex):
                 utils.print_log_message('Error', const.HTTP_ERROR_400, LOG)
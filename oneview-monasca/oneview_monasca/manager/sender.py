@@ -0,0 +1,222 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide an asynchronous sender, that decouples the publishers from
+the Monasca API round trips through a bounded outbound queue.
+"""
+
+from oneview_monasca.manager.abstract_manager_monasca import AbstractManagerMonasca
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from threading import Condition
+from threading import Thread
+from collections import deque
+
+import time
+
+LOG = logging.get_logger(__name__)
+
+
+class MetricSender(AbstractManagerMonasca):
+    """
+    This class has the same interface of a Manager Monasca, but the send_metrics
+    method only puts the measurements in a bounded queue. The queue is drained by
+    dedicated workers, that send the measurements to Monasca in batches.
+
+    Overflow policies (when the queue is full):
+        drop_oldest: The oldest queued measurements are discarded.
+        block: The producer waits until there is space in the queue.
+        spill: The measurements that does not fit in the queue are handed to the spill function.
+
+    The batches that could not be sent, and the measurements still queued when the
+    sender is stopped, are also handed to the spill function, if any.
+
+    Statistics:
+        queue_depth: The number of measurements waiting in the queue.
+        enqueued: The number of measurements received from the publishers.
+        sent: The number of measurements sent to Monasca.
+        dropped: The number of measurements discarded by the overflow policy, or not sent without a spill function.
+        spilled: The number of measurements handed to the spill function.
+        send_failures: The number of batches that could not be sent.
+        send_latency: The time (in seconds) spent sending each batch to Monasca.
+    """
+    def __init__(self, manager_monasca, queue_size=const.SENDER_QUEUE_SIZE,
+                 batch_size=const.SENDER_BATCH_SIZE, linger_time=const.SENDER_LINGER_TIME,
+                 overflow_policy=const.SENDER_OVERFLOW_POLICY, workers=const.SENDER_WORKERS,
+                 spill=None, debug=False):
+        super(MetricSender, self).__init__()
+
+        if overflow_policy not in const.SENDER_OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy: %s' % overflow_policy)
+
+        self.debug = debug
+        self._manager_monasca = manager_monasca
+        self._queue_size = int(queue_size)
+        self._batch_size = int(batch_size)
+        self._linger_time = float(linger_time)
+        self._overflow_policy = overflow_policy
+        self._spill = spill
+        self._workers = [Thread(target=self._run) for _ in range(int(workers))]
+        self.stats = Stats()
+
+        # Thread attributes control
+        self._queue = deque()
+        self._condition = Condition()
+        self._stopped = True
+
+    def start(self):
+        """ Start the sender workers """
+        utils.print_log_message('Info', 'Initialize Metric Sender', LOG)
+
+        self._stopped = False
+        for worker in self._workers:
+            worker.daemon = True
+            worker.start()
+
+    def stop(self):
+        """ Stop the sender workers, spilling the measurements not sent yet, or discarding
+        them if there is no spill function.
+        """
+        self._condition.acquire()
+        self._stopped = True
+        self._condition.notify_all()
+        self._condition.release()
+
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.join(self._linger_time)
+
+        self._condition.acquire()
+        remaining = list(self._queue)
+        self._queue.clear()
+        self.stats.set('queue_depth', 0)
+        self._condition.release()
+
+        if remaining and self._spill is not None:
+            self._spill_measurements(remaining)
+        elif remaining:
+            self.stats.increment('dropped', len(remaining))
+
+        message = 'Metric Sender stopped [%(stats)s]' % {'stats': self.stats}
+        utils.print_log_message('Info', message, LOG)
+
+    def send_metrics(self, measurements):
+        """ Put a list of measurements in the outbound queue, applying the overflow
+        policy if the queue is full.
+
+        :param measurements: A list of Measurement objects to send to Monasca.
+        """
+        overflow = []
+
+        self._condition.acquire()
+        for measurement in measurements:
+            if len(self._queue) >= self._queue_size:
+                if self._overflow_policy == 'block':
+                    # Waking up the workers before waiting for space in the queue
+                    while len(self._queue) >= self._queue_size and not self._stopped:
+                        self._condition.notify_all()
+                        self._condition.wait()
+                elif self._overflow_policy == 'spill':
+                    overflow.append(measurement)
+                    continue
+                else:
+                    self._queue.popleft()
+                    self.stats.increment('dropped')
+
+            self._queue.append(measurement)
+            self.stats.increment('enqueued')
+
+        self.stats.set('queue_depth', len(self._queue))
+        self._condition.notify_all()
+        self._condition.release()
+
+        if overflow:
+            self._spill_measurements(overflow)
+
+    def _spill_measurements(self, measurements):
+        """ Hand the measurements that could not be queued or sent to the spill function.
+
+        :param measurements: A list of Measurement objects.
+        """
+        if self._spill is None:
+            self.stats.increment('dropped', len(measurements))
+            utils.print_log_message('Warn', 'Send queue is full, %d metrics dropped' % len(measurements), LOG)
+            return
+
+        try:
+            self._spill(measurements)
+            self.stats.increment('spilled', len(measurements))
+        except Exception as ex:
+            self.stats.increment('dropped', len(measurements))
+            utils.print_log_message('Error', 'Failed to spill %d metrics: %s' % (len(measurements), ex), LOG)
+
+    def _next_batch(self):
+        """ Wait until there is a full batch in the queue, or until the oldest
+        measurement waited for the linger time.
+
+        :return: a list with at most batch size measurements, or None if the sender was stopped.
+        """
+        self._condition.acquire()
+        try:
+            while not self._queue and not self._stopped:
+                self._condition.wait()
+
+            deadline = time.time() + self._linger_time
+            while len(self._queue) < self._batch_size and not self._stopped:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            if self._stopped:
+                return None
+
+            batch = [self._queue.popleft() for _ in range(min(self._batch_size, len(self._queue)))]
+            self.stats.set('queue_depth', len(self._queue))
+            self._condition.notify_all()
+            return batch
+        finally:
+            self._condition.release()
+
+    def _run(self):
+        """ Drain the queue sending its measurements to Monasca in batches """
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if not batch:
+                continue
+
+            start = time.time()
+            try:
+                self._manager_monasca.send_metrics(batch)
+                self.stats.increment('sent', len(batch))
+
+                message = 'Sent batch of %(size)d metrics [%(stats)s]' % {'size': len(batch), 'stats': self.stats}
+                utils.print_log_message('Debug', message, LOG, self.debug)
+            except Exception as ex:
+                self.stats.increment('send_failures')
+                utils.print_log_message('Error', 'Metric Sender failed: %s' % ex, LOG)
+                if self._spill is not None:
+                    self._spill_measurements(batch)
+                else:
+                    self.stats.increment('dropped', len(batch))
+            finally:
+                self.stats.observe('send_latency', time.time() - start)
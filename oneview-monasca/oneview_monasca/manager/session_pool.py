@@ -0,0 +1,108 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide a pool of authenticated OneView sessions, that can be shared
+between many Manager OneView instances to avoid a login by request.
+"""
+
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from hpOneView import connection
+from threading import Lock
+
+import time
+
+LOG = logging.get_logger(__name__)
+
+
+class OneViewSessionPool(object):
+    """
+    This class keeps one authenticated session by OneView appliance and user,
+    reusing it until it expires or the appliance rejects its token.
+
+    Statistics:
+        logins: The number of sessions opened.
+        reuses: The number of requests served by an already opened session.
+        refreshes: The number of sessions opened again after expired or rejected.
+    """
+    def __init__(self, session_ttl=const.ONEVIEW_SESSION_TTL):
+        self._session_ttl = int(session_ttl)
+        self._sessions = {}
+        self._lock = Lock()
+        self.stats = Stats()
+
+    def get_connection(self, host, credentials, on_login=None):
+        """ Get an authenticated connection to a OneView appliance.
+
+        :param host: the OneView appliance host.
+        :param credentials: a dict with the userName and password used to login.
+        :param on_login: a function called with each new connection right after the login.
+        :return: a connection to communicate with Oneview Rest Api
+        """
+        key = (host, credentials.get('userName'))
+
+        self._lock.acquire()
+        try:
+            session = self._sessions.get(key)
+            if session is not None and not session['expired'] and \
+                    time.time() - session['created'] < self._session_ttl:
+                self.stats.increment('reuses')
+                return session['connection']
+
+            con = connection(host)
+            con.login(credentials)
+            if on_login is not None:
+                on_login(con)
+
+            self._sessions[key] = {'connection': con, 'created': time.time(), 'expired': False}
+            self.stats.increment('logins')
+            if session is not None:
+                self.stats.increment('refreshes')
+
+            message = 'OneView session opened for %(host)s [%(stats)s]' % {'host': host, 'stats': self.stats}
+            utils.print_log_message('Info', message, LOG)
+            return con
+        finally:
+            self._lock.release()
+
+    def invalidate(self, host, credentials):
+        """ Mark the session of an appliance as expired, forcing a new login in the next request.
+
+        :param host: the OneView appliance host.
+        :param credentials: a dict with the userName and password used to login.
+        """
+        self._lock.acquire()
+        session = self._sessions.get((host, credentials.get('userName')))
+        if session is not None:
+            session['expired'] = True
+        self._lock.release()
+
+    @staticmethod
+    def is_unauthorized(exc_obj):
+        """ Check if an exception raised by the OneView Rest Api means that the session token was rejected.
+
+        :param exc_obj: the raised exception.
+        :return: True if the session should be opened again.
+        """
+        response = getattr(exc_obj, 'oneview_response', None)
+        if isinstance(response, dict) and response.get('errorCode') in const.ONEVIEW_UNAUTHORIZED_ERRORS:
+            return True
+
+        return any(error in str(exc_obj) for error in const.ONEVIEW_UNAUTHORIZED_ERRORS)
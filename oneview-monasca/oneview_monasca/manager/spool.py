@@ -0,0 +1,334 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide a durable on-disk spool, where the measurements that could
+not be sent to Monasca wait to be replayed.
+"""
+
+from oneview_monasca.model.measurement import Measurement
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from threading import Thread
+from threading import Lock
+
+import json
+import time
+import zlib
+import os
+
+LOG = logging.get_logger(__name__)
+
+
+class MetricSpool(Thread):
+    """
+    This class represents an append-only spool of measurements split in
+    segments. Each measurement is a json line of the current segment, that
+    is sealed with its checksum when it reaches the segment size. The sealed
+    segments are replayed to Monasca, oldest first, at a controlled rate.
+
+    Files:
+        <sequence>.seg: The measurements of a segment, one json by line.
+        <sequence>.sum: The checksum and number of measurements of a sealed segment,
+            followed by the number of its measurements already replayed.
+
+    Statistics:
+        spooled: The number of measurements written in the spool.
+        replayed: The number of measurements sent to Monasca from the spool.
+        evicted: The number of measurements discarded because the spool reached its max size.
+        corrupted: The number of segments discarded because its checksum does not match.
+        size: The current size (in bytes) of the spool.
+    """
+    def __init__(self, manager_monasca, directory, segment_size=const.SPOOL_SEGMENT_SIZE,
+                 max_size=const.SPOOL_MAX_SIZE, replay_rate=const.SPOOL_REPLAY_RATE,
+                 replay_interval=const.SPOOL_REPLAY_INTERVAL, debug=False):
+        super(MetricSpool, self).__init__()
+
+        self.debug = debug
+        self._manager_monasca = manager_monasca
+        self._directory = directory
+        self._segment_size = int(segment_size)
+        self._max_size = int(max_size)
+        self._replay_rate = int(replay_rate)
+        self._replay_interval = float(replay_interval)
+        self.stats = Stats()
+
+        # The segment that is receiving the measurements
+        self._segment = None
+        self._segment_crc = 0
+        self._segment_count = 0
+
+        # Thread attributes control
+        self._lock = Lock()
+        self._stopped = True
+
+        if not os.path.exists(self._directory):
+            os.makedirs(self._directory)
+
+        self._recover()
+
+    def stop(self):
+        """ Stops the Thread """
+        self._stopped = True
+        self._lock.acquire()
+        self._seal()
+        self._lock.release()
+        self._Thread__stop()
+
+    def replay(self):
+        """ Start to replay the spool """
+        utils.print_log_message('Info', 'Initialize Metric Spool', LOG)
+
+        self._stopped = False
+        self.daemon = True
+        self.start()
+
+    def append(self, measurements):
+        """ Write a list of measurements in the current segment of the spool.
+
+        :param measurements: A list of Measurement objects that could not be sent to Monasca.
+        """
+        lines = ''.join(self._serialize(measurement) + '\n' for measurement in measurements)
+
+        self._lock.acquire()
+        try:
+            if self._segment is None:
+                self._segment = self._next_sequence()
+
+            with open(self._path(self._segment, '.seg'), 'a') as segment:
+                segment.write(lines)
+                segment.flush()
+                os.fsync(segment.fileno())
+
+            self._segment_crc = zlib.crc32(lines, self._segment_crc)
+            self._segment_count += len(measurements)
+            self.stats.increment('spooled', len(measurements))
+
+            if os.path.getsize(self._path(self._segment, '.seg')) >= self._segment_size:
+                self._seal()
+
+            self._evict()
+        finally:
+            self._lock.release()
+
+    def run(self):
+        """ Replay the sealed segments to Monasca while it is reachable """
+        while not self._stopped:
+            try:
+                self._replay_segments()
+            except Exception as ex:
+                utils.print_log_message('Error', 'Metric Spool failed to replay: %s' % ex, LOG)
+
+            time.sleep(self._replay_interval)
+
+    def _replay_segments(self):
+        """ Send the sealed segments to Monasca, oldest first, removing each
+        segment after all its measurements were sent. A segment evicted while
+        the spool is replayed is skipped.
+
+        :raise Exception if Monasca does not accept the measurements.
+        """
+        self._lock.acquire()
+        self._seal()
+        self._lock.release()
+
+        for sequence in self._sealed_segments():
+            self._lock.acquire()
+            try:
+                if not os.path.exists(self._path(sequence, '.sum')):
+                    continue
+                segment = self._read_segment(sequence)
+            finally:
+                self._lock.release()
+
+            if segment is None:
+                self.stats.increment('corrupted')
+                utils.print_log_message('Error', 'Discarding corrupted spool segment %d' % sequence, LOG)
+            else:
+                self._send(sequence, *segment)
+
+            self._lock.acquire()
+            self._remove(sequence)
+            self.stats.set('size', self._size())
+            self._lock.release()
+
+            message = 'Replayed spool segment %(sequence)d [%(stats)s]' % {'sequence': sequence, 'stats': self.stats}
+            utils.print_log_message('Info', message, LOG)
+
+    def _send(self, sequence, measurements, offset):
+        """ Send the measurements of a segment to Monasca in batches, never faster than the replay
+        rate. The number of measurements sent is kept after each batch, so a segment that fails
+        partway is resumed from the first batch not sent.
+
+        :param sequence: the sequence number of the segment.
+        :param measurements: A list of Measurement objects.
+        :param offset: The number of measurements of the segment already sent.
+        """
+        for index in range(offset, len(measurements), self._replay_rate):
+            start = time.time()
+            batch = measurements[index:index + self._replay_rate]
+            self._manager_monasca.send_metrics(batch)
+            self.stats.increment('replayed', len(batch))
+
+            self._lock.acquire()
+            try:
+                if os.path.exists(self._path(sequence, '.sum')):
+                    crc, count = self._read_checksum(sequence)[:2]
+                    self._write_checksum(sequence, crc, count, index + len(batch))
+            finally:
+                self._lock.release()
+
+            if index + self._replay_rate < len(measurements):
+                time.sleep(max(0, 1 - (time.time() - start)))
+
+    def _read_segment(self, sequence):
+        """ Read the measurements of a sealed segment, checking its checksum.
+        The caller must hold the lock.
+
+        :param sequence: the sequence number of the segment.
+        :return: a tuple with a list of Measurement objects and the number of them already replayed,
+            or None if the segment is corrupted.
+        """
+        crc, count, offset = self._read_checksum(sequence)
+
+        with open(self._path(sequence, '.seg')) as segment:
+            content = segment.read()
+
+        lines = content.splitlines()
+        if zlib.crc32(content) != crc or len(lines) != count:
+            return None
+
+        return [self._deserialize(line) for line in lines], offset
+
+    def _read_checksum(self, sequence):
+        """ Read the checksum file of a sealed segment.
+
+        :param sequence: the sequence number of the segment.
+        :return: a list with the checksum, the number of measurements and the number of them already replayed.
+        """
+        with open(self._path(sequence, '.sum')) as checksum:
+            values = [int(value) for value in checksum.read().split()]
+        return values + [0] * (3 - len(values))
+
+    def _write_checksum(self, sequence, crc, count, offset=0):
+        """ Write the checksum file of a segment, replacing the previous one at once.
+
+        :param sequence: the sequence number of the segment.
+        :param crc: the checksum of the segment.
+        :param count: the number of measurements of the segment.
+        :param offset: the number of measurements of the segment already replayed.
+        """
+        with open(self._path(sequence, '.tmp'), 'w') as checksum:
+            checksum.write('%d %d %d' % (crc, count, offset))
+        os.rename(self._path(sequence, '.tmp'), self._path(sequence, '.sum'))
+
+    def _seal(self):
+        """ Write the checksum of the current segment, making it available to be replayed.
+        The caller must hold the lock.
+        """
+        if self._segment is None:
+            return
+
+        self._write_checksum(self._segment, self._segment_crc, self._segment_count)
+
+        self._segment, self._segment_crc, self._segment_count = None, 0, 0
+
+    def _evict(self):
+        """ Remove the oldest sealed segments while the spool is bigger than its max size.
+        The caller must hold the lock.
+        """
+        size = self._size()
+        for sequence in self._sealed_segments():
+            if size <= self._max_size:
+                break
+
+            crc, count, offset = self._read_checksum(sequence)
+            self.stats.increment('evicted', count - offset)
+
+            size -= os.path.getsize(self._path(sequence, '.seg'))
+            self._remove(sequence)
+            utils.print_log_message('Warn', 'Metric Spool is full, segment %d discarded' % sequence, LOG)
+
+        self.stats.set('size', size)
+
+    def _recover(self):
+        """ Seal the segments left open by a previous execution, keeping only
+        its complete lines.
+        """
+        for sequence in self._segments():
+            if os.path.exists(self._path(sequence, '.sum')):
+                continue
+
+            with open(self._path(sequence, '.seg')) as segment:
+                lines = [line for line in segment.read().splitlines(True) if line.endswith('\n')]
+
+            content = ''.join(lines)
+            with open(self._path(sequence, '.seg'), 'w') as segment:
+                segment.write(content)
+
+            self._segment, self._segment_crc, self._segment_count = sequence, zlib.crc32(content), len(lines)
+            self._seal()
+
+        self.stats.set('size', self._size())
+
+    def _segments(self):
+        """ Get the sequence numbers of all segments in the spool, oldest first """
+        return sorted(
+            int(name[:-len('.seg')]) for name in os.listdir(self._directory) if name.endswith('.seg')
+        )
+
+    def _sealed_segments(self):
+        """ Get the sequence numbers of the sealed segments in the spool, oldest first """
+        return [sequence for sequence in self._segments() if os.path.exists(self._path(sequence, '.sum'))]
+
+    def _next_sequence(self):
+        """ Get the sequence number of a new segment """
+        segments = self._segments()
+        return segments[-1] + 1 if segments else 0
+
+    def _size(self):
+        """ Get the size (in bytes) of all segments in the spool """
+        return sum(os.path.getsize(self._path(sequence, '.seg')) for sequence in self._segments())
+
+    def _remove(self, sequence):
+        """ Remove a segment and its checksum from the spool """
+        for extension in ('.seg', '.sum', '.tmp'):
+            if os.path.exists(self._path(sequence, extension)):
+                os.remove(self._path(sequence, extension))
+
+    def _path(self, sequence, extension):
+        """ Get the path of a segment file """
+        return os.path.join(self._directory, '%012d%s' % (sequence, extension))
+
+    @staticmethod
+    def _serialize(measurement):
+        """ Get the json line of a measurement """
+        return json.dumps({
+            'name': measurement.name, 'value': measurement.value, 'timestamp': measurement.timestamp,
+            'dimensions': measurement.dimensions, 'value_meta': measurement.value_meta
+        })
+
+    @staticmethod
+    def _deserialize(line):
+        """ Get the measurement of a json line, keeping its original timestamp """
+        metric = json.loads(line)
+
+        measurement = Measurement(metric['name'], metric['value'], metric['dimensions'], metric['value_meta'])
+        measurement.timestamp = metric['timestamp']
+        return measurement
@@ -0,0 +1,91 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+Representation of the dimensions of a metric.
+"""
+
+from threading import Lock
+
+import weakref
+
+
+class Dimensions(dict):
+    """This class represents the immutable dimensions of a metric. It is a
+    dict, so it is serialized as any other dimensions, but it cannot be
+    changed and it is hashed by its items. Equal dimensions are interned
+    by the intern method, so they share a single instance.
+
+    :param dimensions: A dict, the dimensions of metric.
+    """
+    _interned = weakref.WeakValueDictionary()
+    _lock = Lock()
+
+    def __init__(self, *args, **kwargs):
+        super(Dimensions, self).__init__(*args, **kwargs)
+        self._items = frozenset(dict.items(self))
+        self._hash = hash(self._items)
+
+    @classmethod
+    def intern(cls, dimensions):
+        """Gets the single instance of some dimensions.
+
+        :param dimensions: A dict, the dimensions of metric.
+        :returns the interned dimensions equal to the given ones.
+        """
+        # The dimensions of the other packages carry its items already frozen
+        items = getattr(dimensions, '_items', None)
+        if not isinstance(items, frozenset):
+            items = frozenset(dimensions.items())
+
+        cls._lock.acquire()
+        try:
+            interned = cls._interned.get(items)
+            if interned is None:
+                interned = dimensions if isinstance(dimensions, cls) else cls(dimensions)
+                cls._interned[items] = interned
+            return interned
+        finally:
+            cls._lock.release()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def _immutable(self, *args, **kwargs):
+        """Refuses any change of the dimensions.
+        """
+        raise TypeError('Dimensions cannot be changed.')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
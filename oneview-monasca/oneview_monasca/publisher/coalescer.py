@@ -0,0 +1,135 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide the coalescing stage of the SCMB, that merges the bursts
+of status changes of the same server hardware.
+"""
+
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from threading import Condition
+from threading import Thread
+from collections import deque
+
+import time
+
+LOG = logging.get_logger(__name__)
+
+
+class StatusCoalescer(object):
+    """
+    This class holds the status of each server hardware during a window,
+    starting at its first change. When the window closes, only the newest
+    status received in the window is published.
+
+    Statistics:
+        received: The number of statuses received.
+        merged: The number of statuses replaced by a newer one of the same server hardware.
+        published: The number of statuses published.
+        discarded: The number of pending statuses discarded when the coalescing was stopped.
+    """
+    def __init__(self, publish, window):
+        self._publish = publish
+        self._window = float(window) / 1000
+        self.stats = Stats()
+
+        # The pending statuses and the time its windows close, in order
+        self._pending = {}
+        self._deadlines = deque()
+
+        # Thread attributes control
+        self._condition = Condition()
+        self._stopped = False
+
+        self._worker = Thread(target=self._run)
+        self._worker.daemon = True
+        self._worker.start()
+
+    def stop(self):
+        """ Stop the coalescing, discarding the pending statuses """
+        self._condition.acquire()
+        self._stopped = True
+        self.stats.set('discarded', len(self._pending))
+        self._condition.notify_all()
+        self._condition.release()
+
+        self._worker.join(self._window)
+
+        message = 'Status Coalescer stopped [%(stats)s]' % {'stats': self.stats}
+        utils.print_log_message('Info', message, LOG)
+
+    def put(self, status):
+        """ Hold a status until the window of its server hardware closes.
+
+        :param status: A Status object.
+        """
+        uuid = status.server_hardware_uuid
+
+        self._condition.acquire()
+        self.stats.increment('received')
+
+        pending = self._pending.get(uuid)
+        if pending is None:
+            self._pending[uuid] = status
+            self._deadlines.append((time.time() + self._window, uuid))
+            self._condition.notify_all()
+        else:
+            self.stats.increment('merged')
+            if status.modified_timestamp >= pending.modified_timestamp:
+                self._pending[uuid] = status
+
+        self._condition.release()
+
+    def _next_states(self):
+        """ Wait until the oldest window closes.
+
+        :return: a set with the statuses whose windows closed, or None if the coalescing was stopped.
+        """
+        self._condition.acquire()
+        try:
+            while not self._stopped:
+                if not self._deadlines:
+                    self._condition.wait()
+                    continue
+
+                remaining = self._deadlines[0][0] - time.time()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                states = set()
+                while self._deadlines and self._deadlines[0][0] <= time.time():
+                    _, uuid = self._deadlines.popleft()
+                    states.add(self._pending.pop(uuid))
+                return states
+        finally:
+            self._condition.release()
+
+    def _run(self):
+        """ Publish the statuses as its windows close """
+        while True:
+            states = self._next_states()
+            if states is None:
+                return
+
+            try:
+                self._publish(states)
+                self.stats.increment('published', len(states))
+            except Exception as ex:
+                utils.print_log_message('Error', 'Failed to publish coalesced statuses: %s' % ex, LOG)
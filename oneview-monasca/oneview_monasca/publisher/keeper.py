@@ -21,7 +21,9 @@ This module represents the Keeper component from oneview_monasca agent.
 
 from oneview_monasca.eventbus.base import DiscoveryNodeSubscriber
 from oneview_monasca.model.measurement import Measurement
+from oneview_monasca.model.dimensions import Dimensions
 from oneview_monasca.publisher.base import PublisherSubscriber
+from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import log as logging
 from oneview_monasca.shared import utils
 from threading import Thread
@@ -46,13 +48,29 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
         lock: Manage the access of another publishers to shared data structs to avoid race condition.
     """
 
-    def __init__(self, oneview_manager, monasca_manager, batch_time, debug=False):
+    def __init__(self, oneview_manager, monasca_manager, batch_time, change_only=False,
+                 meta_ttl=const.KEEPER_META_TTL, prefetch_threshold=const.ALERT_PREFETCH_THRESHOLD,
+                 retry_policies=None, agent_metrics=None, debug=False):
         super(Keeper, self).__init__()
         Thread.__init__(self)
 
         self.debug = debug
         self._metric_storage = {}
         self._batch_time = int(batch_time)
+        # If True, the alerts are requested and the metrics are sent right away
+        # only when the status value changes. The statuses that only repeat the
+        # stored value are published by the periodic batch.
+        self._change_only = change_only
+        self._meta_ttl = int(meta_ttl)
+        # When at least this number of nodes need its alerts in the same update,
+        # all active alerts are requested at once. Zero disables the prefetch.
+        self._prefetch_threshold = int(prefetch_threshold)
+        # A function that gets the (component, RetryPolicy) tuples whose
+        # statistics are published with the periodic batch, if any.
+        self._retry_policies = retry_policies
+        # A function that gets the metrics of the statistics of the agent
+        # components (e.g. the Puller cycles), published with the periodic batch.
+        self._agent_metrics = agent_metrics
 
         self._manager_oneview = oneview_manager
         self._manager_monasca = monasca_manager
@@ -79,16 +97,29 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
         information from nodes, and pushes all this new information to
         Monasca.
         """
-        valid_metrics = []
+        updated_nodes, meta_nodes = [], []
         for status in states:
             uuid = status.server_hardware_uuid
-            updated = self._update_status(status)
-            if updated:
-                self._update_meta(uuid)
-                self._lock.acquire()
-                node_metrics = self._create_measurements(uuid)
-                self._lock.release()
-                valid_metrics.extend(node_metrics)
+            updated, changed = self._update_status(status)
+            if updated and self._change_only and not changed:
+                if self._is_meta_expired(uuid):
+                    meta_nodes.append(uuid)
+
+            elif updated:
+                meta_nodes.append(uuid)
+                updated_nodes.append(uuid)
+
+        self._prefetch_meta(meta_nodes)
+        for uuid in meta_nodes:
+            self._update_meta(uuid)
+
+        valid_metrics = []
+        for uuid in updated_nodes:
+            self._lock.acquire()
+            # The node may be removed while its alerts were requested
+            if uuid in self._metric_storage:
+                valid_metrics.extend(self._create_measurements(uuid))
+            self._lock.release()
 
         if len(valid_metrics) > 0:
             self._manager_monasca.send_metrics(valid_metrics)
@@ -101,9 +132,10 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
         valid.
 
         :param status: A Status object representing a server hardware state from OneView.
-        :rtype: A :boolean: - True, if the server hardware have a newer status.
+        :rtype: A tuple with two :boolean: - True, if the server hardware have a newer status,
+            and True, if the newer status has a different value of the stored one.
         """
-        result = False
+        result, changed = False, False
         uuid = status.server_hardware_uuid
 
         # Locking shared resource
@@ -114,15 +146,55 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
             if stored_status is None:
                 self._metric_storage[uuid]['status'] = status
                 utils.print_log_message('Info', "gathered first status for %s:%s" % (uuid, status), LOG)
-                result = True
+                result, changed = True, True
 
             elif status.modified_timestamp >= stored_status.modified_timestamp:
                 self._metric_storage[uuid]['status'] = status
-                result = True
+                result, changed = True, status.status != stored_status.status
+
+        # Unlocking shared resource
+        self._lock.release()
+        return result, changed
+
+    def _is_meta_expired(self, uuid):
+        """
+        This method verify if the meta value information for a given uuid
+        is older than the meta TTL.
 
+        :param uuid: The server hardware uuid from monitored OneView resource
+        :rtype: A :boolean: - True, if the alerts should be requested again.
+        """
+        # Locking shared resource
+        self._lock.acquire()
+        meta_time = self._metric_storage[uuid].get('meta_time', 0) if uuid in self._metric_storage else time.time()
         # Unlocking shared resource
         self._lock.release()
-        return result
+
+        return time.time() - meta_time >= self._meta_ttl
+
+    def _prefetch_meta(self, uuids):
+        """
+        This method requests the alerts of many uuids at once, when they are
+        at least the prefetch threshold. If the prefetch fails, the alerts
+        are requested by uuid.
+
+        :param uuids: The server hardware uuids whose meta value will be updated
+        """
+        if not self._prefetch_threshold or len(uuids) < self._prefetch_threshold:
+            return
+
+        # Locking shared resource
+        self._lock.acquire()
+        states = dict(
+            (uuid, self._metric_storage[uuid]['status'].status) for uuid in uuids if uuid in self._metric_storage
+        )
+        # Unlocking shared resource
+        self._lock.release()
+
+        try:
+            self._manager_oneview.prefetch_server_hardware_alerts(states)
+        except Exception as ex:
+            utils.print_log_message('Warn', 'Failed to prefetch the alerts: %s' % ex, LOG)
 
     def _update_meta(self, uuid):
         """
@@ -133,9 +205,11 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
         # Locking shared resource
         self._lock.acquire()
 
-        status = self._metric_storage[uuid]['status'].status
-        self._metric_storage[uuid]['meta'] = \
-            self._manager_oneview.get_server_hardware_alerts(uuid, status)
+        if uuid in self._metric_storage:
+            status = self._metric_storage[uuid]['status'].status
+            self._metric_storage[uuid]['meta'] = \
+                self._manager_oneview.get_server_hardware_alerts(uuid, status)
+            self._metric_storage[uuid]['meta_time'] = time.time()
 
         # Unlocking shared resource
         self._lock.release()
@@ -154,11 +228,42 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
                 meta = self._metric_storage[uuid]['meta']
                 value = stored_status.status
 
-                measurement = Measurement(metric.name, value, metric.dimensions, meta)
+                # The measurements of a metric share its interned and immutable dimensions
+                dimensions = Dimensions.intern(metric.dimensions)
+                measurement = Measurement(metric.name, value, dimensions, meta)
                 measurements_list.append(measurement)
 
         return measurements_list
 
+    def _create_policy_measurements(self):
+        """
+        This method create the measurements of the statistics of the retry policies.
+
+        :rtype: A list with a Measurement object by statistic of each retry policy.
+        """
+        measurements_list = []
+        if self._retry_policies is None:
+            return measurements_list
+
+        for component, policy in self._retry_policies():
+            dimensions = Dimensions.intern({'component': component, 'dependency': policy.name})
+            for name, value in sorted(policy.metrics().items()):
+                measurements_list.append(Measurement(name, value, dimensions))
+
+        return measurements_list
+
+    def _create_agent_measurements(self):
+        """
+        This method create the measurements of the statistics of the agent components.
+
+        :rtype: A list with a Measurement object by statistic.
+        """
+        if self._agent_metrics is None:
+            return []
+
+        dimensions = Dimensions.intern({'component': const.AGENT_METRIC_COMPONENT})
+        return [Measurement(name, value, dimensions) for name, value in sorted(self._agent_metrics().items())]
+
     def available(self, nodes):
         """
         This method updates the data structure adding new nodes or new
@@ -212,6 +317,8 @@ class Keeper(PublisherSubscriber, DiscoveryNodeSubscriber, Thread):
 
                     # Unlocking shared resource
                     self._lock.release()
+                    all_measurements.extend(self._create_policy_measurements())
+                    all_measurements.extend(self._create_agent_measurements())
                     self._manager_monasca.send_metrics(all_measurements)
                     utils.print_log_message(
                         'Debug', 'Finished send actual metrics from data structure', LOG, self.debug)
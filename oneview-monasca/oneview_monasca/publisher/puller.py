@@ -21,8 +21,12 @@ This module represents the Puller component from oneview_monasca agent.
 
 from oneview_monasca.eventbus.base import DiscoveryNodeSubscriber
 from oneview_monasca.publisher.base import PublisherProvider
+from oneview_monasca.shared.exceptions import CircuitOpenException
+from oneview_monasca.shared.fetch_engine import FetchEngine
+from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import log as logging
 from oneview_monasca.model.status import Status
+from oneview_monasca.shared.stats import Stats
 from oneview_monasca.shared import utils
 from threading import Thread
 from threading import Lock
@@ -40,9 +44,17 @@ class Puller(PublisherProvider, DiscoveryNodeSubscriber, Thread):
     Thread control:
         stopped: Manage the thread state (running or stopped).
         lock: Manage the access of another publishers to shared data structs to avoid race condition.
+
+    Statistics:
+        cycle_duration: The time (in seconds) spent by each cycle of process status.
+        cycle_overrun: The time (in seconds) that a cycle took beyond the refresh interval.
+        cycle_overruns: The number of cycles that took longer than the refresh interval.
+        cycles_skipped: The number of cycles skipped because the circuit breaker of OneView is open.
     """
 
-    def __init__(self, manager_oneview, refresh_interval, crash_callback, debug=False):
+    def __init__(self, manager_oneview, refresh_interval, crash_callback, bulk_collection=False,
+                 fetch_workers=1, appliance_concurrency=None, publish_batch_size=const.PULLER_PUBLISH_BATCH_SIZE,
+                 debug=False):
         super(Puller, self).__init__()
         Thread.__init__(self)
 
@@ -50,6 +62,14 @@ class Puller(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         self._manager_oneview = manager_oneview
         self._crash_callback = crash_callback
         self._refresh_interval = int(refresh_interval)
+        # If True, the status of all monitored nodes are taken from a single
+        # pass over the server hardware collection.
+        self._bulk_collection = bulk_collection
+        # If there is more than one worker, the status of each node is
+        # requested in parallel and published in micro-batches.
+        self._fetch_engine = FetchEngine(fetch_workers, appliance_concurrency) if int(fetch_workers) > 1 else None
+        self._publish_batch_size = int(publish_batch_size)
+        self.stats = Stats()
 
         #  This boolean indicates if it's the first time that the Puller
         #  receives available nodes.
@@ -64,8 +84,17 @@ class Puller(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         """ Stop the Thread.
         """
         self._stopped = True
+        if self._fetch_engine is not None:
+            self._fetch_engine.stop()
         self._Thread__stop()
 
+    def metrics(self):
+        """ Get the statistics of the cycles to be published as metrics.
+
+        :return: a dict that maps each metric name to its current value.
+        """
+        return dict((const.PULLER_METRIC_PREFIX + name, value) for name, value in self.stats.snapshot().items())
+
     def publish(self):
         """ Initialize the process of Component.
         """
@@ -117,29 +146,123 @@ class Puller(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         for subscribers.
         """
         utils.print_log_message('Info', 'Start process status from OneView resources', LOG)
+        start = time.time()
 
-        try:
-            states = set()
-            # Locking shared resource
-            self._lock.acquire()
-            for server_hardware_uuid in self._monitored_nodes:
-                status, str_timestamp = self._manager_oneview.get_server_hardware_status(server_hardware_uuid)
-
-                if status is not None and str_timestamp:
-                    modified_timestamp = utils.parse_timestamp(str_timestamp)
-                    states.add(Status(server_hardware_uuid, status, modified_timestamp))
+        # Taking a snapshot of the monitored nodes, the requests are done
+        # without the lock to not block the discovery of nodes.
+        self._lock.acquire()
+        monitored_nodes = frozenset(self._monitored_nodes)
+        self._lock.release()
 
-            # Unlocking shared resource
-            self._lock.release()
+        try:
+            if self._bulk_collection:
+                states = self._get_states_bulk(monitored_nodes)
+            elif self._fetch_engine is not None:
+                states = self._get_states_parallel(monitored_nodes)
+            else:
+                states = self._get_states(monitored_nodes)
 
+            states = self._filter_monitored(states)
             if states:
                 self.status_update(states)
                 utils.print_log_message('Info', 'End process status from OneView resources', LOG)
 
+        except CircuitOpenException as ex:
+            # OneView is failing, the cycle is skipped until the circuit breaker lets a call through
+            self.stats.increment('cycles_skipped')
+            utils.print_log_message('Warn', 'Skipping process status cycle: %s' % ex, LOG)
+
         except Exception as ex:
-            self._lock.release()
             self._crash_callback(ex)
 
+        self._observe_cycle(time.time() - start)
+
+    def _observe_cycle(self, duration):
+        """ Record the duration of a process status cycle, warning when it
+        takes longer than the refresh interval.
+
+        :param duration: The time (in seconds) spent by the cycle.
+        """
+        overrun = max(0, duration - self._refresh_interval)
+        self.stats.observe('cycle_duration', duration)
+        self.stats.observe('cycle_overrun', overrun)
+
+        if overrun > 0:
+            self.stats.increment('cycle_overruns')
+            message = 'Process status cycle overran the refresh interval by %.1f seconds [%s]' % (overrun, self.stats)
+            utils.print_log_message('Warn', message, LOG)
+
+    def _filter_monitored(self, states):
+        """ Discard the statuses of the nodes that became unavailable while
+        its status was requested.
+
+        :param states: A set of Status objects.
+        :return: A set with the Status objects of the nodes still monitored.
+        """
+        self._lock.acquire()
+        states = {status for status in states if status.server_hardware_uuid in self._monitored_nodes}
+        self._lock.release()
+        return states
+
+    def _get_states(self, monitored_nodes):
+        """ Get the status of each monitored node, one request by node.
+
+        :param monitored_nodes: A snapshot of the monitored server hardware uuids.
+        :return: A set of Status objects.
+        """
+        states = set()
+        for server_hardware_uuid in monitored_nodes:
+            status, str_timestamp = self._manager_oneview.get_server_hardware_status(server_hardware_uuid)
+
+            if status is not None and str_timestamp:
+                modified_timestamp = utils.parse_timestamp(str_timestamp)
+                states.add(Status(server_hardware_uuid, status, modified_timestamp))
+
+        return states
+
+    def _get_states_parallel(self, monitored_nodes):
+        """ Get the status of each monitored node, requesting many nodes at
+        the same time and publishing the statuses in micro-batches as the
+        requests complete.
+
+        :param monitored_nodes: A snapshot of the monitored server hardware uuids.
+        :return: A set with the Status objects not published yet.
+        """
+        states = set()
+        results = self._fetch_engine.imap_unordered(
+            self._manager_oneview.get_server_hardware_status, monitored_nodes,
+            key=getattr(self._manager_oneview, 'host', None)
+        )
+        for server_hardware_uuid, (status, str_timestamp) in results:
+            if status is not None and str_timestamp:
+                modified_timestamp = utils.parse_timestamp(str_timestamp)
+                states.add(Status(server_hardware_uuid, status, modified_timestamp))
+
+            if len(states) >= self._publish_batch_size:
+                self.status_update(self._filter_monitored(states))
+                states = set()
+
+        return states
+
+    def _get_states_bulk(self, monitored_nodes):
+        """ Get the status of all monitored nodes from the server hardware
+        collection, matching each collected resource with the monitored nodes.
+
+        :param monitored_nodes: A snapshot of the monitored server hardware uuids.
+        :return: A set of Status objects.
+        """
+        states = set()
+        if not monitored_nodes:
+            return states
+
+        collected = self._manager_oneview.get_server_hardware_states(monitored_nodes)
+        for server_hardware_uuid, (status, str_timestamp) in collected.items():
+            if status is not None and str_timestamp:
+                modified_timestamp = utils.parse_timestamp(str_timestamp)
+                states.add(Status(server_hardware_uuid, status, modified_timestamp))
+
+        return states
+
     def run(self):
         """ Pull and process status from OneView resources and publish to
         subscribers.
@@ -22,6 +22,9 @@ This module represents the SCMB component from oneview_monasca agent.
 from oneview_monasca.shared.exceptions import SCMBConnectionFailException
 from oneview_monasca.eventbus.base import DiscoveryNodeSubscriber
 from oneview_monasca.shared.exceptions import LoginFailException
+from oneview_monasca.publisher.scmb_pipeline import SCMBPipeline
+from oneview_monasca.publisher.scmb_consumer import SCMBConsumer
+from oneview_monasca.publisher.coalescer import StatusCoalescer
 from oneview_monasca.publisher.base import PublisherProvider
 from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import log as logging
@@ -30,11 +33,15 @@ from oneview_monasca.model.status import Status
 from pika.exceptions import AMQPConnectionError
 from pika.exceptions import AMQPChannelError
 from oneview_monasca.shared import utils
+from threading import current_thread
 from threading import Thread
+from collections import deque
+from datetime import datetime
 from threading import Lock
 
 import json
 import pika
+import time
 
 LOG = logging.get_logger(__name__)
 
@@ -47,7 +54,11 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         stopped: Manage the thread state (running or stopped).
         lock: Manage the access of another publishers to shared data structs to avoid race condition.
     """
-    def __init__(self, manager_oneview, host, max_retry_attempts, crash_callback, debug=False):
+    def __init__(self, manager_oneview, host, max_retry_attempts, crash_callback, workers=0,
+                 queue_size=const.SCMB_QUEUE_SIZE, coalesce_window=0, alert_index=None, resource_bindings=False,
+                 binding_threshold=const.SCMB_BINDING_THRESHOLD, durable_queue=None,
+                 prefetch_count=const.SCMB_PREFETCH_COUNT, async_consumer=False, heartbeat=const.SCMB_HEARTBEAT,
+                 alert_cache=None, debug=False):
         super(SCMB, self).__init__()
         Thread.__init__(self)
 
@@ -59,6 +70,40 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         self._manager_oneview = manager_oneview
         self._max_retry_attempts = int(max_retry_attempts)
 
+        # If there are workers, the consumer only enqueues the messages and
+        # the workers process them, else the consumer processes each message.
+        self._pipeline = SCMBPipeline(
+            self._process_message, workers, queue_size, on_done=self._on_processed
+        ) if int(workers) > 0 else None
+        # If there is a coalescing window (in milliseconds), only the newest
+        # status of each server hardware in the window is published.
+        self._coalescer = StatusCoalescer(self.status_update, coalesce_window) if int(coalesce_window) > 0 else None
+        # If there is an alerts index, the SCMB listens the alerts changes too and
+        # keeps the index up to date, rebuilding it at each new connection.
+        self._alert_index = alert_index
+        # If there is an alerts cache, the SCMB listens the alerts changes too and
+        # removes the cached alerts of the resource of each changed alert.
+        self._alert_cache = alert_cache
+        # If True, the queue is bound by the routing key of each monitored server
+        # hardware, so the others are filtered by RabbitMQ, unless there are more
+        # monitored server hardware than the threshold.
+        self._resource_bindings = resource_bindings
+        self._binding_threshold = int(binding_threshold)
+        # If there is a durable queue name, the messages are consumed from this
+        # queue, kept by RabbitMQ across reconnections, with at most the
+        # prefetch count of messages not acked, each one acked after processed.
+        self._durable_queue = durable_queue
+        self._prefetch_count = int(prefetch_count)
+        # If True, the SCMB is consumed by an event loop that keeps the
+        # heartbeats, instead of a blocking connection. The event loop must
+        # not process the messages, so it requires the workers.
+        self._async_consumer = async_consumer and self._pipeline is not None
+        if async_consumer and self._pipeline is None:
+            utils.print_log_message(
+                'Warn', 'The SCMB async consumer requires scmb_workers > 0, using the blocking consumer', LOG
+            )
+        self._heartbeat = heartbeat
+
         # Thread attributes control
         self._lock = Lock()
         self._stopped = True
@@ -66,14 +111,35 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         # RabbitMQ attributes manage
         self._channel = None
         self._connection = None
+        self._consumer = None
+        self._queue_name = None
+        self._bound_keys = set()
+        # The (channel, delivery tag) of the messages processed by the pipeline, waiting to be acked
+        self._acks = deque()
+        # The time the connection with SCMB was lost, to refresh the updates missed until the reconnection
+        self._disconnected_at = None
+        # The time the first message was lost by the event loop consumer, to refresh its update later
+        self._dropped_at = None
         self._reload_certs = True
 
     def stop(self):
         """ Stop the Thread.
         """
-        self._stop_scmb()
         self._stopped = True
+        self._stop_scmb()
 
+        if self._pipeline is not None:
+            self._pipeline.stop()
+        if self._coalescer is not None:
+            self._coalescer.stop()
+
+        # The event loop leaves as soon as the consumer is cancelled, so the
+        # thread is only forced to stop if it does not leave in time
+        if self._async_consumer and current_thread() is not self:
+            if self.isAlive():
+                self.join(const.SCMB_STOP_TIMEOUT)
+            if not self.isAlive():
+                return
         self._Thread__stop()
 
     def publish(self):
@@ -124,22 +190,8 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         :return: A instance of pika connection
         """
         if self._connection is None:
-            # Validate current certificate
-            self._manager_oneview.validate_certificates()
-
-            # Setup our ssl options
-            ssl_options = self._manager_oneview.get_certificates()
-
             # Connect to RabbitMQ
-            self._connection = pika.BlockingConnection(
-                pika.ConnectionParameters(
-                    self._host,
-                    const.MB_PORT,
-                    credentials=ExternalCredentials(),
-                    ssl=True,
-                    ssl_options=ssl_options
-                )
-            )
+            self._connection = pika.BlockingConnection(self._connection_parameters())
         return self._connection
 
     @connection.setter
@@ -151,6 +203,39 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         # Set connection to None value
         self._connection = value
 
+    def _connection_parameters(self, heartbeat=None):
+        """ Get the parameters to open a connection with RabbitMQ, validating the SCMB certificates.
+
+        :param heartbeat: the heartbeat interval (in seconds), or None to accept the RabbitMQ proposal.
+        :return: A instance of pika connection parameters
+        """
+        # Validate current certificate
+        self._manager_oneview.validate_certificates()
+
+        # Setup our ssl options
+        ssl_options = self._manager_oneview.get_certificates()
+
+        parameters = pika.ConnectionParameters(
+            self._host,
+            const.MB_PORT,
+            credentials=ExternalCredentials(),
+            ssl=True,
+            ssl_options=ssl_options
+        )
+        if heartbeat is not None:
+            parameters.heartbeat = int(heartbeat)
+
+        return parameters
+
+    def _queue_arguments(self):
+        """ Get the arguments to declare the SCMB queue
+
+        :return: a dict with the queue_declare arguments.
+        """
+        if self._durable_queue:
+            return {'queue': self._durable_queue, 'durable': True, 'exclusive': False, 'auto_delete': False}
+        return {}
+
     def _initialize_scmb(self):
         """ Function to open a communication channel between the Monasca/OneViewD and OneView SCMB.
 
@@ -158,29 +243,210 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         """
         utils.print_log_message('Info', 'Starting agent for listening changes in monitored nodes', LOG)
 
+        if self._async_consumer:
+            # The event loop sets up the channel when the queue is declared
+            self._consumer = SCMBConsumer(
+                self._connection_parameters(self._heartbeat), self._queue_arguments(), self._setup_channel
+            )
+            self._consumer.run()
+            return
+
         # Create a connection with RabbitMQ and Create and bind to queue
-        self._channel = self.connection.channel()
+        channel = self.connection.channel()
+        result = channel.queue_declare(**self._queue_arguments())
 
-        result = self._channel.queue_declare()
-        queue_name = result.method.queue
+        self._setup_channel(channel, result.method.queue)
+        self._channel.start_consuming()
 
-        self._channel.queue_bind(exchange=const.EXCHANGE_NAME, queue=queue_name, routing_key=const.ROUTING_KEY)
+    def _setup_channel(self, channel, queue_name):
+        """ Bind the declared queue and start to consume it.
 
-        self._channel.basic_consume(self._scmb_callback, queue=queue_name, no_ack=True)
+        :param channel: the channel to connect SCMB and RabbitMQ.
+        :param queue_name: the name of the declared queue.
+        :return: the consumer tag.
+        """
+        self._channel = channel
+        self._queue_name = queue_name
+
+        if self._durable_queue:
+            self._channel.basic_qos(prefetch_count=self._prefetch_count)
+
+        # The bindings of a durable queue outlive the channel, so the keys bound before are kept
+        # to unbind the ones of the nodes that are not monitored anymore
+        if not self._durable_queue:
+            self._bound_keys = set()
+        self._update_bindings(rebind=True)
+        if self._resource_bindings:
+            # The channel is not thread safe, so the changes of the monitored
+            # nodes are bound by the consumer thread, between the messages.
+            self._add_timeout(const.SCMB_BINDING_INTERVAL, self._on_bindings_timeout)
+
+        if self._alert_index is not None or self._alert_cache is not None:
+            self._channel.queue_bind(
+                exchange=const.EXCHANGE_NAME, queue=queue_name, routing_key=const.ALERTS_ROUTING_KEY
+            )
+        if self._alert_index is not None:
+            if self._consumer is None:
+                self._resync_alerts()
+            else:
+                # The event loop keeps the heartbeats while the alerts are requested
+                self._alert_index.prepare_rebuild()
+                self._run_helper(self._resync_alerts)
+
+        consumer_tag = self._channel.basic_consume(
+            self._scmb_callback, queue=queue_name, no_ack=not self._durable_queue
+        )
+        if self._durable_queue and self._pipeline is not None:
+            # The channel is not thread safe, so the messages processed by the
+            # workers are acked by the consumer thread, between the messages.
+            self._acks.clear()
+            self._add_timeout(const.SCMB_ACK_INTERVAL, self._on_acks_timeout)
 
         utils.print_log_message('Info', 'Start listening for SCMB messages', LOG)
         self._reload_certs = True
-        self._channel.start_consuming()
+
+        if self._disconnected_at is not None:
+            # The updates from now on are in the queue, so only the gap is requested
+            since, self._disconnected_at = self._disconnected_at, None
+            self._run_helper(self._refresh_gap, since)
+
+        return consumer_tag
+
+    @staticmethod
+    def _run_helper(target, *args):
+        """ Run a function in a helper thread, so the consumer thread does not wait for it.
+
+        :param target: the function to be run.
+        :param args: the arguments of the function.
+        """
+        helper = Thread(target=target, args=args)
+        helper.daemon = True
+        helper.start()
+
+    def _refresh_gap(self, since):
+        """ Publish the status of the monitored nodes modified while the connection with SCMB was lost.
+
+        :param since: the time the connection was lost.
+        """
+        self._lock.acquire()
+        monitored_nodes = frozenset(self._monitored_nodes)
+        self._lock.release()
+
+        if not monitored_nodes:
+            return
+
+        modified_since = datetime.utcfromtimestamp(since - const.SCMB_GAP_MARGIN).strftime(
+            const.ONEVIEW_TIMESTAMP_FORMAT
+        )
+
+        try:
+            collected = self._manager_oneview.get_server_hardware_states(monitored_nodes, modified_since=modified_since)
+        except Exception as ex:
+            utils.print_log_message('Warn', 'Failed to refresh the SCMB updates missed: %s' % ex, LOG)
+            return
+
+        states = set()
+        for uuid, (status, str_timestamp) in collected.items():
+            if status is not None and str_timestamp:
+                states.add(Status(uuid, status, utils.parse_timestamp(str_timestamp)))
+
+        message = 'Refreshed %(count)d nodes modified since %(since)s' % {'count': len(states), 'since': modified_since}
+        utils.print_log_message('Info', message, LOG)
+
+        if self._coalescer is None:
+            if states:
+                self.status_update(states)
+        else:
+            for status in states:
+                self._coalescer.put(status)
+
+    def _add_timeout(self, deadline, callback):
+        """ Schedule a function to be called by the consumer thread
+
+        :param deadline: the time (in seconds) to wait before the call.
+        :param callback: the function, called without arguments.
+        """
+        connection = self._consumer.connection if self._consumer is not None else self.connection
+        connection.add_timeout(deadline, callback)
+
+    def _routing_keys(self):
+        """ Get the routing keys that should be bound to receive the updates of the monitored nodes
+
+        :return: a set with the routing keys.
+        """
+        self._lock.acquire()
+        monitored_nodes = set(self._monitored_nodes)
+        self._lock.release()
+
+        if not self._resource_bindings or len(monitored_nodes) > self._binding_threshold:
+            return {const.ROUTING_KEY}
+
+        return {const.RESOURCE_ROUTING_KEY_PREFIX + const.ONEVIEW_URI_PREFIX + uuid for uuid in monitored_nodes}
+
+    def _update_bindings(self, rebind=False):
+        """ Bind the routing keys of the nodes that started to be monitored and unbind the
+        routing keys of the nodes that are not monitored anymore. The new routing keys are
+        bound first, so no update is lost when switching to or from the default routing key.
+
+        :param rebind: if True, all routing keys are bound again (e.g. in a new channel).
+        """
+        routing_keys = self._routing_keys()
+        added, removed = routing_keys - self._bound_keys, self._bound_keys - routing_keys
+        if rebind:
+            added = routing_keys
+
+        for routing_key in added:
+            self._channel.queue_bind(exchange=const.EXCHANGE_NAME, queue=self._queue_name, routing_key=routing_key)
+        for routing_key in removed:
+            self._channel.queue_unbind(exchange=const.EXCHANGE_NAME, queue=self._queue_name, routing_key=routing_key)
+
+        self._bound_keys = routing_keys
+        if added or removed:
+            message = 'SCMB routing keys updated: %(added)d bound, %(removed)d unbound' % {
+                'added': len(added), 'removed': len(removed)
+            }
+            utils.print_log_message('Debug', message, LOG, self.debug)
+
+    def _on_bindings_timeout(self):
+        """ Update the routing keys bound by monitored node, periodically, in the consumer thread """
+        if self._channel is None:
+            return
+
+        self._update_bindings()
+        self._add_timeout(const.SCMB_BINDING_INTERVAL, self._on_bindings_timeout)
+
+    def _on_processed(self, ack):
+        """ Keep the ack of a message processed by the pipeline, to be sent by the consumer thread
+
+        :param ack: the (channel, delivery tag) of the message, or None if it does not need an ack
+        """
+        if ack is not None:
+            self._acks.append(ack)
+
+    def _on_acks_timeout(self):
+        """ Ack the messages processed by the pipeline, periodically, in the consumer thread.
+        The messages received by a previous channel are redelivered by RabbitMQ, so its acks are discarded.
+        """
+        if self._channel is None:
+            return
+
+        while self._acks:
+            channel, delivery_tag = self._acks.popleft()
+            if channel is self._channel:
+                channel.basic_ack(delivery_tag=delivery_tag)
+
+        self._add_timeout(const.SCMB_ACK_INTERVAL, self._on_acks_timeout)
 
     def _stop_scmb(self):
         """ Shutdown the connection to Oneview SCMB by stopping the consumer with RabbitMQ.
-        When RabbitMQ confirms the cancellation, on_cancelok
-        will be invoked by pika, which will then closing the channel and
-        connection.
         """
 
         # Stop listening for messages
-        if self._channel is not None:
+        if self._consumer is not None:
+            utils.print_log_message('Info', 'Stopping the SCMB consumer', LOG)
+            self._consumer.stop()
+            self._consumer = None
+        elif self._channel is not None:
             utils.print_log_message('Info', 'Stopping the RabbitMQ channel', LOG)
             self._channel.stop_consuming()
 
@@ -188,13 +454,22 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         self.connection = None
         utils.print_log_message('Info', 'Connection with RabbitMQ was stopped successfully', LOG)
 
-    def on_cancelok(self, unused_frame):
-        """ This method is invoked by pika when RabbitMQ acknowledges the cancellation of a consumer.
+        # The alerts changes are lost until the next connection
+        if self._alert_index is not None:
+            self._alert_index.invalidate()
+        if self._alert_cache is not None:
+            self._alert_cache.clear()
 
-        :param unused_frame:
+    def _resync_alerts(self):
+        """ Rebuild the alerts index with a single request of all active alerts.
+        The alerts changes received after the rebuild are already bound to the queue.
+        If the request fails, the alerts are requested by resource until the next connection.
         """
-        utils.print_log_message('Info', 'Closing the RabbitMQ channel', LOG)
-        self._channel.close()
+        try:
+            self._alert_index.rebuild(self._manager_oneview.get_active_alerts())
+            utils.print_log_message('Info', 'Alerts index rebuilt [%s]' % self._alert_index.stats, LOG)
+        except Exception as ex:
+            utils.print_log_message('Warn', 'Failed to rebuild the alerts index: %s' % ex, LOG)
 
     def run(self):
         """ Default method the start a thread
@@ -240,18 +515,79 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         :param properties: the message properties
         :param body: the body of message
         """
+        ack = (ch, method.delivery_tag) if self._durable_queue else None
+
+        if self._pipeline is not None:
+            # The event loop must not wait for the workers, so the messages are rejected when the queue is full
+            if not self._pipeline.put(method.routing_key, body, ack, block=not self._async_consumer):
+                self._on_rejected(ch, method)
+        else:
+            try:
+                self._process_message(method.routing_key, body)
+            finally:
+                if ack is not None:
+                    ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    def _on_rejected(self, ch, method):
+        """ Handle a message rejected by the full pipeline, in the consumer thread. The messages of
+        the durable queue are delivered again by RabbitMQ, else the updates of the monitored nodes
+        modified since the first message lost are refreshed later.
+
+        :param ch: the channel to connect SCMB and RabbitMQ
+        :param method: the method used to get the message
+        """
+        if self._durable_queue:
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+
+        if self._dropped_at is None:
+            utils.print_log_message('Warn', 'SCMB pipeline is full, the messages are being lost', LOG)
+            self._dropped_at = time.time()
+            self._add_timeout(const.SCMB_OVERFLOW_REFRESH_DELAY, self._on_overflow_timeout)
+
+    def _on_overflow_timeout(self):
+        """ Refresh the updates lost while the pipeline was full, in a helper thread """
+        since, self._dropped_at = self._dropped_at, None
+
+        if self._alert_cache is not None:
+            self._alert_cache.clear()
+        if self._alert_index is not None:
+            self._alert_index.invalidate()
+            self._alert_index.prepare_rebuild()
+            self._run_helper(self._resync_alerts)
+        self._run_helper(self._refresh_gap, since)
+
+    def _process_message(self, routing_key, body):
+        """ Function to process a SCMB message, publishing the status of the changed resource
+
+        :param routing_key: the routing key of the message
+        :param body: the body of message
+        """
         # Parsing State-Change Message Bus message body
         message = json.loads(body)
         # Get interest resource
         resource = message['resource']
 
+        # The alerts messages are only bound when there is an alerts index or cache
+        listen_alerts = self._alert_index is not None or self._alert_cache is not None
+        if listen_alerts and routing_key.startswith(const.ALERTS_ROUTING_KEY_PREFIX):
+            if self._alert_index is not None:
+                self._alert_index.update(resource, message.get('changeType'))
+            resource_uri = resource.get('resourceUri') or ''
+            if self._alert_cache is not None and resource_uri.startswith(const.ONEVIEW_URI_PREFIX):
+                self._alert_cache.invalidate(resource_uri[len(const.ONEVIEW_URI_PREFIX):])
+            return
+
         message = 'Pull metric to resource with key %(resource_key)s' % {
-            "resource_key": method.routing_key
+            "resource_key": routing_key
         }
         utils.print_log_message('Info', message, LOG)
 
         self._lock.acquire()
-        if resource['uuid'] not in self._monitored_nodes:
+        monitored = resource['uuid'] in self._monitored_nodes
+        self._lock.release()
+
+        if not monitored:
             message = 'Resource %(uuid)s not found in current monitored, waiting for node discoverer update' % {
                 'uuid': resource['uuid']
             }
@@ -262,9 +598,11 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
             # Get Resource status and timestamp
             status, timestamp = resource['status'], resource['modified']
             # Pulling Status Metric
-            self.status_update({self._get_status(uuid, status, timestamp)})
-
-        self._lock.release()
+            status = self._get_status(uuid, status, timestamp)
+            if self._coalescer is None:
+                self.status_update({status})
+            elif status is not None:
+                self._coalescer.put(status)
 
     def _retry_reconnect(self, exc_obj, mode=1):
         """ Function to try reconnect agent with SCMB when a exception is raised
@@ -272,6 +610,12 @@ class SCMB(PublisherProvider, DiscoveryNodeSubscriber, Thread):
         :param exc_obj: the raised exception
         :param mode: If mode equal to one try re-validate SCMB certificates, else apply default behavior
         """
+        if self._disconnected_at is None:
+            self._disconnected_at = time.time()
+        if self._dropped_at is not None:
+            # The updates lost before the disconnection are refreshed with the gap
+            self._disconnected_at, self._dropped_at = min(self._disconnected_at, self._dropped_at), None
+
         self._stop_scmb()
         utils.print_log_message('Error', exc_obj, LOG)
 
@@ -0,0 +1,191 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide an event loop based consumer of the SCMB, using the pika
+SelectConnection, that keeps the heartbeats while the messages are processed
+and that can be stopped cleanly from another thread.
+"""
+
+from pika.exceptions import AMQPConnectionError
+from pika.exceptions import AMQPChannelError
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared import utils
+
+import pika
+
+LOG = logging.get_logger(__name__)
+
+
+class SCMBConsumer(object):
+    """
+    This class opens a connection with the SCMB, declares the queue and gives
+    the channel to be set up (bindings and consumer) when it is ready. The
+    event loop runs until the consumer is stopped or the connection is lost.
+
+    The callbacks run in the event loop thread, so the channel must only be
+    used by them. The stop method is the only one that can be called by
+    another thread.
+    """
+    def __init__(self, parameters, queue_arguments, on_channel_ready):
+        self._parameters = parameters
+        self._queue_arguments = queue_arguments
+        self._on_channel_ready = on_channel_ready
+
+        self._connection = None
+        self._channel = None
+        self._consumer_tag = None
+        self._closing = False
+        self._cancelling = False
+        self._running = False
+        self._error = None
+
+    @property
+    def connection(self):
+        """ The SelectConnection of the consumer """
+        return self._connection
+
+    def run(self):
+        """ Connect to the SCMB and run the event loop until the consumer is stopped.
+
+        :raise AMQPConnectionError or AMQPChannelError if the connection or the channel was closed by the SCMB.
+        """
+        self._connection = pika.SelectConnection(
+            self._parameters,
+            on_open_callback=self._on_connection_open,
+            on_open_error_callback=self._on_connection_open_error,
+            on_close_callback=self._on_connection_closed,
+            stop_ioloop_on_close=False
+        )
+
+        self._running = True
+        if self._closing:
+            # Stopped while the connection was created
+            self._connection.ioloop.add_callback_threadsafe(self._cancel)
+
+        try:
+            self._connection.ioloop.start()
+        finally:
+            self._running = False
+
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """ Cancel the consumer and close the connection. It can be called by any thread """
+        self._closing = True
+        if self._running:
+            self._connection.ioloop.add_callback_threadsafe(self._cancel)
+
+    def _on_connection_open(self, connection):
+        """ Open a channel as soon as the connection is open """
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_open_error(self, connection, error):
+        """ Stop the event loop if the connection could not be opened """
+        self._error = AMQPConnectionError(error)
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection, reply_code, reply_text):
+        """ Stop the event loop when the connection is closed, keeping the error if it was not requested """
+        self._channel = None
+        if not self._closing:
+            self._error = AMQPConnectionError(reply_code, reply_text)
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel):
+        """ Declare the queue as soon as the channel is open """
+        self._channel = channel
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.add_on_cancel_callback(self._on_consumer_cancelled)
+        channel.queue_declare(self._on_queue_declareok, **self._queue_arguments)
+
+    def _on_channel_closed(self, channel, reply_code, reply_text):
+        """ Close the connection when the channel is closed, keeping the error if it was not requested """
+        if not self._closing:
+            self._error = AMQPChannelError(reply_code, reply_text)
+
+        if self._connection.is_open:
+            self._connection.close()
+
+    def _on_queue_declareok(self, frame):
+        """ Give the channel to be set up when the queue is declared """
+        self._consumer_tag = self._on_channel_ready(ChannelAdapter(self._channel), frame.method.queue)
+
+    def _on_consumer_cancelled(self, frame):
+        """ Close the channel when the SCMB cancels the consumer (e.g. the queue was deleted) """
+        utils.print_log_message('Warn', 'The SCMB cancelled the consumer', LOG)
+        self._channel.close()
+
+    def _cancel(self):
+        """ Ask the SCMB to cancel the consumer, or close the connection if there is no consumer yet """
+        if self._cancelling:
+            return
+
+        self._cancelling = True
+        if self._channel is not None and self._consumer_tag is not None:
+            utils.print_log_message('Info', 'Cancelling the SCMB consumer', LOG)
+            self._channel.basic_cancel(self.on_cancelok, self._consumer_tag)
+        elif self._connection.is_open:
+            self._connection.close()
+
+    def on_cancelok(self, unused_frame):
+        """ This method is invoked by pika when RabbitMQ acknowledges the cancellation of the consumer.
+
+        :param unused_frame:
+        """
+        utils.print_log_message('Info', 'Closing the RabbitMQ channel', LOG)
+        self._channel.close()
+
+
+class ChannelAdapter(object):
+    """
+    This class exposes the calls the SCMB makes on a blocking channel, with the
+    same arguments, over an asynchronous channel. The replies are not waited.
+    """
+    def __init__(self, channel):
+        self._channel = channel
+
+    def queue_bind(self, queue, exchange, routing_key=None):
+        """ Bind the queue to the exchange by a routing key """
+        self._channel.queue_bind(None, queue, exchange, routing_key)
+
+    def queue_unbind(self, queue='', exchange=None, routing_key=None):
+        """ Unbind the queue from the exchange by a routing key """
+        self._channel.queue_unbind(None, queue, exchange, routing_key)
+
+    def basic_qos(self, prefetch_count=0):
+        """ Limit the number of messages delivered and not acked yet """
+        self._channel.basic_qos(None, prefetch_count=prefetch_count)
+
+    def basic_consume(self, consumer_callback, queue='', no_ack=False):
+        """ Start a consumer, whose callback receives this adapter as its channel
+
+        :return: the consumer tag.
+        """
+        def on_message(channel, method, properties, body):
+            consumer_callback(self, method, properties, body)
+
+        return self._channel.basic_consume(on_message, queue=queue, no_ack=no_ack)
+
+    def basic_ack(self, delivery_tag=0):
+        """ Ack a message """
+        self._channel.basic_ack(delivery_tag=delivery_tag)
+
+    def basic_nack(self, delivery_tag=0, requeue=True):
+        """ Reject a message, that is delivered again if requeued """
+        self._channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
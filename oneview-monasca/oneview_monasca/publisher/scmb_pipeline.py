@@ -0,0 +1,141 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+This module provide the pipeline that decouples the SCMB consumer thread from
+the processing of the SCMB messages.
+"""
+
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from threading import Thread
+
+import Queue
+import time
+import zlib
+
+LOG = logging.get_logger(__name__)
+
+
+class SCMBPipeline(object):
+    """
+    This class keeps the raw SCMB messages in bounded queues, processed by a
+    pool of workers. The messages are partitioned by the changed resource,
+    identified by its routing key without the change type, so the messages of
+    the same resource (e.g. the Created and the Deleted of an alert) are
+    processed by the same worker in the order they were received. After
+    each message is processed, its ack token (if any) is given to the done
+    callback.
+
+    Statistics:
+        received: The number of messages received from the consumer.
+        processed: The number of messages processed by the workers.
+        failures: The number of messages that could not be processed.
+        rejected: The number of messages rejected because its queue was full.
+        queue_depth: The number of messages waiting in the queues.
+        queue_lag: The time (in seconds) that each message waited in the queue.
+    """
+    def __init__(self, handler, workers, queue_size=const.SCMB_QUEUE_SIZE, on_done=None):
+        self._handler = handler
+        self._on_done = on_done
+        self._queues = [Queue.Queue(max(1, int(queue_size) // int(workers))) for _ in range(int(workers))]
+        self.stats = Stats()
+        self._stopped = False
+
+        self._workers = [Thread(target=self._run, args=(queue,)) for queue in self._queues]
+        for worker in self._workers:
+            worker.daemon = True
+            worker.start()
+
+    def stop(self):
+        """ Stop the workers after the messages already queued, without waiting for them.
+        A full queue is not woken up, its worker stops as soon as the queue is drained.
+        """
+        self._stopped = True
+        for queue in self._queues:
+            try:
+                queue.put_nowait(None)
+            except Queue.Full:
+                pass
+
+        message = 'SCMB pipeline stopped [%(stats)s]' % {'stats': self.stats}
+        utils.print_log_message('Info', message, LOG)
+
+    def put(self, routing_key, body, ack=None, block=True):
+        """ Put a raw message in the queue of its resource. If the queue is
+        full, the consumer waits, leaving the messages in the broker, unless
+        it must not block (e.g. an event loop), when the message is rejected.
+
+        :param routing_key: the routing key of the message.
+        :param body: the raw body of the message.
+        :param ack: a token given to the done callback after the message is processed.
+        :param block: if False, the message is rejected instead of waiting when its queue is full.
+        :return: True if the message was queued, False if it was rejected.
+        """
+        queue = self._get_queue(routing_key)
+        try:
+            queue.put((routing_key, body, time.time(), ack), block)
+        except Queue.Full:
+            self.stats.increment('rejected')
+            return False
+
+        self.stats.increment('received')
+        self.stats.set('queue_depth', self.queue_depth())
+        return True
+
+    def queue_depth(self):
+        """ Get the number of messages waiting in the queues """
+        return sum(queue.qsize() for queue in self._queues)
+
+    def _get_queue(self, routing_key):
+        """ Get the queue of the resource of a routing key. The routing key is in the format
+        scmb.<category>.<change type>.<resource uri>, and the change type is left out of the
+        partition, so every change of a resource is processed in order.
+
+        :param routing_key: the routing key of the message.
+        :return: the queue of the resource.
+        """
+        parts = routing_key.split('.', 3)
+        if len(parts) == 4:
+            routing_key = '.'.join(parts[:2] + parts[3:])
+        return self._queues[zlib.crc32(routing_key) % len(self._queues)]
+
+    def _run(self, queue):
+        """ Process the messages of a queue until the pipeline is stopped """
+        while True:
+            message = queue.get()
+            if message is None:
+                return
+
+            routing_key, body, received, ack = message
+            self.stats.observe('queue_lag', time.time() - received)
+            self.stats.set('queue_depth', self.queue_depth())
+
+            try:
+                self._handler(routing_key, body)
+                self.stats.increment('processed')
+            except Exception as ex:
+                self.stats.increment('failures')
+                utils.print_log_message('Error', 'Failed to process SCMB message: %s' % ex, LOG)
+
+            if self._on_done is not None:
+                self._on_done(ack)
+
+            if self._stopped and queue.empty():
+                return
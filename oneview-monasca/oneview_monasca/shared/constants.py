@@ -53,8 +53,8 @@ ROUTING_KEY = "scmb.server-hardware.Updated.#"
 MB_PORT = 5671
 
 ''' ONEVIEW MANAGER '''
-# The base url to get a OneView alert.
-ALERT_BASE_URL = 'Active' + "'&filter=resourceUri='"
+# The filter of the alerts of a resource, requested to OneView.
+ALERT_RESOURCE_FILTER = "resourceUri='%s'"
 # The message to invalid login
 LOGIN_FAILED = 'Invalid username or password or directory.'
 # The message if certificate is still valid
@@ -73,3 +73,121 @@ METRIC_VALUE_PARSER = {
 }
 MAX_VALUE_META_LEN = 13
 ONEVIEW_URI_PREFIX = '/rest/server-hardware/'
+# The uri of the server hardware collection.
+SERVER_HARDWARE_URI = '/rest/server-hardware'
+# The fields kept from each server hardware in a bulk status collection.
+SERVER_HARDWARE_STATUS_FIELDS = 'uuid,status,modified'
+# The number of server hardware requested by page in a bulk status collection.
+SERVER_HARDWARE_PAGE_SIZE = 500
+# The time (in seconds) that a OneView session is reused before opening a new one.
+ONEVIEW_SESSION_TTL = 3600
+# The errors returned by OneView when a session token is rejected.
+ONEVIEW_UNAUTHORIZED_ERRORS = ['AUTHORIZATION', 'Authorization error', 'Unauthorized']
+# The time (in seconds) that a Keystone token is reused to send metrics to Monasca, if Keystone omits its expiry.
+KEYSTONE_TOKEN_TTL = 3600
+# The time (in seconds) before the token expiration in which a new token is requested.
+KEYSTONE_TOKEN_EXPIRY_MARGIN = 300
+# The max number of measurements waiting in the outbound queue to Monasca.
+SENDER_QUEUE_SIZE = 10000
+# The max number of measurements sent to Monasca in a single request.
+SENDER_BATCH_SIZE = 500
+# The max time (in seconds) that a measurement waits for a full batch.
+SENDER_LINGER_TIME = 1
+# The number of workers sending the queued measurements to Monasca.
+SENDER_WORKERS = 1
+# The action applied when the outbound queue is full.
+SENDER_OVERFLOW_POLICY = 'drop_oldest'
+SENDER_OVERFLOW_POLICIES = ['drop_oldest', 'block', 'spill']
+# The size (in bytes) of a spool segment before it is sealed.
+SPOOL_SEGMENT_SIZE = 1048576
+# The max size (in bytes) of the spool, the oldest segments are discarded above it.
+SPOOL_MAX_SIZE = 104857600
+# The max number of spooled measurements replayed to Monasca by second.
+SPOOL_REPLAY_RATE = 500
+# The time (in seconds) between two attempts to replay the spool.
+SPOOL_REPLAY_INTERVAL = 30
+# The number of threads requesting the status of the nodes in parallel. With 1, they are requested one after another.
+PULLER_FETCH_WORKERS = 1
+# The max number of concurrent status requests sent to the same OneView appliance.
+PULLER_APPLIANCE_CONCURRENCY = 4
+# The max number of statuses published together by the Puller.
+PULLER_PUBLISH_BATCH_SIZE = 50
+# The prefix of the names of the metrics published with the statistics of the Puller cycles.
+PULLER_METRIC_PREFIX = 'oneview.puller.'
+# The number of threads processing the SCMB messages.
+SCMB_WORKERS = 4
+# The max number of SCMB messages waiting to be processed.
+SCMB_QUEUE_SIZE = 10000
+# The time (in milliseconds) that the status changes of a server hardware are merged.
+SCMB_COALESCE_WINDOW = 500
+# The time (in seconds) that the alerts of a server hardware are reused while its status does not change.
+KEEPER_META_TTL = 300
+# The time (in seconds) that the alerts of a server hardware are cached while its status does not change.
+ALERT_CACHE_TTL = 60
+# The max number of server hardware whose alerts are cached.
+ALERT_CACHE_SIZE = 10000
+# The uri of the alerts collection.
+ALERTS_URI = '/rest/alerts'
+# The filter of the alerts of a state.
+ALERT_STATE_FILTER = "alertState='%s'"
+# The number of alerts requested by page in a bulk alerts prefetch.
+ALERT_PAGE_SIZE = 500
+# The min number of server hardware waiting for its alerts to request all active alerts at once.
+ALERT_PREFETCH_THRESHOLD = 10
+# The routing key to listen the changes of all alerts.
+ALERTS_ROUTING_KEY = "scmb.alerts.#"
+# The prefix of the routing key of the alerts messages.
+ALERTS_ROUTING_KEY_PREFIX = "scmb.alerts."
+# The states of an alert that is still active, requested to OneView and kept by the alerts index.
+ALERT_ACTIVE_STATES = ['Active', 'Locked']
+# The filter of the alerts in any active state, so they are requested to OneView at once.
+ALERT_ACTIVE_FILTER = ' OR '.join(ALERT_STATE_FILTER % state for state in ALERT_ACTIVE_STATES)
+# The prefix of the routing key of a single server hardware updates, followed by its uri.
+RESOURCE_ROUTING_KEY_PREFIX = "scmb.server-hardware.Updated."
+# The max number of monitored server hardware bound by its own routing key, above it the default routing key is used.
+SCMB_BINDING_THRESHOLD = 1000
+# The time (in seconds) between two updates of the SCMB routing keys bound by monitored server hardware.
+SCMB_BINDING_INTERVAL = 1
+# The prefix of the durable SCMB queue name, followed by the agent group name.
+SCMB_DURABLE_QUEUE_PREFIX = 'oneview-monasca.'
+# The max number of SCMB messages delivered and not acked yet, in a durable queue.
+SCMB_PREFETCH_COUNT = 100
+# The time (in seconds) between two acks of the SCMB messages processed by the workers.
+SCMB_ACK_INTERVAL = 0.05
+# The heartbeat interval (in seconds) of the event loop SCMB consumer.
+SCMB_HEARTBEAT = 60
+# The max time (in seconds) to wait the event loop SCMB consumer to stop.
+SCMB_STOP_TIMEOUT = 10
+# The time (in seconds) between the first SCMB message lost by the event loop consumer and the refresh of its update.
+SCMB_OVERFLOW_REFRESH_DELAY = 5
+# The filter of the server hardware modified after a timestamp.
+SERVER_HARDWARE_MODIFIED_FILTER = "modified>'%s'"
+# The format of the timestamps in the OneView filters.
+ONEVIEW_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.000Z'
+# The time (in seconds) subtracted from the SCMB disconnection time to request the missed updates, due to clock skew.
+SCMB_GAP_MARGIN = 60
+# The backoff time (in milliseconds) before the first retry of a failed call, doubled at each new retry.
+RETRY_BASE_WAIT = 1000
+# The max backoff time (in milliseconds) between two attempts of a call.
+RETRY_MAX_WAIT = 30000
+# The fraction of a retry that each call adds to the retry budget of its dependency.
+RETRY_BUDGET_RATIO = 0.2
+# The max number of retries kept in the retry budget of a dependency.
+RETRY_BUDGET_SIZE = 10
+# The number of consecutive failed calls to a dependency that opens its circuit breaker. Use 0 to disable it.
+BREAKER_FAILURE_THRESHOLD = 5
+# The time (in seconds) that an open circuit breaker fails fast before letting a trial call through.
+BREAKER_RESET_TIMEOUT = 30
+# The value of each circuit breaker state in the breaker_state metric.
+BREAKER_STATES = {'closed': 0, 'half-open': 1, 'open': 2}
+# The HTTP status codes of a client error that are failures of the dependency (timeout and throttling).
+RETRY_FAILURE_CLIENT_ERRORS = [408, 429]
+# The prefix of the names of the metrics published with the statistics of each retry policy.
+RETRY_METRIC_PREFIX = 'oneview.retry_policy.'
+# The component dimension of the metrics of the agent itself (e.g. its retry policies), instead of a driver.
+AGENT_METRIC_COMPONENT = 'agent'
+
+''' KEYSTONE SESSION '''
+# The attribute of the configuration that carries the Keystone session authenticated by its validation,
+# reused by the Ironic plugin.
+IRONIC_SESSION = 'ironic_session'
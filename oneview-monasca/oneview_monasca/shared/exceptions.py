@@ -27,6 +27,14 @@ class LoginFailException(Exception):
         Exception.__init__(self, message)
 
 
+class SessionRejectedException(LoginFailException):
+    """ The exception class that is raised when the token of a session is rejected, so the session is opened again.
+    """
+    def __init__(self, error=None):
+        LoginFailException.__init__(self, str(error))
+        self.error = error
+
+
 class HTTPFailException(Exception):
     """ The exception class that is raised when HTTP error occurs.
     """
@@ -46,3 +54,10 @@ class InvalidConfigFileException(Exception):
     """
     def __init__(self, message=None):
         Exception.__init__(self, message)
+
+
+class CircuitOpenException(Exception):
+    """ The exception class that is raised when a call fails fast because the circuit breaker of its dependency is open.
+    """
+    def __init__(self, message=None):
+        Exception.__init__(self, message)
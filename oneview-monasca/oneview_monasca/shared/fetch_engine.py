@@ -0,0 +1,99 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+A pool of worker threads used to run many REST lookups in parallel, with a cap
+on the concurrent requests sent to the same appliance.
+"""
+
+from threading import BoundedSemaphore
+from threading import Thread
+from threading import Lock
+
+import Queue
+import six
+import sys
+
+
+class FetchEngine(object):
+    """
+    This class runs a function for many items using a fixed number of worker
+    threads. Each item belongs to an appliance (the key), and no more than
+    the appliance limit of items of the same key run at the same time.
+    """
+    def __init__(self, workers, appliance_limit=None):
+        self._tasks = Queue.Queue()
+        self._appliance_limit = int(appliance_limit or workers)
+        self._semaphores = {}
+        self._lock = Lock()
+
+        self._workers = [Thread(target=self._run) for _ in range(int(workers))]
+        for worker in self._workers:
+            worker.daemon = True
+            worker.start()
+
+    def stop(self):
+        """ Stop the workers after the tasks already submitted """
+        for _ in self._workers:
+            self._tasks.put(None)
+
+    def imap_unordered(self, func, items, key=None):
+        """ Run the function for each item in parallel, yielding the results as they complete.
+
+        :param func: the function called with each item.
+        :param items: the items to be processed.
+        :param key: the appliance of the items, used to cap its concurrent requests.
+        :return: a generator of (item, result) tuples, in completion order.
+        :raise the first exception raised by the function.
+        """
+        results = Queue.Queue()
+        semaphore = self._get_semaphore(key)
+
+        items = list(items)
+        for item in items:
+            self._tasks.put((func, item, semaphore, results))
+
+        for _ in items:
+            item, result, exc_info = results.get()
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            yield item, result
+
+    def _get_semaphore(self, key):
+        """ Get the semaphore that caps the concurrent requests of an appliance """
+        self._lock.acquire()
+        if key not in self._semaphores:
+            self._semaphores[key] = BoundedSemaphore(self._appliance_limit)
+        semaphore = self._semaphores[key]
+        self._lock.release()
+        return semaphore
+
+    def _run(self):
+        """ Run the submitted tasks until the engine is stopped """
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+
+            func, item, semaphore, results = task
+            semaphore.acquire()
+            try:
+                results.put((item, func(item), None))
+            except Exception:
+                results.put((item, None, sys.exc_info()))
+            finally:
+                semaphore.release()
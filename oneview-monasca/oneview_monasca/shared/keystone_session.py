@@ -0,0 +1,112 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+This module provide the Keystone session shared by all Ironic clients, that
+caches the token to avoid an authentication by request.
+"""
+
+from keystoneauth1 import loading as kaloading
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from ironicclient import client as ironic
+from threading import Lock
+
+LOG = logging.get_logger(__name__)
+
+
+class KeystoneSession(object):
+    """
+    This class keeps one Keystone session, reusing its token until it expires.
+    The token is requested again by keystoneauth when it is about to expire or
+    when it is rejected.
+
+    Statistics:
+        authentications: The number of tokens requested to Keystone.
+        reuses: The number of clients served by an already requested token,
+        that is, the authentication round trips saved.
+    """
+    def __init__(self, auth_url, username, password, tenant_name=None, insecure='false',
+                 project_name=None, user_domain_id=None, project_domain_id=None, project_id=None,
+                 user_domain_name=None, project_domain_name=None, session=None, debug=False):
+        self._auth_options = {
+            'auth_url': auth_url,
+            'username': username,
+            'password': password,
+            'project_id': project_id,
+            'project_name': project_name or tenant_name,
+            'user_domain_id': user_domain_id,
+            'user_domain_name': user_domain_name,
+            'project_domain_id': project_domain_id,
+            'project_domain_name': project_domain_name
+        }
+        self._insecure = str(insecure).lower() == 'true'
+        self._debug = debug
+
+        self._lock = Lock()
+        self._session = session
+        self._auth_ref = getattr(getattr(session, 'auth', None), 'auth_ref', None)
+        self.stats = Stats()
+
+    def _create_session(self):
+        """ Create a Keystone session authenticated by password """
+        loader = kaloading.get_plugin_loader('password')
+        auth = loader.load_from_options(**self._auth_options)
+        return kaloading.session.Session().load_from_options(auth=auth, insecure=self._insecure)
+
+    def get_session(self):
+        """ Get the Keystone session with a valid token, requesting a new token
+        only if there is none or it is about to expire.
+
+        :return: the keystoneauth session.
+        """
+        self._lock.acquire()
+        try:
+            if self._session is None:
+                self._session = self._create_session()
+
+            auth_ref = self._session.auth.get_access(self._session)
+            if auth_ref is self._auth_ref:
+                self.stats.increment('reuses')
+            else:
+                self._auth_ref = auth_ref
+                self.stats.increment('authentications')
+
+                message = 'Keystone token requested [%s]' % self.stats
+                utils.print_log_message('Debug', message, LOG, self._debug)
+
+            return self._session
+        finally:
+            self._lock.release()
+
+    def invalidate(self):
+        """ Discard the token, forcing a new authentication in the next request """
+        self._lock.acquire()
+        if self._session is not None:
+            self._session.invalidate()
+        self._lock.release()
+
+    def get_client(self, api_version, **kwargs):
+        """ Get an Ironic client that uses the shared session.
+
+        :param api_version: the major version of the Ironic client.
+        :param kwargs: the other arguments of the Ironic client, as the endpoint or the region.
+        :return: the Ironic client.
+        """
+        return ironic.get_client(api_version, session=self.get_session(), **kwargs)
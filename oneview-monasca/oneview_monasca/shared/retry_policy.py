@@ -0,0 +1,234 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+This module provide the retry policy of the calls to an external dependency,
+with exponential backoff, full jitter, a retry budget and a circuit breaker.
+"""
+
+from oneview_monasca.shared.exceptions import CircuitOpenException
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared import log as logging
+from oneview_monasca.shared.stats import Stats
+from oneview_monasca.shared import utils
+from threading import Lock
+
+import time
+
+LOG = logging.get_logger(__name__)
+
+
+class CircuitBreaker(object):
+    """
+    This class counts the consecutive failed calls to a dependency. At the
+    failure threshold the circuit opens and the calls fail fast until the
+    reset timeout expires. Then a single trial call is let through (half-open):
+    its success closes the circuit and its failure opens it again.
+    """
+    CLOSED = 'closed'
+    HALF_OPEN = 'half-open'
+    OPEN = 'open'
+
+    def __init__(self, name, failure_threshold=const.BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=const.BREAKER_RESET_TIMEOUT, stats=None):
+        self._name = name
+        self._failure_threshold = int(failure_threshold)
+        self._reset_timeout = float(reset_timeout)
+        self.stats = stats if stats is not None else Stats()
+
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened = 0
+        self._trial = False
+        self.stats.set('breaker_state', const.BREAKER_STATES[self._state])
+
+    @property
+    def state(self):
+        """ The current state of the circuit """
+        return self._state
+
+    def allow(self):
+        """ Check if a call can be sent to the dependency.
+
+        :return: False if the call must fail fast.
+        """
+        if self._failure_threshold <= 0:
+            return True
+
+        self._lock.acquire()
+        try:
+            if self._state == self.OPEN:
+                if time.time() - self._opened < self._reset_timeout:
+                    return False
+                self._transition(self.HALF_OPEN)
+
+            if self._state == self.HALF_OPEN:
+                # Only one trial call at a time
+                if self._trial:
+                    return False
+                self._trial = True
+
+            return True
+        finally:
+            self._lock.release()
+
+    def record_success(self):
+        """ Record a call answered by the dependency """
+        self._lock.acquire()
+        self._failures = 0
+        self._trial = False
+        if self._state != self.CLOSED:
+            self._transition(self.CLOSED)
+        self._lock.release()
+
+    def record_failure(self):
+        """ Record a call failed by the dependency """
+        self._lock.acquire()
+        self._failures += 1
+        self._trial = False
+        if self._failure_threshold > 0 and self._state != self.OPEN and \
+                (self._state == self.HALF_OPEN or self._failures >= self._failure_threshold):
+            self._opened = time.time()
+            self._transition(self.OPEN)
+        self._lock.release()
+
+    def _transition(self, state):
+        """ Change the state of the circuit. The caller must hold the lock.
+
+        :param state: the new state of the circuit.
+        """
+        self._state = state
+        self.stats.set('breaker_state', const.BREAKER_STATES[state])
+        if state == self.OPEN:
+            self.stats.increment('breaker_opens')
+
+        message = 'Circuit breaker of %(name)s is %(state)s [%(stats)s]' % {
+            'name': self._name, 'state': state, 'stats': self.stats
+        }
+        utils.print_log_message('Warn' if state == self.OPEN else 'Info', message, LOG)
+
+
+class RetryPolicy(object):
+    """
+    This class executes the calls to a dependency, retrying the failed ones
+    after an exponential backoff with full jitter. The retries are limited by
+    a budget that each call refills by a fraction of a retry, so an unavailable
+    dependency does not receive many times its usual load. The calls go through
+    the circuit breaker of the dependency.
+
+    Statistics:
+        calls: The number of calls executed.
+        failures: The number of failed attempts. The errors answered to a wrong request (HTTP 4xx) are not failures.
+        retries: The number of attempts after a failed one.
+        budget_exhausted: The number of retries not done because the retry budget is empty.
+        rejected: The number of calls failed fast because the circuit breaker is open.
+        breaker_state: The state of the circuit breaker (0 closed, 1 half-open, 2 open).
+        breaker_opens: The number of times the circuit breaker opened.
+        budget: The number of retries in the retry budget.
+    """
+    def __init__(self, name, base_wait=const.RETRY_BASE_WAIT, max_wait=const.RETRY_MAX_WAIT,
+                 budget_ratio=const.RETRY_BUDGET_RATIO, budget_size=const.RETRY_BUDGET_SIZE,
+                 failure_threshold=const.BREAKER_FAILURE_THRESHOLD, reset_timeout=const.BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self._base_wait = float(base_wait)
+        self._max_wait = float(max_wait)
+        self._budget_ratio = float(budget_ratio)
+        self._budget_size = float(budget_size)
+        self.stats = Stats()
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout, self.stats)
+
+        # The budget starts full, to allow the retries of the first calls
+        self._lock = Lock()
+        self._budget = self._budget_size
+
+    def execute(self, func, max_attempt, *args):
+        """ Execute a function up to max_attempt times, while the budget has retries.
+
+        :param func: A function that will be executed.
+        :param max_attempt: The number max of attempts to execute input function.
+        :param args: A list of params to run input function.
+        :returns the input function output.
+        :raise CircuitOpenException if the circuit breaker is open.
+        :raises Exception if burst the max attempts or the retry budget.
+        """
+        self.stats.increment('calls')
+        self._deposit()
+
+        attempt = 1
+        while True:
+            if not self.breaker.allow():
+                self.stats.increment('rejected')
+                raise CircuitOpenException('The circuit breaker of %s is open.' % self.name)
+
+            try:
+                result = func(*args)
+            except Exception as ex:
+                # The dependency answered a login failure or a wrong request, that will happen again
+                if not utils.not_retry_if_login_fail(ex) or utils.is_client_error(ex):
+                    self.breaker.record_success()
+                    raise
+
+                self.breaker.record_failure()
+                self.stats.increment('failures')
+                if attempt >= int(max_attempt) or not self._withdraw():
+                    raise
+
+                wait = utils.full_jitter_wait(attempt, self._base_wait, self._max_wait)
+                message = ' ---- Trying Again %(name)s in %(wait)d ms ---- ' % {'name': self.name, 'wait': wait}
+                utils.print_log_message('Info', message, LOG)
+                time.sleep(wait / 1000)
+
+                self.stats.increment('retries')
+                attempt += 1
+            else:
+                self.breaker.record_success()
+                return result
+
+    def metrics(self):
+        """ Get the statistics of the policy to be published as metrics.
+
+        :return: a dict that maps each metric name to its current value.
+        """
+        self._lock.acquire()
+        self.stats.set('budget', self._budget)
+        self._lock.release()
+
+        return dict((const.RETRY_METRIC_PREFIX + name, value) for name, value in self.stats.snapshot().items())
+
+    def _deposit(self):
+        """ Add the fraction of a retry of a new call to the budget """
+        self._lock.acquire()
+        self._budget = min(self._budget_size, self._budget + self._budget_ratio)
+        self._lock.release()
+
+    def _withdraw(self):
+        """ Take a retry from the budget.
+
+        :return: False if the budget is empty.
+        """
+        self._lock.acquire()
+        try:
+            if self._budget < 1:
+                self.stats.increment('budget_exhausted')
+                return False
+
+            self._budget -= 1
+            return True
+        finally:
+            self._lock.release()
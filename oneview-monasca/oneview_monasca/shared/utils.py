@@ -21,15 +21,16 @@ Gathers useful methods for the whole system.
 
 from builtins import input
 from oneview_monasca.shared.exceptions import LoginFailException
+from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import log as logging
 from stevedore import extension
 from datetime import datetime
 from stevedore import driver
-from retrying import retry
 
 import os
 import re
 import pytz
+import random
 import time
 import tzlocal
 import urlparse
@@ -219,34 +220,54 @@ def not_retry_if_login_fail(exception):
     return not isinstance(exception, LoginFailException)
 
 
+def is_client_error(exception):
+    """Function to check if an exception is an error answered by a dependency to
+    a wrong request (HTTP 4xx), that is not a failure of the dependency.
+
+    :param exception: Some exception class
+    :return: True if the exception carries a 4xx HTTP status code, other than a timeout or throttling
+    """
+    for holder in (exception, getattr(exception, 'response', None)):
+        for attribute in ('http_status', 'status_code', 'code'):
+            status = getattr(holder, attribute, None)
+            if isinstance(status, int) and 400 <= status < 500:
+                return status not in const.RETRY_FAILURE_CLIENT_ERRORS
+    return False
+
+
+def full_jitter_wait(attempt, base_wait, max_wait):
+    """Function to get the time to wait before retrying a failed attempt, with
+    exponential backoff and full jitter.
+
+    :param attempt: The number of the failed attempt, starting at 1.
+    :param base_wait: The backoff time (in milliseconds) after the first attempt.
+    :param max_wait: The max backoff time (in milliseconds).
+    :return: a random time (in milliseconds) between 0 and the backoff of the attempt.
+    """
+    return random.uniform(0, min(max_wait, base_wait * 2 ** (attempt - 1)))
+
+
 def try_execute(func, max_attempt, wait, *args):
-    """Function that trying to execute another function max_attempt times.
+    """Function that trying to execute another function max_attempt times,
+    through a retry policy without retry budget limit nor circuit breaker.
 
         :param func: A function that will be executed.
         :param max_attempt: The number max of attempts to execute input function.
-        :param wait: The time (in milliseconds) between each attempt of execute input function.
+        :param wait: The backoff time (in milliseconds) before the first retry,
+        doubled at each new retry and randomized by full jitter.
         :param args: A list of params to rum input function.
 
         :returns the input function output.
         :raises Exception if burst the max attempts.
     """
-    @retry(wait_fixed=wait, stop_max_attempt_number=max_attempt, retry_on_exception=not_retry_if_login_fail)
-    def execute():
-        """ Auxiliary function to use retry decorator.
+    # The retry policy module depends on this one
+    from oneview_monasca.shared.retry_policy import RetryPolicy
 
-        :return: the input function output.
-        :raises: Exception if burst the max attempts.
-        """
-        try:
-            return func(*args)
-        except LoginFailException:
-            raise
-        except:
-            print_log_message('Info', " ---- Trying Again ---- ")
-            raise
-
-    # Executing the input function by retry decorator
-    return execute()
+    retry_policy = RetryPolicy(
+        'try_execute', base_wait=wait, max_wait=max(wait, const.RETRY_MAX_WAIT), budget_size=max_attempt,
+        failure_threshold=0
+    )
+    return retry_policy.execute(func, max_attempt, *args)
 
 
 class SingletonType(type):
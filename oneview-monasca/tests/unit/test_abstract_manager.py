@@ -39,6 +39,13 @@ class FakeImplTwo(abstract_manager_oneview.AbstractManagerOneView):
         """
         super(FakeImplTwo, self).get_server_hardware_status(None, None)
 
+    def get_server_hardware_states(self, uuids):
+        """ Get the status of many server hardware at once.
+        :param uuids: A collection with the uuids of the interest server hardware.
+        :return: a dict that maps each uuid found to its status and modified timestamp.
+        """
+        super(FakeImplTwo, self).get_server_hardware_states(None)
+
     def get_server_hardware(self, uuid):
         """ Get a instance of a server hardware from oneview.
         :param uuid: the id associated oneview server hardware resource.
@@ -54,6 +61,12 @@ class FakeImplTwo(abstract_manager_oneview.AbstractManagerOneView):
         """
         super(FakeImplTwo, self).get_server_hardware_alerts(None, None)
 
+    def prefetch_server_hardware_alerts(self, states):
+        """Request the alerts of many Oneview resources at once.
+        :param states: a dict that maps the uuid of each resource to its status.
+        """
+        super(FakeImplTwo, self).prefetch_server_hardware_alerts(None)
+
     def get_certificates(self):
         """ Get a hpOneView SDK connection.
         :return: a connection to communicate with Oneview Rest API.
@@ -121,6 +134,13 @@ class TestAbstractManager(TestBase):
             raises = True
         self.assertTrue(raises)
 
+        raises = False
+        try:
+            f.get_server_hardware_states(None)
+        except:
+            raises = True
+        self.assertTrue(raises)
+
         raises = False
         try:
             f.get_server_hardware(None)
@@ -135,6 +155,13 @@ class TestAbstractManager(TestBase):
             raises = True
         self.assertTrue(raises)
 
+        raises = False
+        try:
+            f.prefetch_server_hardware_alerts(None)
+        except:
+            raises = True
+        self.assertTrue(raises)
+
         raises = False
         try:
             f.get_certificates()
@@ -0,0 +1,80 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the alert_cache.py module.
+"""
+
+from oneview_monasca.manager.alert_cache import AlertCache
+from base import TestBase
+
+
+class TestAlertCache(TestBase):
+    """ Class that contains the alerts cache unit tests
+    """
+    def setUp(self):
+        """ Set up the alerts meta values that will be used into the tests cases.
+        """
+        super(TestAlertCache, self).setUp()
+
+        self.meta = {'/rest/alerts/1': '1.2.3.4#/activity/r/rest/alerts/1'}
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestAlertCache, self).tearDown()
+
+    def test_get_and_put(self):
+        """ Test cases regarding the get and put methods of alerts cache module
+            Test flow:
+                    >>> Put the alerts of a server hardware and get them with the same status
+                    >>> Test if the alerts are not reused with a different status
+                    >>> Test if the alerts are not reused after the ttl or the invalidation
+        """
+        cache = AlertCache(ttl=60)
+        cache.put('uuid_1', 2, self.meta)
+
+        self.assertEqual(cache.get('uuid_1', 2), self.meta)
+        self.assertIsNone(cache.get('uuid_1', 3))
+        self.assertIsNone(cache.get('uuid_2', 2))
+
+        expired = AlertCache(ttl=0)
+        expired.put('uuid_1', 2, self.meta)
+        self.assertIsNone(expired.get('uuid_1', 2))
+
+        cache.put('uuid_1', 2, self.meta)
+        cache.invalidate('uuid_1')
+
+        self.assertIsNone(cache.get('uuid_1', 2))
+        self.assertEqual(cache.stats.get('hits'), 1)
+        self.assertEqual(cache.stats.get('misses'), 3)
+        self.assertEqual(cache.stats.get('size'), 0)
+
+    def test_eviction(self):
+        """ Test cases regarding the max size of alerts cache module
+            Test flow:
+                    >>> Fill a cache above its max size, reading the oldest entry in the middle
+                    >>> Test if the least recently used entry is evicted instead of the oldest one
+        """
+        cache = AlertCache(max_size=2)
+        cache.put('uuid_1', 2, self.meta)
+        cache.put('uuid_2', 2, self.meta)
+        cache.get('uuid_1', 2)
+        cache.put('uuid_3', 2, self.meta)
+
+        self.assertEqual(cache._entries.keys(), ['uuid_1', 'uuid_3'])
+        self.assertEqual(cache.stats.get('evictions'), 1)
+        self.assertEqual(cache.stats.get('size'), 2)
@@ -0,0 +1,98 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the alert_index.py module.
+"""
+
+from oneview_monasca.manager.alert_index import AlertIndex
+from base import TestBase
+
+
+class TestAlertIndex(TestBase):
+    """ Class that contains the alerts index unit tests
+    """
+    def setUp(self):
+        """ Set up the resource that will be used into the tests cases.
+        """
+        super(TestAlertIndex, self).setUp()
+
+        self.resource_uri = '/rest/server-hardware/uuid_1'
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestAlertIndex, self).tearDown()
+
+    def alert(self, number, state='Active'):
+        """ Create a fake alert of the resource """
+        return {'uri': '/rest/alerts/%d' % number, 'alertState': state, 'resourceUri': self.resource_uri}
+
+    def test_rebuild_and_update(self):
+        """ Test cases regarding the rebuild and update methods of alerts index module
+            Test flow:
+                    >>> Test if a new index is not ready
+                    >>> Rebuild the index and test if it is ready with the active alerts only
+                    >>> Apply created, cleared and deleted alerts and test if the index follows them
+                    >>> Invalidate the index and test if it is not ready
+        """
+        index = AlertIndex()
+        self.assertFalse(index.ready)
+
+        index.rebuild([self.alert(1), self.alert(2, 'Cleared'), self.alert(3, 'Locked')])
+
+        self.assertTrue(index.ready)
+        self.assertEqual(index.get_alerts(self.resource_uri), ['/rest/alerts/1', '/rest/alerts/3'])
+
+        index.update(self.alert(4), 'Created')
+        index.update(self.alert(1, 'Cleared'), 'Updated')
+        index.update(self.alert(3), 'Deleted')
+
+        self.assertEqual(index.get_alerts(self.resource_uri), ['/rest/alerts/4'])
+        self.assertEqual(index.get_alerts('/rest/server-hardware/uuid_2'), [])
+
+        index.update(self.alert(4, 'Cleared'), 'Updated')
+
+        self.assertEqual(index._alerts, {})
+        self.assertEqual(index.stats.get('updates'), 4)
+        self.assertEqual(index.stats.get('size'), 0)
+
+        index.invalidate()
+        self.assertFalse(index.ready)
+
+    def test_prepare_rebuild(self):
+        """ Test cases regarding the alerts changes applied while the index is rebuilt
+            Test flow:
+                    >>> Prepare the rebuild and apply alerts changes
+                    >>> Rebuild the index from an older list of active alerts
+                    >>> Test if the changes are applied again over the list, in order
+                    >>> Rebuild the index again and test if the changes are not kept anymore
+        """
+        index = AlertIndex()
+        index.prepare_rebuild()
+
+        index.update(self.alert(2), 'Created')
+        index.update(self.alert(1, 'Cleared'), 'Updated')
+        index.update(self.alert(3), 'Created')
+        index.update(self.alert(3), 'Deleted')
+
+        index.rebuild([self.alert(1), self.alert(3)])
+
+        self.assertTrue(index.ready)
+        self.assertEqual(index.get_alerts(self.resource_uri), ['/rest/alerts/2'])
+
+        index.rebuild([self.alert(1)])
+        self.assertEqual(index.get_alerts(self.resource_uri), ['/rest/alerts/1'])
@@ -0,0 +1,70 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the coalescer.py module.
+"""
+
+from oneview_monasca.publisher.coalescer import StatusCoalescer
+from oneview_monasca.model.status import Status
+
+from base import TestBase
+
+import mock
+import time
+
+
+class TestStatusCoalescer(TestBase):
+    """ Class that contains the Status Coalescer unit tests
+    """
+    def setUp(self):
+        """ Default set up method.
+        """
+        super(TestStatusCoalescer, self).setUp()
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestStatusCoalescer, self).tearDown()
+
+    def test_put(self):
+        """ Test cases regarding the merge of a burst of status changes
+            Test flow:
+                    >>> Put a burst of statuses of two server hardware in a window of 100 milliseconds
+                    >>> Test if only the newest status of each server hardware is published after the window
+                    >>> Stop the coalescing and test if the merged statuses are counted and logged
+        """
+        publish = mock.Mock()
+        coalescer = StatusCoalescer(publish, 100)
+
+        for timestamp in range(5):
+            coalescer.put(Status('uuid1', timestamp, timestamp))
+        coalescer.put(Status('uuid2', 0, 10))
+        coalescer.put(Status('uuid2', 1, 5))
+
+        publish.assert_not_called()
+        time.sleep(0.3)
+        with mock.patch('oneview_monasca.publisher.coalescer.utils.print_log_message') as mock_log:
+            coalescer.stop()
+
+        published = {status.server_hardware_uuid: status.status for call in publish.call_args_list
+                     for status in call[0][0]}
+        self.assertEqual(published, {'uuid1': 4, 'uuid2': 0})
+        self.assertEqual(coalescer.stats.get('received'), 7)
+        self.assertEqual(coalescer.stats.get('merged'), 5)
+        self.assertEqual(coalescer.stats.get('published'), 2)
+        self.assertEqual(coalescer.stats.get('discarded'), 0)
+        self.assertTrue('merged=5' in mock_log.call_args[0][1])
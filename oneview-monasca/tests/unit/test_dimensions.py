@@ -0,0 +1,91 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Unit test cases for the dimensions.py module.
+"""
+
+from oneview_monasca.model.dimensions import Dimensions
+from base import TestBase
+
+import copy
+import json
+import pickle
+
+
+class TestDimensions(TestBase):
+    """This class test the dimensions module from the oneview_monasca.model.
+    """
+    def setUp(self):
+        """Setting up the tests.
+        """
+        super(TestDimensions, self).setUp()
+        self.dimensions = {'server_hardware_uuid': 'uuid', 'service': 'compute'}
+
+    def tearDown(self):
+        """Tearing down the tests.
+        """
+        super(TestDimensions, self).tearDown()
+
+    def test_dimensions_intern(self):
+        """Test case regarding the interning of dimensions.
+        Test flow:
+                >>> Checks if equal dimensions share a single instance; and,
+                >>> Checks if different dimensions do not.
+        """
+        dimensions = Dimensions.intern(self.dimensions)
+        self.assertIs(Dimensions.intern(dict(self.dimensions)), dimensions)
+        self.assertIs(Dimensions.intern(dimensions), dimensions)
+        self.assertIsNot(Dimensions.intern({'service': 'compute'}), dimensions)
+        self.assertEqual(dimensions, self.dimensions)
+
+    def test_dimensions_hash(self):
+        """Test case regarding the hash of dimensions.
+        Test flow:
+                >>> Checks if equal dimensions have the same hash; and,
+                >>> Checks if dimensions can be kept in sets.
+        """
+        dimensions = Dimensions(self.dimensions)
+        self.assertEqual(hash(dimensions), hash(Dimensions(dict(self.dimensions))))
+        self.assertEqual(len({dimensions, Dimensions(self.dimensions)}), 1)
+
+    def test_dimensions_immutable(self):
+        """Test case regarding the immutability of dimensions.
+        Test flow:
+                >>> Checks if dimensions cannot be changed; and,
+                >>> Checks if the copies of dimensions are the dimensions themselves.
+        """
+        dimensions = Dimensions.intern(self.dimensions)
+        with self.assertRaises(TypeError):
+            dimensions['service'] = 'storage'
+        with self.assertRaises(TypeError):
+            dimensions.update({'service': 'storage'})
+        with self.assertRaises(TypeError):
+            del dimensions['service']
+
+        self.assertIs(copy.deepcopy(dimensions), dimensions)
+        self.assertEqual(dimensions['service'], 'compute')
+
+    def test_dimensions_serialization(self):
+        """Test case regarding the serialization of dimensions.
+        Test flow:
+                >>> Checks if dimensions are serialized as a dict; and,
+                >>> Checks if dimensions can be pickled.
+        """
+        dimensions = Dimensions.intern(self.dimensions)
+        self.assertEqual(json.loads(json.dumps(dimensions)), self.dimensions)
+        self.assertEqual(pickle.loads(pickle.dumps(dimensions, 2)), dimensions)
@@ -307,6 +307,39 @@ class TestEventBUS(TestBase):
         # Checking if the Metric Keeper is the first to received event
         self.assertTrue(keeper.last_updated > puller.last_updated)
 
+    def test_structural_sharing(self):
+        """Test cases regarding the snapshots of the nodes kept by the event bus.
+        Test flow:
+                >>> Sends an event with a node and checks if its snapshot shares its metrics;
+                >>> Sends the same event again and checks if the snapshot is reused;
+                >>> Sends an event with a new metric and checks if a new snapshot is created,
+                without changing the previous one; and,
+                >>> Sends an unavailable event and checks if the snapshots are not changed.
+        """
+        plugin_ironic = FakeIronicPluginProvider()
+        plugin_ironic.subscribe(self.eventbus)
+        ironic_nodes = self.create_fake_node_plugin('server_hardware_uuid', 'ironic')
+        compute_nodes = self.create_fake_node_plugin('server_hardware_uuid', 'compute')
+
+        plugin_ironic.available({ironic_nodes})
+        snapshot = self.eventbus._events['server_hardware_uuid']
+        self.assertIsNot(snapshot, ironic_nodes)
+        self.assertIsInstance(snapshot.metrics, frozenset)
+        self.assertIs(next(iter(snapshot.metrics)), next(iter(ironic_nodes.metrics)))
+
+        plugin_ironic.available({ironic_nodes})
+        self.assertIs(self.eventbus._events['server_hardware_uuid'], snapshot)
+
+        plugin_ironic.available({compute_nodes})
+        updated_snapshot = self.eventbus._events['server_hardware_uuid']
+        self.assertIsNot(updated_snapshot, snapshot)
+        self.assertEqual(len(updated_snapshot.metrics), 2)
+        self.assertEqual(len(snapshot.metrics), 1)
+
+        plugin_ironic.unavailable({ironic_nodes})
+        self.assertEqual(len(self.eventbus._events['server_hardware_uuid'].metrics), 1)
+        self.assertEqual(len(updated_snapshot.metrics), 2)
+
     @staticmethod
     def create_fake_node_plugin(server_hardware_uuid, service, len_metrics=1):
         """Creates a fake plugin node to make possible the tests.
@@ -0,0 +1,76 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the fetch_engine.py module.
+"""
+
+from oneview_monasca.shared.fetch_engine import FetchEngine
+
+from base import TestBase
+from threading import Lock
+
+import time
+
+
+class TestFetchEngine(TestBase):
+    """ Class that contains the Fetch Engine unit tests
+    """
+    def setUp(self):
+        """ Set up a function that records how many calls run at the same time.
+        """
+        super(TestFetchEngine, self).setUp()
+
+        self.lock, self.running, self.max_running = Lock(), 0, 0
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestFetchEngine, self).tearDown()
+
+    def _fetch(self, item):
+        """ A slow fetch that records the max number of concurrent calls """
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        time.sleep(0.05)
+
+        with self.lock:
+            self.running -= 1
+
+        if item == 'fail':
+            raise ValueError('Something happened')
+        return item * 2
+
+    def test_imap_unordered(self):
+        """ Test cases regarding the parallel execution of the fetch engine
+            Test flow:
+                    >>> Run eight slow fetches in four workers capped to two by appliance
+                    >>> Test if all results are returned and the appliance cap is respected
+                    >>> Test if an exception raised by a fetch is raised to the caller
+        """
+        engine = FetchEngine(4, appliance_limit=2)
+
+        start = time.time()
+        results = dict(engine.imap_unordered(self._fetch, range(8), key='appliance'))
+
+        self.assertEqual(results, {item: item * 2 for item in range(8)})
+        self.assertEqual(self.max_running, 2)
+        self.assertLess(time.time() - start, 0.4)
+
+        self.assertRaises(ValueError, list, engine.imap_unordered(self._fetch, ['fail'], key='appliance'))
+        engine.stop()
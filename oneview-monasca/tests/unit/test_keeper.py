@@ -22,7 +22,10 @@ from oneview_monasca.manager.manager_monasca import ManagerMonasca
 from oneview_monasca.eventbus.node_discovery import EventBUS
 from oneview_monasca.eventbus.priority import PriorityENUM
 from oneview_monasca.model.measurement import Measurement
+from oneview_monasca.shared.retry_policy import RetryPolicy
 from oneview_monasca.publisher.keeper import Keeper
+from oneview_monasca.publisher.puller import Puller
+from oneview_monasca.shared import constants as const
 from oneview_monasca.model.status import Status
 
 from tests.shared.config import Conf
@@ -134,7 +137,7 @@ class TestKeeper(TestBase):
         self.assertEqual(len(self.keeper._metric_storage['uuid_1'].keys()), 3)
         self.assertItemsEqual(self.keeper._metric_storage['uuid_1'].keys(), ['metrics', 'status', 'meta'])
         self.assertEqual(self.keeper._metric_storage['uuid_1']['status'], None)
-        self.assertEqual(type(self.keeper._metric_storage['uuid_1']['metrics']), set)
+        self.assertEqual(type(self.keeper._metric_storage['uuid_1']['metrics']), frozenset)
         self.assertEqual(len(self.keeper._metric_storage['uuid_1']['metrics']), 1)
         self.assertEqual(self.keeper._metric_storage['uuid_1']['meta'], {})
 
@@ -166,3 +169,110 @@ class TestKeeper(TestBase):
         self.assertEqual(self.keeper._metric_storage.items(), [])
         self.assertEqual(self.keeper._metric_storage.keys(), [])
         self.assertEqual(self.keeper._metric_storage.values(), [])
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_alerts', return_value={})
+    @mock.patch.object(ManagerMonasca, 'send_metrics')
+    def test_status_update_change_only(self, mock_manager, mock_alerts):
+        """ Test the change-only emission of Keeper
+        Test flow:
+               >>> Create a Keeper in change-only mode and make a node available
+               >>> Send the same status value twice with newer timestamps
+               >>> Keeper should request the alerts and send metrics only for the first status
+               >>> Send a different status value
+               >>> Keeper should request the alerts and send metrics again
+               >>> Expire the alerts and send the same status value
+               >>> Keeper should request the alerts without sending metrics
+        """
+        keeper = Keeper(self.keeper._manager_oneview, self.keeper._manager_monasca, batch_time="2", change_only=True)
+
+        metric = FakeModelMetric('mymetric', {'key1': 'value1'})
+        keeper.available({FakeModelNode('uuid_1', {metric})})
+
+        keeper.status_update({Status('uuid_1', 0, datetime(2016, 1, 1, 0, 0, 0))})
+        keeper.status_update({Status('uuid_1', 0, datetime(2016, 1, 1, 0, 0, 1))})
+
+        self.assertEqual(mock_alerts.call_count, 1)
+        mock_manager.assert_called_once_with([Measurement(metric.name, 0, metric.dimensions, {})])
+
+        keeper.status_update({Status('uuid_1', 2, datetime(2016, 1, 1, 0, 0, 2))})
+
+        self.assertEqual(mock_alerts.call_count, 2)
+        self.assertEqual(mock_manager.call_count, 2)
+        mock_manager.assert_called_with([Measurement(metric.name, 2, metric.dimensions, {})])
+
+        keeper._metric_storage['uuid_1']['meta_time'] = 0
+        keeper.status_update({Status('uuid_1', 2, datetime(2016, 1, 1, 0, 0, 3))})
+
+        self.assertEqual(mock_alerts.call_count, 3)
+        self.assertEqual(mock_manager.call_count, 2)
+        self.assertEqual(keeper._metric_storage['uuid_1']['status'].modified_timestamp, datetime(2016, 1, 1, 0, 0, 3))
+
+    @mock.patch.object(ManagerOneView, 'prefetch_server_hardware_alerts')
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_alerts', return_value={})
+    @mock.patch.object(ManagerMonasca, 'send_metrics')
+    def test_status_update_prefetch(self, mock_manager, mock_alerts, mock_prefetch):
+        """ Test the alerts prefetch of Keeper
+        Test flow:
+               >>> Create a Keeper with a prefetch threshold of 3 and make 3 nodes available
+               >>> Send the statuses of 2 nodes
+               >>> Keeper should request the alerts by node only
+               >>> Send the statuses of 3 nodes
+               >>> Keeper should prefetch the alerts of the 3 nodes before requesting them by node
+        """
+        keeper = Keeper(self.keeper._manager_oneview, self.keeper._manager_monasca, batch_time="2",
+                        prefetch_threshold=3)
+
+        metric = FakeModelMetric('mymetric', {'key1': 'value1'})
+        keeper.available({FakeModelNode('uuid_%d' % i, {metric}) for i in range(3)})
+
+        keeper.status_update({Status('uuid_%d' % i, 2, datetime(2016, 1, 1, 0, 0, 0)) for i in range(2)})
+
+        mock_prefetch.assert_not_called()
+        self.assertEqual(mock_alerts.call_count, 2)
+
+        keeper.status_update({Status('uuid_%d' % i, 3, datetime(2016, 1, 1, 0, 0, 1)) for i in range(3)})
+
+        mock_prefetch.assert_called_once_with({'uuid_0': 3, 'uuid_1': 3, 'uuid_2': 3})
+        self.assertEqual(mock_alerts.call_count, 5)
+        self.assertEqual(mock_manager.call_count, 2)
+
+    def test_create_policy_measurements(self):
+        """ Test the measurements of the statistics of the retry policies
+        Test flow:
+               >>> Create a Keeper with the retry policies of the agent and of a driver
+               >>> Test if a measurement is created by statistic of each retry policy
+               >>> Test if the measurements are identified by component and dependency
+        """
+        oneview_policy, ironic_policy = RetryPolicy('oneview'), RetryPolicy('ironic')
+        ironic_policy.execute(mock.Mock(), 1)
+
+        keeper = Keeper(None, None, batch_time="2", retry_policies=lambda: [
+            (const.AGENT_METRIC_COMPONENT, oneview_policy), ('ironic', ironic_policy)
+        ])
+        measurements = keeper._create_policy_measurements()
+
+        values = dict(((m.dimensions['component'], m.dimensions['dependency'], m.name), m.value) for m in measurements)
+        self.assertEqual(len(measurements), len(oneview_policy.metrics()) + len(ironic_policy.metrics()))
+        self.assertEqual(values[('ironic', 'ironic', const.RETRY_METRIC_PREFIX + 'calls')], 1)
+        self.assertEqual(values[('agent', 'oneview', const.RETRY_METRIC_PREFIX + 'breaker_state')], 0)
+
+        self.assertEqual(self.keeper._create_policy_measurements(), [])
+
+    def test_create_agent_measurements(self):
+        """ Test the measurements of the statistics of the agent components
+        Test flow:
+               >>> Create a Keeper with the metrics of a Puller that observed a cycle
+               >>> Test if a measurement is created by statistic of the Puller cycles
+        """
+        puller = Puller(None, 10, mock.Mock())
+        puller._observe_cycle(12)
+
+        keeper = Keeper(None, None, batch_time="2", agent_metrics=puller.metrics)
+        measurements = keeper._create_agent_measurements()
+
+        values = dict((m.name, m.value) for m in measurements)
+        self.assertEqual(values[const.PULLER_METRIC_PREFIX + 'cycle_duration.max'], 12)
+        self.assertEqual(values[const.PULLER_METRIC_PREFIX + 'cycle_overruns'], 1)
+        self.assertEqual({m.dimensions['component'] for m in measurements}, {const.AGENT_METRIC_COMPONENT})
+
+        self.assertEqual(self.keeper._create_agent_measurements(), [])
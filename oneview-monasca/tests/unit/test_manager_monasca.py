@@ -20,13 +20,16 @@
 
 from oneview_monasca.model.measurement import Measurement
 from oneview_monasca.manager.manager_monasca import ManagerMonasca
+from oneview_monasca.shared import constants as const
 
 from base import TestBase
 from tests.shared.config import ConfOpenstack
+from datetime import datetime
 
 import os
 import mock
 import hashlib
+import requests
 
 
 @mock.patch('monascaclient.ksclient.KSClient', new_callable=mock.PropertyMock)
@@ -96,3 +99,68 @@ class TestManagerMonasca(TestBase):
             self.assertEqual(ex.message, 'Something happened')
 
         self.assertTrue(raised)
+
+    @mock.patch('monascaclient.common.http.HTTPClient.json_request')
+    def test_send_metrics_cached_client(self, mock_httpclient, mock_ksclient):
+        """ Test cases regarding the reuse of the Keystone token by the send_metrics method
+            Test flow:
+                    >>> Send metrics twice and test if Keystone is requested only once
+                    >>> Expire the token and test if a new one is requested
+        """
+        mock_ksclient.return_value.monasca_url = self.endpoint_url
+        mock_ksclient.return_value.token = self.token
+        mock_httpclient.return_value = 200, {}
+
+        measure = Measurement(name='oneview.testMetric', value=0, dimensions={'service': 'test'}, value_meta={})
+
+        self.manager.send_metrics([measure])
+        self.manager.send_metrics([measure])
+
+        self.assertEqual(mock_ksclient.call_count, 1)
+        self.assertEqual(mock_httpclient.call_count, 2)
+
+        self.manager._token_expiration = 0
+        self.manager.send_metrics([measure])
+
+        self.assertEqual(mock_ksclient.call_count, 2)
+        self.assertEqual(self.manager.stats.get('authentications'), 2)
+
+    @mock.patch('oneview_monasca.manager.manager_monasca.time.time', return_value=1000000.0)
+    def test_token_expiration(self, mock_time, mock_ksclient):
+        """ Test cases regarding the renewal of the Keystone token before its expiry
+            Test flow:
+                    >>> Authenticate with a token that expires in one hour
+                    >>> Test if it is renewed the expiry margin before its expiry
+                    >>> Authenticate with a short-lived token and test if it is renewed at the half of its life
+                    >>> Authenticate without the expiry and test if the token TTL is assumed
+        """
+        for lifetime, renewal in [(3600, 3600 - const.KEYSTONE_TOKEN_EXPIRY_MARGIN), (200, 100),
+                                  (None, const.KEYSTONE_TOKEN_TTL - const.KEYSTONE_TOKEN_EXPIRY_MARGIN)]:
+            expires = datetime.utcfromtimestamp(1000000 + lifetime) if lifetime is not None else None
+            mock_ksclient.return_value._keystone.auth_ref.expires = expires
+
+            self.manager._authenticate()
+            self.assertEqual(self.manager._token_expiration, 1000000 + renewal)
+
+    def test_send_metrics_unauthorized(self, mock_ksclient):
+        """ Test cases regarding a Keystone token rejected by Monasca
+            Test flow:
+                    >>> Mock a 401 response followed by a 204 response from the HTTP session
+                    >>> Test if a new token is requested and the request is sent again by the same session
+        """
+        new_token = hashlib.sha1(os.urandom(128)).hexdigest()
+        type(mock_ksclient.return_value).token = mock.PropertyMock(side_effect=[self.token, new_token])
+        mock_ksclient.return_value.monasca_url = self.endpoint_url
+
+        unauthorized, created = requests.Response(), requests.Response()
+        unauthorized.status_code, unauthorized._content, unauthorized.raw = 401, '', mock.Mock(version=11)
+        created.status_code, created._content, created.raw = 204, '', mock.Mock(version=11)
+        measure = Measurement(name='oneview.testMetric', value=0, dimensions={'service': 'test'}, value_meta={})
+
+        with mock.patch.object(self.manager._session, 'request') as mock_request:
+            mock_request.side_effect = [unauthorized, created]
+            self.manager.send_metrics([measure])
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args[1]['headers']['X-Auth-Token'], new_token)
+        self.assertEqual(self.manager._monasca_client.http_client.auth_token, new_token)
@@ -21,19 +21,20 @@ Class to test the Manager OneView behavior.
 
 from base import TestBase
 from oneview_monasca.manager.manager_oneview import ManagerOneView
+from oneview_monasca.manager.alert_index import AlertIndex
 from oneview_monasca.shared.exceptions import LoginFailException
 from oneview_monasca.shared import constants as const
 from tests.shared.fake import FakeManagerOneview
 from tests.shared.config import Default
 from tests.shared.config import ConfOneview
 
-from hpOneView import activity
 from hpOneView import security
 from hpOneView import connection
 from hpOneView.exceptions import HPOneViewException
 from hpOneView.oneview_client import ServerHardware
 
 import os
+import urllib
 import uuid
 import mock
 
@@ -96,7 +97,9 @@ class TestManagerOneview(TestBase):
         mock_login.side_effect = None
         mock_client.return_value = self.fake_manager.get_server_hardware(sh_uuid)
 
-        result = self.manager.get_server_hardware(sh_uuid)
+        with mock.patch.object(connection, 'get_eula_status') as mock_eula:
+            mock_eula.return_value = False
+            result = self.manager.get_server_hardware(sh_uuid)
         expected_result = self.fake_manager.get_server_hardware(sh_uuid)
 
         mock_client.assert_called_with(sh_uuid)
@@ -130,23 +133,79 @@ class TestManagerOneview(TestBase):
 
         self.assertEqual(mock_manager.call_count, 1)
 
-    @mock.patch.object(activity, 'get_alerts')
-    @mock.patch.object(ManagerOneView, 'get_connection')
-    def test_get_server_hardware_alerts(self, mock_manager, mock_get_alerts):
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(ManagerOneView, '_get_connection')
+    def test_get_server_hardware_states(self, mock_manager, mock_get):
+        """ Test cases regarding the flows of the get_server_hardware_states method of Manager Oneview module
+            Test flow:
+                    >>> Mock two pages of the server hardware collection
+                    >>> Test if only the monitored server hardware are returned with its status and timestamp
+                    >>> Test if the collection is requested page by page
+        """
+        sh_uuid1, sh_uuid2, sh_uuid3 = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+        timestamp = '2014-08-07T11:00:11.467Z'
+
+        mock_manager.return_value = connection(self.manager._host)
+        mock_get.side_effect = [
+            {
+                'members': [
+                    {'uuid': sh_uuid1, 'status': 'OK', 'modified': timestamp},
+                    {'uuid': sh_uuid2, 'status': 'Warning', 'modified': timestamp}
+                ],
+                'nextPageUri': const.SERVER_HARDWARE_URI + '?start=2&count=2', 'total': 3
+            },
+            {
+                'members': [{'uuid': sh_uuid3, 'status': 'Critical', 'modified': timestamp}],
+                'nextPageUri': None, 'total': 3
+            }
+        ]
+
+        result = self.manager.get_server_hardware_states({sh_uuid1, sh_uuid3})
+
+        self.assertEqual(result, {sh_uuid1: (0, timestamp), sh_uuid3: (2, timestamp)})
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_manager.call_count, 2)
+        self.assertIn('start=2', mock_get.call_args[0][0])
+        self.assertIn('fields=' + const.SERVER_HARDWARE_STATUS_FIELDS, mock_get.call_args[0][0])
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(ManagerOneView, '_get_connection')
+    def test_get_server_hardware_states_modified_since(self, mock_manager, mock_get):
+        """ Test cases regarding the modified_since filter of the get_server_hardware_states method
+            Test flow:
+                    >>> Request the states of the server hardware modified since a timestamp
+                    >>> Test if the collection is requested with the modified filter
+        """
+        sh_uuid = str(uuid.uuid4())
+        timestamp = '2014-08-07T11:00:11.467Z'
+
+        mock_manager.return_value = connection(self.manager._host)
+        mock_get.return_value = {
+            'members': [{'uuid': sh_uuid, 'status': 'Warning', 'modified': timestamp}], 'nextPageUri': None, 'total': 1
+        }
+
+        result = self.manager.get_server_hardware_states({sh_uuid}, modified_since='2014-08-07T11:00:00.000Z')
+
+        self.assertEqual(result, {sh_uuid: (3, timestamp)})
+        self.assertIn("&filter=modified%3E%272014-08-07T11%3A00%3A00.000Z%27", mock_get.call_args[0][0])
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(ManagerOneView, '_get_connection')
+    def test_get_server_hardware_alerts(self, mock_manager, mock_get):
         """
         Test cases regarding the test_get_server_hardware_alerts method.
         :param mock_manager: a mocked manager
-        :param mock_get_alerts: the mocked method get_alerts
+        :param mock_get: the mocked method get of the connection
         """
         sh_uuid = str(uuid.uuid4())
 
-        mock_manager.return_value = None
-        mock_get_alerts.return_value = self.fake_manager.get_server_hardware_alerts(sh_uuid)
+        mock_manager.return_value = connection('127.0.0.1')
+        mock_get.return_value = {'members': self.fake_manager.get_server_hardware_alerts(sh_uuid)}
 
         result = self.manager.get_server_hardware_alerts(sh_uuid, 0)
 
         self.assertEqual(result, dict())
-        self.manager.get_connection.assert_not_called()
+        mock_get.assert_not_called()
 
         result = self.manager.get_server_hardware_alerts(sh_uuid, 3)
 
@@ -154,8 +213,84 @@ class TestManagerOneview(TestBase):
         value = self.manager._host + '#/activity/r' + key
 
         self.assertEqual(result, {key: value})
-        self.assertEqual(mock_get_alerts.call_count, 1)
-        self.manager.get_connection.assert_called_with()
+        self.assertEqual(mock_get.call_count, 1)
+
+        uri = mock_get.call_args[0][0]
+        self.assertIn('count=%d' % const.MAX_VALUE_META_LEN, uri)
+        self.assertIn('filter=' + urllib.quote(const.ALERT_ACTIVE_FILTER), uri)
+        self.assertIn('filter=' + urllib.quote(const.ALERT_RESOURCE_FILTER % (const.ONEVIEW_URI_PREFIX + sh_uuid)), uri)
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(ManagerOneView, '_get_connection')
+    def test_prefetch_server_hardware_alerts(self, mock_manager, mock_get):
+        """ Test cases regarding the flows of the prefetch_server_hardware_alerts method of Manager Oneview module
+            Test flow:
+                    >>> Mock two pages of the active alerts collection
+                    >>> Test if the alerts are grouped by server hardware, capped by MAX_VALUE_META_LEN
+                    >>> Test if the alerts lookups of the prefetched server hardware do not query OneView
+                    >>> Test if a changed status queries OneView again
+        """
+        sh_uuid1, sh_uuid2, sh_uuid3 = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+
+        alerts = [
+            {'uri': '/rest/alerts/%d' % i, 'resourceUri': const.ONEVIEW_URI_PREFIX + sh_uuid1}
+            for i in range(const.MAX_VALUE_META_LEN + 2)
+        ]
+        alerts.append({'uri': '/rest/alerts/a', 'resourceUri': const.ONEVIEW_URI_PREFIX + sh_uuid2})
+        alerts.append({'uri': '/rest/alerts/b', 'resourceUri': '/rest/enclosures/' + sh_uuid2})
+
+        mock_manager.return_value = connection('127.0.0.1')
+        mock_get.side_effect = [
+            {'members': alerts[:10], 'nextPageUri': '/rest/alerts?start=10', 'total': len(alerts)},
+            {'members': alerts[10:], 'nextPageUri': None, 'total': len(alerts)}
+        ]
+
+        self.manager.prefetch_server_hardware_alerts({sh_uuid1: 2, sh_uuid2: 3, sh_uuid3: 3, 'ok': 0}, page_size=10)
+
+        uris = [call[0][0] for call in mock_get.call_args_list]
+        self.assertEqual(len(uris), 2)
+        self.assertIn('start=10', uris[1])
+        self.assertIn('filter=' + urllib.quote(const.ALERT_ACTIVE_FILTER), uris[1])
+        self.assertNotIn('resourceUri', urllib.unquote(uris[1]))
+
+        result1 = self.manager.get_server_hardware_alerts(sh_uuid1, 2)
+        result2 = self.manager.get_server_hardware_alerts(sh_uuid2, 3)
+        result3 = self.manager.get_server_hardware_alerts(sh_uuid3, 3)
+
+        self.assertEqual(len(result1), const.MAX_VALUE_META_LEN)
+        self.assertEqual(result2, {'/rest/alerts/a': self.manager._host + '#/activity/r/rest/alerts/a'})
+        self.assertEqual(result3, {})
+        self.assertEqual(mock_get.call_count, 2)
+
+        mock_get.side_effect = None
+        mock_get.return_value = {'members': []}
+        self.manager.get_server_hardware_alerts(sh_uuid1, 3)
+
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(ManagerOneView, '_get_connection')
+    def test_get_server_hardware_alerts_index(self, mock_manager, mock_get):
+        """ Test cases regarding the alerts index used by the get_server_hardware_alerts method
+            Test flow:
+                    >>> Create a manager with an alerts index that is not ready
+                    >>> Test if the alerts are requested to OneView
+                    >>> Rebuild the index and test if the alerts are taken from it without a request
+        """
+        sh_uuid = str(uuid.uuid4())
+        index = AlertIndex()
+        manager = ManagerOneView(self.manager._host, None, None, alert_index=index)
+
+        mock_manager.return_value = connection('127.0.0.1')
+        mock_get.return_value = {'members': []}
+        self.assertEqual(manager.get_server_hardware_alerts(sh_uuid, 2), {})
+        self.assertEqual(mock_get.call_count, 1)
+
+        index.rebuild([{'uri': '/rest/alerts/1', 'resourceUri': const.ONEVIEW_URI_PREFIX + sh_uuid}])
+        result = manager.get_server_hardware_alerts(sh_uuid, 3)
+
+        self.assertEqual(result, {'/rest/alerts/1': manager._host + '#/activity/r/rest/alerts/1'})
+        self.assertEqual(mock_get.call_count, 1)
 
     @mock.patch.object(connection, 'login')
     def test_get_connection(self, mock_login):
@@ -195,6 +330,40 @@ class TestManagerOneview(TestBase):
         self.assertIsInstance(con, connection)
         self.assertEqual(mock_login.call_count, 3)
 
+        # The session is reused until it is rejected by the appliance
+        self.assertIs(self.manager.get_connection(), con)
+        self.assertEqual(mock_login.call_count, 3)
+
+    @mock.patch.object(connection, 'get_eula_status')
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'get')
+    def test_run_by_session(self, mock_get, mock_login, mock_eula):
+        """ Test cases regarding the renew of a rejected session of Manager Oneview module
+            Test flow:
+                    >>> Mock a request that is rejected because the session token expired
+                    >>> Test if a new login is done and the request is executed again
+                    >>> Test if the rejection is not counted as a failure of the retry policy
+                    >>> Mock a request rejected again after the new login and test if the error is raised
+        """
+        mock_eula.return_value = False
+        rejected = HPOneViewException({'errorCode': 'AUTHORIZATION', 'message': 'Authorization error'})
+        mock_get.side_effect = [rejected, {'members': [], 'total': 0}]
+
+        result = self.manager.get_server_hardware_collection()
+
+        self.assertEqual(result, [])
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_login.call_count, 2)
+        self.assertEqual(self.manager._retry_policy.stats.get('failures'), 0)
+        self.assertEqual(self.manager._retry_policy.stats.get('retries'), 0)
+
+        mock_get.side_effect = [rejected, rejected]
+
+        self.assertRaises(HPOneViewException, self.manager.get_server_hardware_collection)
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(mock_login.call_count, 3)
+        self.assertEqual(self.manager._retry_policy.stats.get('failures'), 0)
+
     @mock.patch.object(connection, 'login')
     @mock.patch.object(security, 'get_cert_ca')
     @mock.patch.object(security, 'get_rabbitmq_kp')
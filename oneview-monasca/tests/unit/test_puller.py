@@ -21,13 +21,15 @@
 from oneview_monasca.manager.manager_oneview import ManagerOneView
 from oneview_monasca.eventbus.node_discovery import EventBUS
 from oneview_monasca.publisher.puller import Puller
+from oneview_monasca.shared.exceptions import CircuitOpenException
 from tests.shared.fake import FakeIronicPluginProvider
 from tests.shared.fake import FakeKeeper
 from tests.shared.metric import Metric
 from tests.shared.config import Conf
 from tests.shared.node import Node
 from base import TestBase
-from time import sleep
+from threading import Thread, Event
+from time import sleep, time
 
 import mock
 
@@ -151,3 +153,118 @@ class TestPuller(TestBase):
 
         mock_manager.ssert_called_with(ironic_nodes.server_hardware_uuid)
         self.assertEqual(len(keeper.states), 1)
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_status')
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_states')
+    def test_process_status_bulk(self, mock_states, mock_status):
+        """ Test cases regarding the flows of status objects into the Puller in bulk collection mode.
+            Test flow:
+                    >>> Create a Puller in bulk collection mode and make two nodes available.
+                    >>> Verify if the states are taken from a single collection request.
+                    >>> Verify if the status objects has been created and sent to fake keeper.
+        """
+        keeper = FakeKeeper()
+        puller = Puller(self.manager_oneview, self.conf.DEFAULT.periodic_refresh_interval,
+                        mock.MagicMock(), bulk_collection=True)
+        puller.subscribe(keeper)
+
+        mock_states.return_value = {
+            'server_hardware_uuid1': (3, '2014-08-07T11:00:11.467Z'),
+            'server_hardware_uuid2': (0, '2014-08-07T11:00:11.467Z')
+        }
+        puller.available({
+            self.create_fake_node_plugin('server_hardware_uuid1', 'ironic'),
+            self.create_fake_node_plugin('server_hardware_uuid2', 'ironic')
+        })
+
+        mock_states.assert_called_once_with({'server_hardware_uuid1', 'server_hardware_uuid2'})
+        mock_status.assert_not_called()
+        self.assertEqual(len(keeper.states), 2)
+        self.assertEqual(
+            {status.server_hardware_uuid for status in keeper.states},
+            {'server_hardware_uuid1', 'server_hardware_uuid2'}
+        )
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_status')
+    def test_process_status_parallel(self, mock_status):
+        """ Test cases regarding the flows of status objects into the Puller with parallel fetch.
+            Test flow:
+                    >>> Create a Puller with many fetch workers and make five nodes available.
+                    >>> Verify if the status of each node is requested once.
+                    >>> Verify if the status objects are published in micro-batches and the cycle is measured.
+        """
+        keeper = mock.MagicMock()
+        puller = Puller(self.manager_oneview, self.conf.DEFAULT.periodic_refresh_interval,
+                        mock.MagicMock(), fetch_workers=4, appliance_concurrency=2, publish_batch_size=2)
+        puller.subscribers['FakeKeeper'] = keeper
+
+        mock_status.return_value = (3, '2014-08-07T11:00:11.467Z')
+        uuids = ['server_hardware_uuid%d' % i for i in range(5)]
+        puller.available({self.create_fake_node_plugin(uuid, 'ironic') for uuid in uuids})
+        puller.stop()
+
+        self.assertEqual(sorted(call[0][0] for call in mock_status.call_args_list), uuids)
+        self.assertEqual([len(call[0][0]) for call in keeper.status_update.call_args_list], [2, 2, 1])
+        self.assertEqual(
+            {status.server_hardware_uuid for call in keeper.status_update.call_args_list for status in call[0][0]},
+            set(uuids)
+        )
+        self.assertEqual(puller.stats.get('cycle_duration.count'), 1)
+        self.assertEqual(puller.stats.get('cycle_overruns'), 0)
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_status',
+                       side_effect=CircuitOpenException('The circuit breaker of OneView is open.'))
+    def test_process_status_circuit_open(self, mock_status):
+        """ Test cases regarding the cycles of the Puller while the circuit breaker of OneView is open.
+            Test flow:
+                    >>> Mock a manager whose circuit breaker is open and make a node available.
+                    >>> Verify if the cycle is skipped without calling the crash callback.
+        """
+        crash_callback = mock.MagicMock()
+        puller = Puller(self.manager_oneview, self.conf.DEFAULT.periodic_refresh_interval, crash_callback)
+
+        puller.available({self.create_fake_node_plugin('server_hardware_uuid1', 'ironic')})
+
+        mock_status.assert_called_once_with('server_hardware_uuid1')
+        crash_callback.assert_not_called()
+        self.assertEqual(puller.stats.get('cycles_skipped'), 1)
+        self.assertEqual(puller.stats.get('cycle_duration.count'), 1)
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_status')
+    def test_discovery_during_slow_poll(self, mock_status):
+        """ Test cases regarding the discovery of nodes while the Puller requests the status of the nodes.
+            Test flow:
+                    >>> Start a poll cycle that waits for a slow OneView response.
+                    >>> Verify if available and unavailable events are handled within milliseconds.
+                    >>> Verify if the status of a node removed during the poll is not published.
+        """
+        requesting, release = Event(), Event()
+
+        def slow_status(uuid):
+            requesting.set()
+            release.wait(5)
+            return 3, '2014-08-07T11:00:11.467Z'
+
+        keeper = FakeKeeper()
+        self.puller.subscribe(keeper)
+        self.puller._first_available_iteration = False
+        mock_status.side_effect = slow_status
+
+        node = self.create_fake_node_plugin('server_hardware_uuid', 'ironic')
+        self.puller.available({node})
+
+        poll = Thread(target=self.puller._process_status)
+        poll.start()
+        self.assertTrue(requesting.wait(5))
+
+        start = time()
+        self.puller.available({self.create_fake_node_plugin('server_hardware_uuid2', 'ironic')})
+        self.puller.unavailable({self.create_fake_node_plugin('server_hardware_uuid', 'ironic', 0)})
+        elapsed = time() - start
+
+        release.set()
+        poll.join(5)
+
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual(self.puller._monitored_nodes, {'server_hardware_uuid2'})
+        self.assertEqual(len(keeper.states), 0)
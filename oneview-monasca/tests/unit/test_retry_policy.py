@@ -0,0 +1,191 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Unit test cases for the retry_policy.py module.
+"""
+
+from oneview_monasca.shared.exceptions import CircuitOpenException
+from oneview_monasca.shared.exceptions import LoginFailException
+from oneview_monasca.shared.retry_policy import CircuitBreaker
+from oneview_monasca.shared.retry_policy import RetryPolicy
+from oneview_monasca.shared import constants as const
+from oneview_monasca.shared import utils
+from base import TestBase
+
+import mock
+
+
+class HTTPError(Exception):
+    """ An error answered by a dependency with a HTTP status code """
+    def __init__(self, http_status):
+        super(HTTPError, self).__init__('HTTP %d' % http_status)
+        self.http_status = http_status
+
+
+class TestRetryPolicy(TestBase):
+    """ Class that contains the retry policy unit tests
+    """
+    def setUp(self):
+        """ Set up the failing function that will be used into the tests cases.
+        """
+        super(TestRetryPolicy, self).setUp()
+
+        self.func = mock.MagicMock(side_effect=Exception('unavailable'))
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestRetryPolicy, self).tearDown()
+
+    def test_full_jitter_wait(self):
+        """ Test cases regarding the full_jitter_wait function of the utils module
+            Test flow:
+                    >>> Test if the wait is never above the exponential backoff of the attempt
+                    >>> Test if the wait is never above the max wait
+        """
+        for attempt in range(1, 10):
+            self.assertTrue(0 <= utils.full_jitter_wait(attempt, 100, 1000) <= min(1000, 100 * 2 ** (attempt - 1)))
+
+    @mock.patch('oneview_monasca.shared.retry_policy.time.sleep')
+    def test_execute_retries(self, mock_sleep):
+        """ Test cases regarding the retries of the execute method of retry policy module
+            Test flow:
+                    >>> Execute a function that fails twice and then succeed
+                    >>> Test if its result is returned after two retries with exponential backoff
+        """
+        self.func.side_effect = [Exception('unavailable'), Exception('unavailable'), 'result']
+        policy = RetryPolicy('oneview', base_wait=100, max_wait=1000, failure_threshold=0)
+
+        self.assertEqual(policy.execute(self.func, 5, 'arg'), 'result')
+        self.func.assert_called_with('arg')
+        self.assertEqual(self.func.call_count, 3)
+        self.assertTrue(mock_sleep.call_args_list[0][0][0] <= 0.1)
+        self.assertTrue(mock_sleep.call_args_list[1][0][0] <= 0.2)
+        self.assertEqual(policy.stats.get('retries'), 2)
+        self.assertEqual(policy.stats.get('failures'), 2)
+
+    @mock.patch('oneview_monasca.shared.retry_policy.time.sleep')
+    def test_execute_login_fail(self, mock_sleep):
+        """ Test cases regarding the LoginFailException in the execute method of retry policy module
+            Test flow:
+                    >>> Execute a function that raises a LoginFailException
+                    >>> Test if it is not retried and does not open the circuit
+        """
+        self.func.side_effect = LoginFailException('login')
+        policy = RetryPolicy('oneview', failure_threshold=1)
+
+        self.assertRaises(LoginFailException, policy.execute, self.func, 5)
+        self.assertEqual(self.func.call_count, 1)
+        self.assertEqual(policy.breaker.state, CircuitBreaker.CLOSED)
+        self.assertFalse(mock_sleep.called)
+
+    @mock.patch('oneview_monasca.shared.retry_policy.time.sleep')
+    def test_execute_client_error(self, mock_sleep):
+        """ Test cases regarding the errors answered to a wrong request in the execute method
+            Test flow:
+                    >>> Execute a function that raises a HTTP 404 error
+                    >>> Test if it is not retried and does not open the circuit
+                    >>> Test if the HTTP 5xx, timeout and throttling errors open the circuit
+        """
+        self.func.side_effect = HTTPError(404)
+        policy = RetryPolicy('oneview', failure_threshold=1)
+
+        self.assertRaises(HTTPError, policy.execute, self.func, 5)
+        self.assertEqual(self.func.call_count, 1)
+        self.assertEqual(policy.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(policy.stats.get('failures'), 0)
+        self.assertFalse(mock_sleep.called)
+
+        for status in [503, 408, 429]:
+            self.func.side_effect = HTTPError(status)
+            policy = RetryPolicy('oneview', failure_threshold=1)
+
+            self.assertRaises(HTTPError, policy.execute, self.func, 1)
+            self.assertEqual(policy.breaker.state, CircuitBreaker.OPEN)
+
+    def test_metrics(self):
+        """ Test cases regarding the metrics method of retry policy module
+            Test flow:
+                    >>> Execute a function with a retry policy
+                    >>> Test if its statistics and retry budget are named with the metrics prefix
+        """
+        policy = RetryPolicy('ironic', budget_ratio=0.5, budget_size=2)
+        policy.execute(mock.Mock(), 1)
+
+        metrics = policy.metrics()
+        self.assertEqual(metrics[const.RETRY_METRIC_PREFIX + 'calls'], 1)
+        self.assertEqual(metrics[const.RETRY_METRIC_PREFIX + 'breaker_state'], 0)
+        self.assertEqual(metrics[const.RETRY_METRIC_PREFIX + 'budget'], 2)
+
+    @mock.patch('oneview_monasca.shared.retry_policy.time.sleep')
+    def test_retry_budget(self, mock_sleep):
+        """ Test cases regarding the retry budget of retry policy module
+            Test flow:
+                    >>> Execute a failing function with a budget of two retries
+                    >>> Test if only two retries are done, until the calls refill the budget
+        """
+        policy = RetryPolicy('ironic', budget_ratio=0.5, budget_size=2, failure_threshold=0)
+
+        self.assertRaises(Exception, policy.execute, self.func, 5)
+        self.assertEqual(self.func.call_count, 3)
+        self.assertRaises(Exception, policy.execute, self.func, 5)
+        self.assertEqual(self.func.call_count, 4)
+        self.assertRaises(Exception, policy.execute, self.func, 5)
+        self.assertEqual(self.func.call_count, 6)
+
+        self.assertEqual(policy.stats.get('retries'), 3)
+        self.assertEqual(policy.stats.get('budget_exhausted'), 3)
+
+    @mock.patch('oneview_monasca.shared.retry_policy.time')
+    def test_circuit_breaker(self, mock_time):
+        """ Test cases regarding the circuit breaker of retry policy module
+            Test flow:
+                    >>> Execute a failing function until the circuit opens
+                    >>> Test if the calls fail fast while the circuit is open
+                    >>> Test if a failed trial call after the reset timeout opens the circuit again
+                    >>> Test if a successful trial call closes the circuit
+        """
+        mock_time.time.return_value = 1000
+        policy = RetryPolicy('monasca', failure_threshold=2, reset_timeout=30)
+
+        self.assertRaises(Exception, policy.execute, self.func, 1)
+        self.assertEqual(policy.breaker.state, CircuitBreaker.CLOSED)
+        self.assertRaises(Exception, policy.execute, self.func, 1)
+        self.assertEqual(policy.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(policy.stats.get('breaker_state'), 2)
+
+        self.assertRaises(CircuitOpenException, policy.execute, self.func, 1)
+        self.assertEqual(self.func.call_count, 2)
+        self.assertEqual(policy.stats.get('rejected'), 1)
+
+        mock_time.time.return_value = 1030
+        self.assertRaises(Exception, policy.execute, self.func, 1)
+        self.assertEqual(self.func.call_count, 3)
+        self.assertEqual(policy.breaker.state, CircuitBreaker.OPEN)
+
+        mock_time.time.return_value = 1060
+        self.assertTrue(policy.breaker.allow())
+        self.assertEqual(policy.stats.get('breaker_state'), 1)
+        self.assertFalse(policy.breaker.allow())
+        policy.breaker.record_success()
+
+        self.func.side_effect = None
+        policy.execute(self.func, 1)
+        self.assertEqual(policy.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(policy.stats.get('breaker_state'), 0)
+        self.assertEqual(policy.stats.get('breaker_opens'), 2)
@@ -18,8 +18,12 @@
 """ This test module cover the SCMB module.
 """
 
+from oneview_monasca.manager.alert_cache import AlertCache
+from oneview_monasca.manager.alert_index import AlertIndex
+from oneview_monasca.shared import constants as const
 from oneview_monasca.shared import utils
 from pika.adapters import blocking_connection
+from oneview_monasca.publisher.scmb_pipeline import SCMBPipeline
 from oneview_monasca.publisher.scmb import SCMB
 from oneview_monasca.model.status import Status
 from oneview_monasca.shared.exceptions import LoginFailException
@@ -34,7 +38,13 @@ from tests.shared.config import Default
 from tests.shared.config import ConfOneview
 from tests.shared.fake import FakeSelectConnection
 
+from pika.exceptions import AMQPConnectionError
+
+from threading import Event
+
+import json
 import mock
+import time
 import uuid
 
 
@@ -195,6 +205,390 @@ class TestSCMB(TestBase):
         status_obj = Status(resource, 0, utils.parse_timestamp('2014-08-07T11:00:11.467Z'))
         self.assertTrue(status_obj in subscriber.states)
 
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_status', side_effect=lambda uuid, status: status)
+    def test_scmb_callback_pipeline(self, mock_manager):
+        """Test the scmb_callback method with a pool of workers
+            Test flow:
+                    >>> Create a SCMB with workers and send a burst of messages of two resources
+                    >>> Test if the consumer callback only enqueues the messages
+                    >>> Test if the messages of each resource are processed in the order they were received
+        """
+        subscriber = mock.MagicMock()
+        scmb = SCMB(self.manager, self.conf.host, 2, None, workers=2)
+        scmb.subscribers['FakeKeeper'] = subscriber
+
+        resources = [str(uuid.uuid4()), str(uuid.uuid4())]
+        scmb.available({self.create_fake_node_plugin(resource, 'test_scmb') for resource in resources})
+
+        with mock.patch.object(scmb, '_process_message', wraps=scmb._process_message) as mock_process:
+            scmb._pipeline._handler = mock_process
+            for index in range(10):
+                for resource in resources:
+                    body = json.dumps({
+                        'resource': {'uuid': resource, 'status': index, 'modified': '2014-08-07T11:00:11.467Z'}
+                    })
+                    method = mock.MagicMock(routing_key='scmb.server-hardware.Updated.' + resource)
+                    scmb._scmb_callback(None, method, None, body)
+
+            scmb.stop()
+            for worker in scmb._pipeline._workers:
+                worker.join(5)
+
+        self.assertEqual(mock_process.call_count, 20)
+        self.assertEqual(scmb._pipeline.stats.get('processed'), 20)
+        self.assertEqual(scmb._pipeline.stats.get('queue_lag.count'), 20)
+        self.assertEqual(scmb._pipeline.queue_depth(), 0)
+
+        for resource in resources:
+            statuses = [
+                status.status for call in subscriber.status_update.call_args_list for status in call[0][0]
+                if status.server_hardware_uuid == resource
+            ]
+            self.assertEqual(statuses, range(10))
+
+    def test_scmb_pipeline_stop(self):
+        """Test the stop of a pipeline whose queue is full
+            Test flow:
+                    >>> Fill the queue of a pipeline while its worker is busy
+                    >>> Stop the pipeline and test if it does not wait for the worker
+                    >>> Release the worker and test if it processes the queued messages and stops
+        """
+        busy = Event()
+        handler = mock.Mock(side_effect=lambda routing_key, body: busy.wait(5))
+        pipeline = SCMBPipeline(handler, 1, queue_size=2)
+
+        for index in range(3):
+            pipeline.put('scmb.server-hardware.Updated.uuid', str(index))
+            while not index and pipeline.queue_depth():
+                time.sleep(0.01)
+
+        with mock.patch('oneview_monasca.publisher.scmb_pipeline.utils.print_log_message') as mock_log:
+            pipeline.stop()
+
+        self.assertTrue('queue_depth=2' in mock_log.call_args[0][1])
+
+        busy.set()
+        pipeline._workers[0].join(5)
+
+        self.assertFalse(pipeline._workers[0].is_alive())
+        self.assertEqual(pipeline.stats.get('processed'), 3)
+        self.assertEqual(pipeline.stats.get('queue_lag.count'), 3)
+
+    def test_scmb_pipeline_partition(self):
+        """Test the partition of the messages by resource
+            Test flow:
+                    >>> Create a pipeline with a pool of workers
+                    >>> Test if every change of an alert goes to the same queue
+        """
+        pipeline = SCMBPipeline(mock.Mock(), 8)
+
+        for index in range(10):
+            alert_uri = '/rest/alerts/%d' % index
+            queues = {
+                pipeline._get_queue('scmb.alerts.%s.%s' % (change_type, alert_uri))
+                for change_type in ['Created', 'Updated', 'Deleted']
+            }
+            self.assertEqual(len(queues), 1)
+
+        pipeline.stop()
+
+    @mock.patch.object(ManagerOneView, 'get_active_alerts')
+    def test_scmb_alerts(self, mock_get_active_alerts):
+        """Test the alerts index kept by the SCMB
+            Test flow:
+                    >>> Create a SCMB with an alerts index and initialize it with a fake connection
+                    >>> Test if the alerts routing key is bound and the index is rebuilt from OneView
+                    >>> Send the alerts messages and test if the index is updated without a request
+                    >>> Stop the SCMB and test if the index is not ready until the next connection
+        """
+        resource_uri = '/rest/server-hardware/' + str(uuid.uuid4())
+        mock_get_active_alerts.return_value = [{'uri': '/rest/alerts/1', 'resourceUri': resource_uri}]
+
+        scmb = SCMB(self.manager, self.conf.host, 2, None, alert_index=AlertIndex())
+        scmb._connection = mock.MagicMock()
+        scmb._initialize_scmb()
+
+        scmb._channel.queue_bind.assert_any_call(
+            exchange=const.EXCHANGE_NAME, queue=mock.ANY, routing_key=const.ALERTS_ROUTING_KEY
+        )
+        self.assertTrue(scmb._alert_index.ready)
+        self.assertEqual(scmb._alert_index.get_alerts(resource_uri), ['/rest/alerts/1'])
+
+        for alert_uri, state, change_type in [('/rest/alerts/2', 'Active', 'Created'),
+                                              ('/rest/alerts/1', 'Cleared', 'Updated')]:
+            body = json.dumps({
+                'resource': {'uri': alert_uri, 'alertState': state, 'resourceUri': resource_uri},
+                'changeType': change_type
+            })
+            method = mock.MagicMock(routing_key='scmb.alerts.%s.%s' % (change_type, alert_uri))
+            scmb._scmb_callback(None, method, None, body)
+
+        self.assertEqual(scmb._alert_index.get_alerts(resource_uri), ['/rest/alerts/2'])
+        self.assertEqual(mock_get_active_alerts.call_count, 1)
+
+        scmb._stop_scmb()
+        self.assertFalse(scmb._alert_index.ready)
+
+    def test_scmb_alert_cache(self):
+        """Test the alerts cache kept up to date by the SCMB
+            Test flow:
+                    >>> Create a SCMB with an alerts cache and initialize it with a fake connection
+                    >>> Test if the alerts routing key is bound without an alerts index
+                    >>> Send an alert message and test if the cached alerts of its resource are removed
+                    >>> Stop the SCMB and test if the cache is cleared
+        """
+        sh_uuid1, sh_uuid2 = str(uuid.uuid4()), str(uuid.uuid4())
+        cache = AlertCache()
+        cache.put(sh_uuid1, 3, {'/rest/alerts/1': 'link'})
+        cache.put(sh_uuid2, 3, {'/rest/alerts/2': 'link'})
+
+        scmb = SCMB(self.manager, self.conf.host, 2, None, alert_cache=cache)
+        scmb._connection = mock.MagicMock()
+        scmb._initialize_scmb()
+
+        scmb._channel.queue_bind.assert_any_call(
+            exchange=const.EXCHANGE_NAME, queue=mock.ANY, routing_key=const.ALERTS_ROUTING_KEY
+        )
+
+        body = json.dumps({
+            'resource': {
+                'uri': '/rest/alerts/3', 'alertState': 'Active', 'resourceUri': const.ONEVIEW_URI_PREFIX + sh_uuid1
+            },
+            'changeType': 'Created'
+        })
+        scmb._scmb_callback(None, mock.MagicMock(routing_key='scmb.alerts.Created./rest/alerts/3'), None, body)
+
+        self.assertIsNone(cache.get(sh_uuid1, 3))
+        self.assertEqual(cache.get(sh_uuid2, 3), {'/rest/alerts/2': 'link'})
+
+        scmb._stop_scmb()
+        self.assertIsNone(cache.get(sh_uuid2, 3))
+
+    def test_scmb_resource_bindings(self):
+        """Test the routing keys bound by monitored node
+            Test flow:
+                    >>> Create a SCMB with resource bindings and initialize it with a fake connection
+                    >>> Make two nodes available and test if its routing keys are bound in the next timeout
+                    >>> Make a node unavailable and test if its routing key is unbound
+                    >>> Make nodes available above the threshold and test if the default routing key replaces them
+        """
+        scmb = SCMB(self.manager, self.conf.host, 2, None, resource_bindings=True, binding_threshold=2)
+        scmb._connection = mock.MagicMock()
+        scmb._initialize_scmb()
+
+        scmb._channel.queue_bind.assert_not_called()
+        scmb._connection.add_timeout.assert_called_once_with(const.SCMB_BINDING_INTERVAL, scmb._on_bindings_timeout)
+
+        nodes = [self.create_fake_node_plugin(str(uuid.uuid4()), 'test_scmb', 0) for _ in range(3)]
+        keys = [const.RESOURCE_ROUTING_KEY_PREFIX + const.ONEVIEW_URI_PREFIX + n.server_hardware_uuid for n in nodes]
+
+        scmb.available(set(nodes[:2]))
+        scmb._on_bindings_timeout()
+
+        bound = [call[1]['routing_key'] for call in scmb._channel.queue_bind.call_args_list]
+        self.assertEqual(sorted(bound), sorted(keys[:2]))
+        self.assertEqual(scmb._connection.add_timeout.call_count, 2)
+
+        scmb.unavailable({nodes[0]})
+        scmb._on_bindings_timeout()
+
+        scmb._channel.queue_unbind.assert_called_once_with(
+            exchange=const.EXCHANGE_NAME, queue=scmb._queue_name, routing_key=keys[0]
+        )
+
+        scmb.available(set(nodes))
+        scmb._on_bindings_timeout()
+
+        scmb._channel.queue_bind.assert_called_with(
+            exchange=const.EXCHANGE_NAME, queue=scmb._queue_name, routing_key=const.ROUTING_KEY
+        )
+        self.assertEqual(scmb._bound_keys, {const.ROUTING_KEY})
+
+    def test_scmb_durable_bindings(self):
+        """Test the routing keys bound by monitored node to a durable queue after a reconnection
+            Test flow:
+                    >>> Create a SCMB with resource bindings and a durable queue and bind two nodes
+                    >>> Make a node unavailable and reconnect before the next timeout
+                    >>> Test if the new channel binds the monitored node and unbinds the other one
+        """
+        scmb = SCMB(self.manager, self.conf.host, 2, None, resource_bindings=True, durable_queue='oneview-monasca.test')
+        scmb._connection = mock.MagicMock()
+        scmb._initialize_scmb()
+
+        nodes = [self.create_fake_node_plugin(str(uuid.uuid4()), 'test_scmb', 0) for _ in range(2)]
+        keys = [const.RESOURCE_ROUTING_KEY_PREFIX + const.ONEVIEW_URI_PREFIX + n.server_hardware_uuid for n in nodes]
+
+        scmb.available(set(nodes))
+        scmb._on_bindings_timeout()
+        scmb.unavailable({nodes[0]})
+
+        scmb._connection.channel.return_value = mock.MagicMock()
+        scmb._initialize_scmb()
+
+        scmb._channel.queue_bind.assert_called_once_with(
+            exchange=const.EXCHANGE_NAME, queue=scmb._queue_name, routing_key=keys[1]
+        )
+        scmb._channel.queue_unbind.assert_called_once_with(
+            exchange=const.EXCHANGE_NAME, queue=scmb._queue_name, routing_key=keys[0]
+        )
+        self.assertEqual(scmb._bound_keys, {keys[1]})
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_status', side_effect=lambda uuid, status: status)
+    def test_scmb_durable_queue(self, mock_manager):
+        """Test the durable queue of the SCMB
+            Test flow:
+                    >>> Create a SCMB with a durable queue and workers and initialize it with a fake channel
+                    >>> Test if the named queue is declared durable, with a prefetch count and manual acks
+                    >>> Send messages and test if each one is acked by the consumer after processed
+                    >>> Test if the acks of a previous channel are discarded after a reconnection
+        """
+        scmb = SCMB(self.manager, self.conf.host, 2, None, workers=2, durable_queue='oneview-monasca.test',
+                    prefetch_count=10)
+        scmb._connection = mock.MagicMock()
+        scmb._initialize_scmb()
+        channel = scmb._channel
+
+        channel.queue_declare.assert_called_once_with(
+            queue='oneview-monasca.test', durable=True, exclusive=False, auto_delete=False
+        )
+        channel.basic_qos.assert_called_once_with(prefetch_count=10)
+        channel.basic_consume.assert_called_once_with(scmb._scmb_callback, queue=mock.ANY, no_ack=False)
+
+        resource = str(uuid.uuid4())
+        for tag in range(5):
+            body = json.dumps({'resource': {'uuid': resource, 'status': tag, 'modified': '2014-08-07T11:00:11.467Z'}})
+            method = mock.MagicMock(routing_key='scmb.server-hardware.Updated.' + resource, delivery_tag=tag)
+            scmb._scmb_callback(channel, method, None, body)
+
+        scmb._pipeline.stop()
+        for worker in scmb._pipeline._workers:
+            worker.join(5)
+
+        channel.basic_ack.assert_not_called()
+        scmb._on_acks_timeout()
+
+        self.assertEqual([call[1]['delivery_tag'] for call in channel.basic_ack.call_args_list], range(5))
+
+        scmb._connection.channel.return_value = mock.MagicMock()
+        scmb._initialize_scmb()
+        scmb._on_processed((channel, 5))
+        scmb._on_acks_timeout()
+
+        self.assertEqual(channel.basic_ack.call_count, 5)
+        scmb._channel.basic_ack.assert_not_called()
+
+    @mock.patch('oneview_monasca.publisher.scmb.SCMBConsumer')
+    def test_scmb_async_consumer(self, mock_consumer):
+        """Test the SCMB with an event loop consumer
+            Test flow:
+                    >>> Create a SCMB with the async consumer and initialize it
+                    >>> Test if the consumer runs with the heartbeat and sets up the channel by the SCMB
+                    >>> Test if the timers are scheduled in the consumer connection
+                    >>> Stop the SCMB and test if the consumer is stopped
+        """
+        scmb = SCMB(self.manager, self.conf.host, 2, None, workers=1, resource_bindings=True, async_consumer=True,
+                    heartbeat=30)
+
+        with mock.patch.object(scmb, '_connection_parameters') as mock_parameters:
+            scmb._initialize_scmb()
+
+        mock_parameters.assert_called_once_with(30)
+        mock_consumer.assert_called_once_with(mock_parameters.return_value, {}, scmb._setup_channel)
+        mock_consumer.return_value.run.assert_called_once_with()
+
+        channel = mock.MagicMock()
+        self.assertEqual(scmb._setup_channel(channel, 'test'), channel.basic_consume.return_value)
+
+        mock_consumer.return_value.connection.add_timeout.assert_called_once_with(
+            const.SCMB_BINDING_INTERVAL, scmb._on_bindings_timeout
+        )
+        self.assertIsNone(scmb._connection)
+
+        with mock.patch.object(scmb, '_Thread__stop') as mock_stop:
+            scmb.stop()
+
+        mock_consumer.return_value.stop.assert_called_once_with()
+        self.assertIsNone(scmb._consumer)
+        mock_stop.assert_not_called()
+
+        scmb = SCMB(self.manager, self.conf.host, 2, None, async_consumer=True)
+        self.assertFalse(scmb._async_consumer)
+
+    @mock.patch('oneview_monasca.publisher.scmb.SCMBConsumer')
+    @mock.patch.object(ManagerOneView, 'get_active_alerts', return_value=[])
+    def test_scmb_async_consumer_not_blocked(self, mock_get_active_alerts, mock_consumer):
+        """Test the SCMB event loop is not blocked by the alerts index or the workers
+            Test flow:
+                    >>> Create a SCMB with the async consumer, an alerts index and a full pipeline
+                    >>> Set up the channel and test if the alerts index is rebuilt by a helper thread
+                    >>> Send messages and test if they are rejected instead of waiting for the workers
+                    >>> Test if the updates lost are refreshed later by a helper thread
+        """
+        scmb = SCMB(self.manager, self.conf.host, 2, None, workers=1, queue_size=1, alert_index=AlertIndex(),
+                    async_consumer=True)
+        scmb._consumer = mock_consumer.return_value
+        scmb._pipeline.stop()
+        for worker in scmb._pipeline._workers:
+            worker.join(5)
+
+        with mock.patch('oneview_monasca.publisher.scmb.Thread') as mock_thread:
+            scmb._setup_channel(mock.MagicMock(), 'test')
+
+        mock_get_active_alerts.assert_not_called()
+        mock_thread.assert_called_once_with(target=scmb._resync_alerts, args=())
+        mock_thread.return_value.start.assert_called_once_with()
+
+        resource = str(uuid.uuid4())
+        body = json.dumps({'resource': {'uuid': resource, 'status': 0, 'modified': '2014-08-07T11:00:11.467Z'}})
+        method = mock.MagicMock(routing_key='scmb.server-hardware.Updated.' + resource)
+        with mock.patch('time.time', return_value=1000.0):
+            for _ in range(3):
+                scmb._scmb_callback(None, method, None, body)
+
+        self.assertEqual(scmb._pipeline.stats.get('rejected'), 2)
+        scmb._consumer.connection.add_timeout.assert_called_once_with(
+            const.SCMB_OVERFLOW_REFRESH_DELAY, scmb._on_overflow_timeout
+        )
+
+        with mock.patch('oneview_monasca.publisher.scmb.Thread') as mock_thread:
+            scmb._on_overflow_timeout()
+
+        mock_thread.assert_any_call(target=scmb._resync_alerts, args=())
+        mock_thread.assert_any_call(target=scmb._refresh_gap, args=(1000.0,))
+        self.assertIsNone(scmb._dropped_at)
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_states')
+    def test_scmb_reconnect_gap(self, mock_states):
+        """Test the refresh of the updates missed while the SCMB connection was lost
+            Test flow:
+                    >>> Lose the connection of a SCMB that monitors two nodes
+                    >>> Reconnect and test if only the nodes modified since the disconnection are requested
+                    >>> Test if its statuses are published
+                    >>> Reconnect again and test if nothing is requested
+        """
+        subscriber = mock.MagicMock()
+        scmb = SCMB(self.manager, self.conf.host, 2, None)
+        scmb.subscribers['FakeKeeper'] = subscriber
+
+        resources = [str(uuid.uuid4()), str(uuid.uuid4())]
+        scmb.available({self.create_fake_node_plugin(resource, 'test_scmb') for resource in resources})
+        mock_states.return_value = {resources[0]: (2, '2014-08-07T11:00:11.467Z')}
+
+        with mock.patch('time.time', return_value=1000.0):
+            scmb._retry_reconnect(AMQPConnectionError('Connection lost'), 0)
+
+        with mock.patch('oneview_monasca.publisher.scmb.Thread') as mock_thread:
+            scmb._setup_channel(mock.MagicMock(), 'test')
+            scmb._setup_channel(mock.MagicMock(), 'test')
+
+        mock_thread.assert_called_once_with(target=scmb._refresh_gap, args=(1000.0,))
+        scmb._refresh_gap(*mock_thread.call_args[1]['args'])
+
+        mock_states.assert_called_once_with(frozenset(resources), modified_since='1970-01-01T00:15:40.000Z')
+        subscriber.status_update.assert_called_once_with(
+            {Status(resources[0], 2, utils.parse_timestamp('2014-08-07T11:00:11.467Z'))}
+        )
+
     @mock.patch.object(ManagerOneView, 'get_certificates')
     @mock.patch.object(ManagerOneView, 'validate_certificates')
     @mock.patch('pika.adapters.blocking_connection.BlockingConnection.close')
@@ -0,0 +1,130 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the scmb_consumer.py module.
+"""
+
+from oneview_monasca.publisher.scmb_consumer import ChannelAdapter
+from oneview_monasca.publisher.scmb_consumer import SCMBConsumer
+from pika.exceptions import AMQPConnectionError
+
+from base import TestBase
+
+import mock
+
+
+@mock.patch('pika.SelectConnection')
+class TestSCMBConsumer(TestBase):
+    """ Class that contains the SCMB Consumer unit tests
+    """
+    def setUp(self):
+        """ Set up the fake channel and the callback that will be used into the tests cases.
+        """
+        super(TestSCMBConsumer, self).setUp()
+
+        self.channel = mock.MagicMock()
+        self.on_channel_ready = mock.Mock(return_value='ctag')
+        self.consumer = SCMBConsumer(mock.Mock(), {'queue': 'test', 'durable': True}, self.on_channel_ready)
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestSCMBConsumer, self).tearDown()
+
+    def open(self, connection):
+        """ Simulate the event loop opening the connection, the channel and declaring the queue """
+        self.consumer._on_connection_open(connection)
+        self.consumer._on_channel_open(self.channel)
+        self.consumer._on_queue_declareok(mock.Mock(method=mock.Mock(queue='test')))
+
+    def test_run_and_stop(self, mock_connection):
+        """ Test cases regarding the consumer lifecycle
+            Test flow:
+                    >>> Run the consumer and simulate the event loop opening the channel
+                    >>> Test if the queue is declared and the channel is given to be set up
+                    >>> Stop the consumer and test if it is cancelled and the channel closed
+                    >>> Test if the consumer leaves the event loop without an error
+        """
+        connection = mock_connection.return_value
+
+        def start():
+            self.open(connection)
+            self.consumer.stop()
+            connection.ioloop.add_callback_threadsafe.call_args[0][0]()
+            self.consumer.on_cancelok(None)
+            self.consumer._on_channel_closed(self.channel, 200, 'Normal shutdown')
+            self.consumer._on_connection_closed(connection, 200, 'Normal shutdown')
+
+        connection.ioloop.start.side_effect = start
+        self.consumer.run()
+
+        connection.channel.assert_called_once_with(on_open_callback=self.consumer._on_channel_open)
+        self.channel.queue_declare.assert_called_once_with(
+            self.consumer._on_queue_declareok, queue='test', durable=True
+        )
+        self.on_channel_ready.assert_called_once_with(mock.ANY, 'test')
+        self.channel.basic_cancel.assert_called_once_with(self.consumer.on_cancelok, 'ctag')
+        self.channel.close.assert_called_once_with()
+        connection.ioloop.stop.assert_called_once_with()
+        self.assertFalse(self.consumer._running)
+
+    def test_connection_lost(self, mock_connection):
+        """ Test cases regarding the connection closed by the SCMB
+            Test flow:
+                    >>> Run the consumer and simulate the connection closed by the broker
+                    >>> Test if the consumer leaves the event loop raising an AMQPConnectionError
+                    >>> Test if stopping the consumer after it leaves does not schedule a cancellation
+        """
+        connection = mock_connection.return_value
+
+        def start():
+            self.open(connection)
+            self.consumer._on_connection_closed(connection, 320, 'CONNECTION_FORCED')
+
+        connection.ioloop.start.side_effect = start
+        self.assertRaises(AMQPConnectionError, self.consumer.run)
+
+        self.consumer.stop()
+        connection.ioloop.add_callback_threadsafe.assert_not_called()
+
+    def test_channel_adapter(self, mock_connection):
+        """ Test cases regarding the blocking style calls over an asynchronous channel
+            Test flow:
+                    >>> Bind, unbind, set the qos, ack and nack through the adapter
+                    >>> Test if the calls are forwarded without waiting the replies
+                    >>> Test if the consumer callback receives the adapter as its channel
+        """
+        adapter = ChannelAdapter(self.channel)
+
+        adapter.queue_bind(exchange='scmb', queue='test', routing_key='key')
+        adapter.queue_unbind(exchange='scmb', queue='test', routing_key='key')
+        adapter.basic_qos(prefetch_count=10)
+        adapter.basic_ack(delivery_tag=1)
+        adapter.basic_nack(delivery_tag=2)
+
+        self.channel.queue_bind.assert_called_once_with(None, 'test', 'scmb', 'key')
+        self.channel.queue_unbind.assert_called_once_with(None, 'test', 'scmb', 'key')
+        self.channel.basic_qos.assert_called_once_with(None, prefetch_count=10)
+        self.channel.basic_ack.assert_called_once_with(delivery_tag=1)
+        self.channel.basic_nack.assert_called_once_with(delivery_tag=2, requeue=True)
+
+        callback = mock.Mock()
+        adapter.basic_consume(callback, queue='test', no_ack=False)
+        on_message = self.channel.basic_consume.call_args[0][0]
+        on_message(self.channel, 'method', 'properties', 'body')
+
+        callback.assert_called_once_with(adapter, 'method', 'properties', 'body')
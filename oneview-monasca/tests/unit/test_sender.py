@@ -0,0 +1,181 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the sender.py module.
+"""
+
+from oneview_monasca.model.measurement import Measurement
+from oneview_monasca.manager.sender import MetricSender
+
+from base import TestBase
+from threading import Event
+
+import mock
+import time
+
+
+class TestMetricSender(TestBase):
+    """ Class that contains the Metric Sender unit tests
+    """
+    def setUp(self):
+        """ Set up the measurements that will be used into the tests cases.
+        """
+        super(TestMetricSender, self).setUp()
+
+        self.manager = mock.Mock()
+        self.measurements = [
+            Measurement(name='oneview.testMetric', value=i, dimensions={'service': 'test'}, value_meta={})
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestMetricSender, self).tearDown()
+
+    def test_send_metrics_batches(self):
+        """ Test cases regarding the batches sent by the sender workers
+            Test flow:
+                    >>> Put five measurements in a sender with batch size two
+                    >>> Test if all measurements are sent in order and in batches of at most two
+        """
+        sender = MetricSender(self.manager, batch_size=2, linger_time=0.05)
+        sender.send_metrics(self.measurements)
+        sender.start()
+
+        time.sleep(0.5)
+        sender.stop()
+
+        batches = [call[0][0] for call in self.manager.send_metrics.call_args_list]
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual([m for batch in batches for m in batch], self.measurements)
+        self.assertEqual(sender.stats.get('sent'), 5)
+        self.assertEqual(sender.stats.get('queue_depth'), 0)
+        self.assertEqual(sender.stats.get('send_latency.count'), len(batches))
+
+    def test_send_metrics_not_blocked(self):
+        """ Test cases regarding a slow Monasca API
+            Test flow:
+                    >>> Mock a Monasca manager that does not answer
+                    >>> Test if the producer is not blocked and a failure does not stop the worker
+        """
+        sending, release = Event(), Event()
+
+        def slow_send(batch):
+            sending.set()
+            release.wait()
+
+        self.manager.send_metrics.side_effect = slow_send
+
+        sender = MetricSender(self.manager, batch_size=1, linger_time=0)
+        sender.start()
+
+        start = time.time()
+        sender.send_metrics(self.measurements)
+        self.assertLess(time.time() - start, 0.5)
+
+        sending.wait(1)
+
+        self.manager.send_metrics.side_effect = Exception('Something happened')
+        release.set()
+        time.sleep(0.2)
+        sender.stop()
+
+        self.assertEqual(self.manager.send_metrics.call_count, 5)
+        self.assertEqual(sender.stats.get('send_failures'), 4)
+
+    def test_overflow_policies(self):
+        """ Test cases regarding the overflow policies of the sender queue
+            Test flow:
+                    >>> Put five measurements in a queue of size three without workers
+                    >>> Test if the drop_oldest policy keeps the newest measurements
+                    >>> Test if the spill policy hands the newest measurements to the spill function
+        """
+        sender = MetricSender(self.manager, queue_size=3, overflow_policy='drop_oldest')
+        sender.send_metrics(self.measurements)
+
+        self.assertEqual(list(sender._queue), self.measurements[2:])
+        self.assertEqual(sender.stats.get('dropped'), 2)
+
+        spill = mock.Mock()
+        sender = MetricSender(self.manager, queue_size=3, overflow_policy='spill', spill=spill)
+        sender.send_metrics(self.measurements)
+
+        self.assertEqual(list(sender._queue), self.measurements[:3])
+        spill.assert_called_once_with(self.measurements[3:])
+
+        self.assertRaises(ValueError, MetricSender, self.manager, overflow_policy='unknown')
+
+    def test_send_failure_dropped(self):
+        """ Test cases regarding the batches that could not be sent without a spill function
+            Test flow:
+                    >>> Put five measurements in a sender whose Monasca endpoint fails on purpose
+                    >>> Test if the measurements of the failed batches are counted as dropped, not sent
+        """
+        self.manager.send_metrics.side_effect = Exception('Monasca is unavailable')
+        sender = MetricSender(self.manager, batch_size=2, linger_time=0)
+
+        with mock.patch('oneview_monasca.manager.sender.utils.print_log_message') as mock_log:
+            sender.send_metrics(self.measurements)
+            sender.start()
+            time.sleep(0.3)
+            sender.stop()
+
+        self.assertEqual(sender.stats.get('dropped'), 5)
+        self.assertEqual(sender.stats.get('sent'), 0)
+        self.assertEqual(sender.stats.get('send_failures'), self.manager.send_metrics.call_count)
+        self.assertFalse(any('Sent batch' in call[0][1] for call in mock_log.call_args_list))
+
+    def test_stop_spill(self):
+        """ Test cases regarding the measurements still queued when the sender is stopped
+            Test flow:
+                    >>> Put five measurements in a sender without workers and stop it
+                    >>> Test if the measurements are handed to the spill function
+                    >>> Test if they are discarded when there is no spill function
+        """
+        spill = mock.Mock()
+        sender = MetricSender(self.manager, workers=0, spill=spill)
+        sender.send_metrics(self.measurements)
+        sender.stop()
+
+        spill.assert_called_once_with(self.measurements)
+        self.assertEqual(sender.stats.get('spilled'), 5)
+        self.assertEqual(sender.stats.get('queue_depth'), 0)
+
+        sender = MetricSender(self.manager, workers=0)
+        sender.send_metrics(self.measurements)
+        sender.stop()
+
+        self.assertEqual(sender.stats.get('dropped'), 5)
+        self.manager.send_metrics.assert_not_called()
+
+    def test_overflow_block(self):
+        """ Test cases regarding the block overflow policy
+            Test flow:
+                    >>> Put more measurements than the queue size in a sender that blocks
+                    >>> Test if the producer waits the workers and no measurement is lost
+        """
+        sender = MetricSender(self.manager, queue_size=2, batch_size=1, linger_time=0, overflow_policy='block')
+        sender.start()
+        sender.send_metrics(self.measurements)
+
+        time.sleep(0.2)
+        sender.stop()
+
+        sent = [call[0][0][0] for call in self.manager.send_metrics.call_args_list]
+        self.assertEqual(sent, self.measurements)
+        self.assertEqual(sender.stats.get('dropped'), 0)
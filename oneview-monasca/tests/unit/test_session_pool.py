@@ -0,0 +1,91 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oneview_monasca.manager.session_pool import OneViewSessionPool
+from hpOneView.exceptions import HPOneViewException
+from hpOneView import connection
+from base import TestBase
+
+import mock
+
+
+class TestSessionPool(TestBase):
+    """ Class that contains the OneView session pool unit tests
+    """
+    def setUp(self):
+        """ Set up the same credentials that will be used into the tests cases.
+        """
+        super(TestSessionPool, self).setUp()
+
+        self.credentials = {'userName': 'administrator', 'password': 'secret'}
+
+    def tearDown(self):
+        """ Default tear down method.
+        """
+        super(TestSessionPool, self).tearDown()
+
+    @mock.patch.object(connection, 'login')
+    def test_get_connection(self, mock_login):
+        """ Test cases regarding the get_connection method of OneView session pool module
+            Test flow:
+                    >>> Get many connections to the same appliance
+                    >>> Test if only one login is done and the on_login callback is called once
+                    >>> Test if a new login is done after the session is invalidated
+        """
+        on_login = mock.Mock()
+        pool = OneViewSessionPool()
+
+        con1 = pool.get_connection('1.2.3.4', self.credentials, on_login)
+        con2 = pool.get_connection('1.2.3.4', self.credentials, on_login)
+
+        self.assertIs(con1, con2)
+        self.assertEqual(mock_login.call_count, 1)
+        on_login.assert_called_once_with(con1)
+
+        pool.invalidate('1.2.3.4', self.credentials)
+        con3 = pool.get_connection('1.2.3.4', self.credentials, on_login)
+
+        self.assertIsNot(con1, con3)
+        self.assertEqual(mock_login.call_count, 2)
+        self.assertEqual(pool.stats.get('logins'), 2)
+        self.assertEqual(pool.stats.get('reuses'), 1)
+        self.assertEqual(pool.stats.get('refreshes'), 1)
+
+    @mock.patch.object(connection, 'login')
+    def test_get_connection_expired(self, mock_login):
+        """ Test cases regarding the session ttl of OneView session pool module
+            Test flow:
+                    >>> Get two connections with a pool whose sessions expire immediately
+                    >>> Test if a login is done by connection
+        """
+        pool = OneViewSessionPool(session_ttl=0)
+
+        pool.get_connection('1.2.3.4', self.credentials)
+        pool.get_connection('1.2.3.4', self.credentials)
+
+        self.assertEqual(mock_login.call_count, 2)
+
+    def test_is_unauthorized(self):
+        """ Test cases regarding the is_unauthorized method of OneView session pool module
+        """
+        self.assertTrue(OneViewSessionPool.is_unauthorized(
+            HPOneViewException({'errorCode': 'AUTHORIZATION', 'message': 'Session expired'})
+        ))
+        self.assertFalse(OneViewSessionPool.is_unauthorized(
+            HPOneViewException({'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Resource not found'})
+        ))
+        self.assertFalse(OneViewSessionPool.is_unauthorized(Exception('Connection refused')))
@@ -0,0 +1,181 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Unit test cases for the spool.py module.
+"""
+
+from oneview_monasca.manager.manager_monasca import ManagerMonasca
+from oneview_monasca.model.measurement import Measurement
+from oneview_monasca.manager.sender import MetricSender
+from oneview_monasca.manager.spool import MetricSpool
+
+from tests.shared.config import ConfOpenstack
+from base import TestBase
+
+import tempfile
+import requests
+import shutil
+import mock
+import json
+import time
+
+
+@mock.patch('monascaclient.ksclient.KSClient', new_callable=mock.PropertyMock)
+class TestMetricSpool(TestBase):
+    """ Class that contains the Metric Spool unit tests
+    """
+    def setUp(self):
+        """ Set up a fake Monasca endpoint and the measurements that will be used into the tests cases.
+        """
+        super(TestMetricSpool, self).setUp()
+
+        conf = ConfOpenstack()
+        self.manager = ManagerMonasca(
+            conf.auth_url, conf.auth_user, conf.auth_password, conf.auth_tenant_name, conf.monasca_api_version
+        )
+
+        self.directory = tempfile.mkdtemp()
+        self.measurements = [
+            Measurement(name='oneview.testMetric', value=i, dimensions={'service': 'test'}, value_meta={})
+            for i in range(10)
+        ]
+
+    def tearDown(self):
+        """ Remove the spool directory.
+        """
+        super(TestMetricSpool, self).tearDown()
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def _response(status_code):
+        """ Create a response of the fake Monasca endpoint """
+        response = requests.Response()
+        response.status_code, response._content, response.raw = status_code, '', mock.Mock(version=11)
+        return response
+
+    def test_spool_and_replay(self, mock_ksclient):
+        """ Test cases regarding the spool of the measurements that failed to be sent
+            Test flow:
+                    >>> Mock a Monasca endpoint that fails on purpose
+                    >>> Test if the batches that failed are written by the sender in sealed segments
+                    >>> Test if the segments are kept while the Monasca endpoint is unavailable
+                    >>> Mock the Monasca endpoint back and test if the spool replays all measurements in order
+        """
+        mock_ksclient.return_value.monasca_url = 'http://127.0.0.1:8070/v2.0'
+        mock_ksclient.return_value.token = 'token'
+
+        spool = MetricSpool(self.manager, self.directory, segment_size=200, replay_rate=3)
+        sender = MetricSender(self.manager, batch_size=5, linger_time=0, spill=spool.append)
+
+        with mock.patch.object(self.manager._session, 'request', return_value=self._response(503)):
+            sender.start()
+            sender.send_metrics(self.measurements)
+            time.sleep(0.3)
+            sender.stop()
+
+            self.assertRaises(Exception, spool._replay_segments)
+
+        self.assertEqual(sender.stats.get('spilled'), 10)
+        self.assertEqual(spool.stats.get('spooled'), 10)
+        self.assertEqual(spool.stats.get('replayed'), 0)
+        self.assertTrue(len(spool._sealed_segments()) > 1)
+
+        with mock.patch.object(self.manager._session, 'request', return_value=self._response(204)) as mock_request:
+            with mock.patch('time.sleep'):
+                spool._replay_segments()
+
+        sent = [metric['value'] for call in mock_request.call_args_list for metric in json.loads(call[1]['data'])]
+        self.assertEqual(sent, range(10))
+        self.assertEqual(spool.stats.get('replayed'), 10)
+        self.assertEqual(spool._segments(), [])
+
+    def test_checksum_and_max_size(self, mock_ksclient):
+        """ Test cases regarding the integrity and the size cap of the spool
+            Test flow:
+                    >>> Corrupt a sealed segment and test if it is discarded instead of replayed
+                    >>> Fill a spool above its max size and test if the oldest segments are evicted
+                    >>> Leave a segment open and test if it is recovered by a new spool
+        """
+        spool = MetricSpool(mock.Mock(), self.directory, segment_size=1)
+        spool.append(self.measurements[:1])
+        spool.append(self.measurements[1:2])
+
+        with open(spool._path(0, '.seg'), 'a') as segment:
+            segment.write('garbage\n')
+
+        spool._replay_segments()
+
+        self.assertEqual(spool.stats.get('corrupted'), 1)
+        self.assertEqual(spool.stats.get('replayed'), 1)
+        spool._manager_monasca.send_metrics.assert_called_once_with([self.measurements[1]])
+
+        spool = MetricSpool(mock.Mock(), self.directory, segment_size=1, max_size=300)
+        for measurement in self.measurements:
+            spool.append([measurement])
+
+        self.assertTrue(spool.stats.get('evicted') > 0)
+        self.assertTrue(spool._size() <= 300)
+
+        spool = MetricSpool(mock.Mock(), self.directory)
+        spool.append(self.measurements)
+        with open(spool._path(spool._segment, '.seg'), 'a') as segment:
+            segment.write('{"partial": ')
+
+        spool = MetricSpool(mock.Mock(), self.directory)
+        self.assertEqual(
+            [m.value for m in spool._read_segment(spool._sealed_segments()[-1])[0]],
+            [m.value for m in self.measurements]
+        )
+
+    def test_resume_and_evicted(self, mock_ksclient):
+        """ Test cases regarding the replay of a segment that fails partway or is evicted
+            Test flow:
+                    >>> Fail the second batch of a segment and test if the first is kept as replayed
+                    >>> Replay it again and test if only the batches not sent are sent
+                    >>> Remove a segment while it is replayed and test if it is skipped
+        """
+        spool = MetricSpool(mock.Mock(), self.directory, replay_rate=3)
+        spool.append(self.measurements)
+        spool._manager_monasca.send_metrics.side_effect = [None, Exception('Monasca is unavailable')]
+
+        with mock.patch('time.sleep'):
+            self.assertRaises(Exception, spool._replay_segments)
+
+        self.assertEqual(spool._read_checksum(0)[2], 3)
+        self.assertEqual(spool.stats.get('replayed'), 3)
+
+        spool._manager_monasca.send_metrics.reset_mock()
+        spool._manager_monasca.send_metrics.side_effect = None
+        with mock.patch('time.sleep'):
+            spool._replay_segments()
+
+        sent = [m.value for call in spool._manager_monasca.send_metrics.call_args_list for m in call[0][0]]
+        self.assertEqual(sent, range(3, 10))
+        self.assertEqual(spool.stats.get('replayed'), 10)
+        self.assertEqual(spool._segments(), [])
+
+        spool.append(self.measurements)
+        spool._lock.acquire()
+        spool._seal()
+        spool._lock.release()
+
+        with mock.patch.object(spool, '_sealed_segments', return_value=[1]):
+            spool._remove(1)
+            spool._replay_segments()
+
+        self.assertEqual(spool.stats.get('corrupted'), 0)
+        self.assertEqual(spool.stats.get('replayed'), 10)
@@ -181,3 +181,26 @@ class TestValidationsConfig(TestBase):
 
         self.assertTrue(raised)
         self.assertEqual(mock_ironic_client.call_count, 2)
+
+    # this function tests if the ironic credentials are checked with a reusable keystone session
+    @mock.patch("ironicclient.client.get_client")
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_chk_ironic_credentials_session(self, mock_get_access, mock_ironic_client):
+        """Test cases regarding the keystone session returned by the chk_ironic_credentials method
+            Test flow:
+                    >>> Mock the keystone authentication and the ironic client
+                    >>> Test if the ironic client is created with the authenticated session
+                    >>> Test if the returned session reuses its token
+        """
+        config = ConfIronic()
+        keystone_session = validations._chk_ironic_credentials(
+            config.auth_url, config.admin_user, config.admin_password, config.admin_tenant_name,
+            config.insecure, config.ironic_api_version, None, None, None, None, None, None, None, None
+        )
+
+        session = keystone_session.get_session()
+        mock_ironic_client.assert_called_once_with(
+            1, session=session, ironic_url=None, os_region_name=None, os_ironic_api_version='1.11'
+        )
+        self.assertEqual(keystone_session.stats.get('authentications'), 1)
+        self.assertEqual(keystone_session.stats.get('reuses'), 1)
@@ -0,0 +1,159 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+
+"""
+Benchmark of the EventBUS dispatch, deep copying the nodes of each event versus
+keeping immutable snapshots that share the metrics of the nodes.
+
+Each dispatch resolves the metrics of all nodes of an event, as the available
+method does before notifying the subscribers (the pause between the priorities
+is left out). The memory is the size of the objects that each dispatch
+allocated and the event bus kept.
+
+Usage: python tools/benchmark_event_bus.py [--nodes 10000] [--metrics 2] [--changed 1]
+"""
+
+from oneview_monasca.eventbus.node_discovery import EventBUS
+
+import argparse
+import copy
+import time
+import sys
+
+
+class Metric(object):
+    """ A metric as sent by the discovery plugins """
+    def __init__(self, name, dimensions):
+        self.name = name
+        self.dimensions = dimensions
+
+    def __eq__(self, other):
+        return self.name == other.name and self.dimensions == other.dimensions
+
+    def __hash__(self):
+        return hash((self.name, tuple(sorted(self.dimensions.items()))))
+
+
+class Node(object):
+    """ A node as sent by the discovery plugins """
+    def __init__(self, server_hardware_uuid, metrics):
+        self.server_hardware_uuid = server_hardware_uuid
+        self.metrics = metrics
+
+    def __eq__(self, other):
+        return self.server_hardware_uuid == other.server_hardware_uuid and \
+            self.metrics == other.metrics
+
+    def __hash__(self):
+        return hash(self.server_hardware_uuid)
+
+
+class DeepCopyEventBUS(EventBUS):
+    """ The event bus deep copying the nodes of each event, as before the snapshots """
+    def _resolve_available_metrics(self, nodes):
+        updated_nodes = set()
+        for node in nodes:
+            if node.server_hardware_uuid in self._events:
+                new_node = copy.deepcopy(self._events[node.server_hardware_uuid])
+                new_node.metrics.update(node.metrics)
+            else:
+                new_node = copy.deepcopy(node)
+
+            self._events[node.server_hardware_uuid] = new_node
+            updated_nodes.add(new_node)
+
+        return updated_nodes
+
+
+def create_nodes(count, metrics, changed=0):
+    """ Create the nodes of an event, the first ones with an extra metric """
+    nodes = set()
+    for index in range(count):
+        uuid = 'uuid-%d' % index
+        extra = 1 if index < changed else 0
+        nodes.add(Node(uuid, set(
+            Metric('oneview.server_hardware', {'server_hardware_uuid': uuid, 'service': 'service-%d' % metric})
+            for metric in range(metrics + extra)
+        )))
+    return nodes
+
+
+def size_of(roots, seen):
+    """ Get the size of the objects reachable from the roots that were not seen yet """
+    size, stack = 0, list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+
+    return size
+
+
+def dispatch(eventbus, nodes, seen):
+    """ Dispatch an event, returning its time and the memory that it kept """
+    size_of([nodes], seen)
+    start = time.time()
+    updated_nodes = eventbus._resolve_available_metrics(nodes)
+    elapsed = time.time() - start
+    return elapsed, size_of([updated_nodes, eventbus._events], seen), updated_nodes
+
+
+def run(eventbus_class, args):
+    """ Dispatch the first, a repeated and a partially changed event """
+    eventbus = eventbus_class(None)
+    seen, kept = set(), []
+    results = []
+    for nodes in (create_nodes(args.nodes, args.metrics), create_nodes(args.nodes, args.metrics),
+                  create_nodes(args.nodes, args.metrics, args.nodes * args.changed // 100)):
+        elapsed, size, updated_nodes = dispatch(eventbus, nodes, seen)
+        # The objects are kept alive, so their ids are not reused
+        kept.append((nodes, updated_nodes))
+        results.append((elapsed, size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the EventBUS dispatch.')
+    parser.add_argument('--nodes', type=int, default=10000, help='number of nodes by event')
+    parser.add_argument('--metrics', type=int, default=2, help='number of metrics by node')
+    parser.add_argument('--changed', type=int, default=1,
+                        help='percentage of nodes with a new metric in the last event')
+    args = parser.parse_args()
+
+    print('%d nodes with %d metrics by event, %d%% changed in the last one' % (
+        args.nodes, args.metrics, args.changed))
+    print('%-10s %-10s %12s %12s' % ('', 'event', 'ms', 'KB kept'))
+    for name, eventbus_class in (('deepcopy', DeepCopyEventBUS), ('snapshot', EventBUS)):
+        results = run(eventbus_class, args)
+        for event, (elapsed, size) in zip(('first', 'repeated', 'changed'), results):
+            print('%-10s %-10s %12.1f %12.1f' % (name, event, elapsed * 1000, size / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -20,7 +20,10 @@ Provides interest nodes based on Ironic services.
 """
 
 from ovm_ironic.manager.manager_ironic import ManagerIronic
+from ovm_ironic.shared.keystone_session import KeystoneSession
 from ovm_ironic.driver.base import DiscoveryNodeProvider
+from ovm_ironic.shared.retry_policy import RetryPolicy
+from ovm_ironic.shared import constants as const
 from ovm_ironic.shared import log as logging
 from ovm_ironic.shared import utils as utils
 from threading import Thread
@@ -33,7 +36,10 @@ LOG = logging.get_logger(__name__)
 
 class DiscoveryNodeIronicProvider(DiscoveryNodeProvider, Thread):
     """
-    This class provides interest nodes associated with Ironic service.
+    This class provides interest nodes associated with Ironic service. After a
+    listing of all nodes, only the nodes updated since the newest update seen
+    (the watermark) are requested, until the next full listing that catches the
+    deleted nodes. Only the interest nodes that changed are notified.
 
     Thread control:
         stopped: Manage the thread state (running or stopped).
@@ -46,6 +52,7 @@ class DiscoveryNodeIronicProvider(DiscoveryNodeProvider, Thread):
 
         self._conf = conf
         self._manager_ironic = manager_ironic
+        self._keystone_session = None
 
         # Thread control
         self._lock = Lock()
@@ -57,9 +64,15 @@ class DiscoveryNodeIronicProvider(DiscoveryNodeProvider, Thread):
         """
         utils.print_log_message('Info', 'Initialize Discovery Node Ironic Provider', LOG)
 
-        self._interest_nodes = set()
+        self._interest_nodes = {}
+        self._watermark = None
+        self._last_full_sync = None
         self._retry_interval = int(self._conf.DEFAULT.retry_interval)
+        self._full_sync_interval = int(
+            getattr(self._conf.ironic, 'full_sync_interval', const.FULL_SYNC_INTERVAL)
+        )
         if not self._manager_ironic:
+            self._keystone_session = self._get_keystone_session()
             self._manager_ironic = ManagerIronic(
                 username=self._conf.ironic.admin_user,
                 password=self._conf.ironic.admin_password,
@@ -76,9 +89,54 @@ class DiscoveryNodeIronicProvider(DiscoveryNodeProvider, Thread):
                 user_domain_name=self._conf.ironic.user_domain_name,
                 project_domain_name=self._conf.ironic.project_domain_name,
                 max_attempt=self._conf.DEFAULT.auth_retry_limit,
-                debug=self.debug
+                debug=self.debug,
+                retry_policy=self._get_retry_policy('ironic', 'ironic'),
+                page_size=getattr(self._conf.ironic, 'node_page_size', const.NODE_PAGE_SIZE),
+                keystone_session=self._keystone_session
             )
 
+    def _get_keystone_session(self):
+        """Gets the Keystone session shared by all Ironic calls. The session
+        authenticated by the validation of the configuration is reused when
+        the configuration carries it.
+        """
+        return KeystoneSession(
+            auth_url=self._conf.ironic.auth_url,
+            username=self._conf.ironic.admin_user,
+            password=self._conf.ironic.admin_password,
+            tenant_name=self._conf.ironic.admin_tenant_name,
+            insecure=self._conf.ironic.insecure,
+            project_name=self._conf.ironic.project_name,
+            user_domain_id=self._conf.ironic.user_domain_id,
+            project_domain_id=self._conf.ironic.project_domain_id,
+            project_id=self._conf.ironic.project_id,
+            user_domain_name=self._conf.ironic.user_domain_name,
+            project_domain_name=self._conf.ironic.project_domain_name,
+            session=vars(self._conf).get(const.IRONIC_SESSION),
+            debug=self.debug
+        )
+
+    def _get_retry_policy(self, section, name):
+        """Gets the retry policy of a dependency configured in its section, kept
+        to publish its statistics.
+
+        :param section: the name of the configuration section of the dependency.
+        :param name: the name of the dependency.
+        """
+        settings = getattr(self._conf, section)
+        policy = RetryPolicy(
+            name,
+            base_wait=getattr(settings, 'retry_base_wait', const.RETRY_BASE_WAIT),
+            max_wait=getattr(settings, 'retry_max_wait', const.RETRY_MAX_WAIT),
+            budget_ratio=getattr(settings, 'retry_budget_ratio', const.RETRY_BUDGET_RATIO),
+            budget_size=getattr(settings, 'retry_budget_size', const.RETRY_BUDGET_SIZE),
+            failure_threshold=getattr(settings, 'breaker_failure_threshold',
+                                      const.BREAKER_FAILURE_THRESHOLD),
+            reset_timeout=getattr(settings, 'breaker_reset_timeout', const.BREAKER_RESET_TIMEOUT)
+        )
+        self.retry_policies.append(policy)
+        return policy
+
     def stop(self):
         """
         Stop the thread.
@@ -100,36 +158,80 @@ class DiscoveryNodeIronicProvider(DiscoveryNodeProvider, Thread):
             message = 'Cannot starting ironic plugin, fatal error caused by: %s.' % ex
             utils.print_log_message('Info', message, LOG)
 
+    def _is_full_sync_due(self):
+        """
+        Check if all nodes should be listed, to catch the deleted nodes.
+        """
+        return self._watermark is None or self._last_full_sync is None or \
+            time.time() - self._last_full_sync >= self._full_sync_interval
+
+    def _get_changed_nodes(self, full_sync):
+        """
+        Get the interest node of each Ironic node changed since the watermark,
+        None for the Ironic nodes that are not interest nodes anymore.
+
+        :param full_sync: list all nodes instead of the nodes updated since the watermark.
+        :returns a dict with the interest node (or None) of each changed Ironic node uuid.
+        """
+        started = time.time()
+        since = None if full_sync else self._watermark
+
+        changed_nodes, watermark = {}, self._watermark
+        for ironic_node in self._manager_ironic.get_node_list(since):
+            changed_nodes[utils.extract_ironic_uuid(ironic_node)] = \
+                self._manager_ironic.get_node_associated_oneview(ironic_node)
+
+            changed_at = utils.extract_ironic_changed_at(ironic_node)
+            if changed_at is not None and (watermark is None or changed_at > watermark):
+                watermark = changed_at
+
+        # The watermark only moves after all changed nodes are taken
+        self._watermark = watermark
+        if full_sync:
+            for ironic_uuid in set(self._interest_nodes) - set(changed_nodes):
+                changed_nodes[ironic_uuid] = None
+            self._last_full_sync = started
+
+        return changed_nodes
+
     def _pull_nodes(self):
         """
         Verify if exists changes in interest nodes and notify subscribers.
         """
         try:
-            utils.print_log_message(
-                'Debug', 'Pulling Ironic nodes...', LOG, self.debug)
-
-            nodes = self._manager_ironic.get_node_list()
-            interest_nodes = self._manager_ironic.get_nodes_associated_oneview(nodes)
-
-            message = "%s Ironic interest nodes has been taken." % len(interest_nodes)
+            full_sync = self._is_full_sync_due()
+            message = 'Pulling %s Ironic nodes...' % ('all' if full_sync else 'updated')
+            utils.print_log_message('Debug', message, LOG, self.debug)
+
+            added_nodes, removed_nodes = set(), set()
+            for ironic_uuid, node in self._get_changed_nodes(full_sync).items():
+                old_node = self._interest_nodes.get(ironic_uuid)
+                if node == old_node:
+                    continue
+
+                if old_node is not None:
+                    removed_nodes.add(old_node)
+                    del self._interest_nodes[ironic_uuid]
+                if node is not None:
+                    added_nodes.add(node)
+                    self._interest_nodes[ironic_uuid] = node
+
+            message = "%s Ironic interest nodes has been taken." % len(self._interest_nodes)
             utils.print_log_message('Info', message, LOG)
-
-            if interest_nodes != self._interest_nodes:
-                # Check if there new nodes to add in list of interest nodes
-                added_nodes = interest_nodes - self._interest_nodes
-                if added_nodes:
-                    self._interest_nodes.update(added_nodes)
-                    self._lock.acquire()
-                    self.available(added_nodes)
-                    self._lock.release()
-
-                # Check if there node to be removed from list of interest nodes
-                removed_nodes = self._interest_nodes - interest_nodes
-                if removed_nodes:
-                    self._interest_nodes.difference_update(removed_nodes)
-                    self._lock.acquire()
-                    self.unavailable(removed_nodes)
-                    self._lock.release()
+            if self._keystone_session is not None:
+                message = 'Keystone session [%s]' % self._keystone_session.stats
+                utils.print_log_message('Debug', message, LOG, self.debug)
+
+            # Notify the changed nodes as removed before adding its new version
+            if removed_nodes:
+                self._lock.acquire()
+                self.unavailable(removed_nodes)
+                self._lock.release()
+
+            if added_nodes:
+                self._lock.acquire()
+                self.available(added_nodes)
+                self._lock.release()
 
         except Exception as ex:
             self.stop()
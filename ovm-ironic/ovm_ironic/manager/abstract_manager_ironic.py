@@ -28,6 +28,15 @@ class AbstractManagerIronic(object):
     """
     This class should be implemented by any Ironic Manager.
     """
+    @abc.abstractmethod
+    def get_node_associated_oneview(self, ironic_node):
+        """Get the Node of the server hardware of an Ironic node.
+
+        :param ironic_node: an Ironic node.
+        :returns the Node, or None if the Ironic node is not associated to OneView.
+        """
+        return NotImplementedError("NotImplementedException")
+
     @abc.abstractmethod
     def get_nodes_associated_oneview(self, ironic_nodes):
         """Get a set of Nodes of server hardware associated to HLM services.
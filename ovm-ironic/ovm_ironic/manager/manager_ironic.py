@@ -20,13 +20,15 @@ Manages the Ironic Component
 """
 
 from ironicclient.common.apiclient.exceptions import AuthorizationFailure
+from keystoneauth1.exceptions import Unauthorized
 from ovm_ironic.manager.abstract_manager_ironic import AbstractManagerIronic
+from ovm_ironic.shared.keystone_session import KeystoneSession
 from ovm_ironic.shared.exceptions import LoginFailException
+from ovm_ironic.shared.retry_policy import RetryPolicy
 from ovm_ironic.shared import constants as const
 from ovm_ironic.shared import log as logging
 from ovm_ironic.shared import utils as utils
 from ovm_ironic.model.metric import Metric
-from ironicclient import client as ironic
 from ovm_ironic.model.node import Node
 
 LOG = logging.get_logger(__name__)
@@ -38,56 +40,42 @@ class ManagerIronic(AbstractManagerIronic):
     """
     def __init__(self, username, password, auth_url, tenant_name, api_version, insecure,
                  project_name, region_name, user_domain_id, project_domain_id, ironic_url,
-                 project_id, user_domain_name, project_domain_name, max_attempt=0, debug=False):
+                 project_id, user_domain_name, project_domain_name, max_attempt=0, debug=False,
+                 retry_policy=None, page_size=const.NODE_PAGE_SIZE, keystone_session=None):
         super(ManagerIronic, self).__init__()
         utils.print_log_message('Info', 'Initializing Ironic Manager...', LOG)
 
         self.__debug = debug
-        self.__username = username
-        self.__password = password
-        self.__auth_url = auth_url
-        self.__tenant_name = tenant_name
-        self.__insecure = insecure
-        self.__project_name = project_name
         self.__region_name = region_name
-        self.__user_domain_id = user_domain_id
-        self.__project_domain_id = project_domain_id
         self.__ironic_url = ironic_url
-        self.__project_id = project_id
-        self.__user_domain_name = user_domain_name
-        self.__project_domain_name = project_domain_name
         self.__api_version = api_version
         self.__max_attempt = int(max_attempt)
+        self.__retry_policy = retry_policy if retry_policy is not None else RetryPolicy('ironic')
+        self.__page_size = int(page_size)
+        self.__keystone_session = keystone_session if keystone_session is not None else \
+            KeystoneSession(auth_url, username, password, tenant_name, insecure, project_name,
+                            user_domain_id, project_domain_id, project_id, user_domain_name,
+                            project_domain_name, debug=debug)
 
     def _get_ironic_client(self):
-        """Provides an Ironic client according a configuration file
+        """Provides an Ironic client that uses the shared Keystone session.
 
         :returns: the Ironic client.
         """
-        kwargs = {
-            'os_username': self.__username,
-            'os_password': self.__password,
-            'os_auth_url': self.__auth_url,
-            'os_tenant_name': self.__tenant_name,
-            'os_ironic_api_version': self.__api_version,
-            'os_project_name': self.__project_name,
-            'os_region_name': self.__region_name,
-            'os_user_domain_id': self.__user_domain_id,
-            'os_project_domain_id': self.__project_domain_id,
-            'ironic_url': self.__ironic_url,
-            'os_project_id': self.__project_id,
-            'os_user_domain_name': self.__user_domain_name,
-            'os_project_domain_name': self.__project_domain_name
-        }
-
-        if self.__insecure.lower() == 'true':
-            kwargs['insecure'] = True
-
-        message = "Using OpenStack credentials specified in the configuration" \
-                  + " file to get Ironic Client"
+        message = "Using the Keystone session of the OpenStack credentials specified in" \
+                  + " the configuration file to get Ironic Client"
         utils.print_log_message('Debug', message, LOG, self.__debug)
 
-        return ironic.get_client(const.API_VERSION, **kwargs)
+        try:
+            return self.__keystone_session.get_client(
+                const.API_VERSION,
+                ironic_url=self.__ironic_url,
+                os_region_name=self.__region_name,
+                os_ironic_api_version=self.__api_version
+            )
+        except Unauthorized as ex:
+            utils.print_log_message('Error', ex.message)
+            raise LoginFailException("Cannot authorize connect to ironic API client.")
 
     def _get_node_list(self):
         """Gets a collection of nodes of the ironic client.
@@ -97,16 +85,157 @@ class ManagerIronic(AbstractManagerIronic):
         try:
             client = self._get_ironic_client()
             return client.node.list(detail=True)
-        except AuthorizationFailure as ex:
+        except (AuthorizationFailure, Unauthorized) as ex:
             utils.print_log_message('Error', ex.message)
             raise LoginFailException("Cannot authorize connect to ironic API client.")
         except:
             raise
 
-    def get_node_list(self):
-        """Call the function get_node_list encapsulate into try_execute function
+    def _get_node_page(self, client, driver, marker, newest_by=None):
+        """Gets a page of the nodes of a driver, with only the fields used by the discovery.
+
+        :param client: the Ironic client.
+        :param driver: the driver of the nodes.
+        :param marker: the uuid of the last node of the previous page, None for the first page.
+        :param newest_by: the time field (updated_at or created_at) to sort the nodes from
+        the newest, None to sort them by uuid.
+        :returns the list of nodes of the page.
+        """
+        if newest_by:
+            sort = {'sort_key': newest_by, 'sort_dir': 'desc'}
+        else:
+            sort = {'sort_key': 'uuid'}
+
+        try:
+            return client.node.list(driver=driver, fields=const.NODE_FIELDS, limit=self.__page_size,
+                                    marker=marker, **sort)
+        except (AuthorizationFailure, Unauthorized) as ex:
+            utils.print_log_message('Error', ex.message)
+            raise LoginFailException("Cannot authorize connect to ironic API client.")
+
+    def _iter_driver_pages(self, client, driver, newest_by=None):
+        """Gets the nodes of a driver page by page, each page encapsulated into
+        the retry policy of Ironic. A page is only requested when the nodes of
+        the previous one were taken.
+
+        :param client: the Ironic client.
+        :param driver: the driver of the nodes.
+        :param newest_by: the time field to sort the nodes from the newest, None to sort them
+        by uuid.
+        :returns a generator of the nodes.
         """
-        return utils.try_execute(self._get_node_list, self.__max_attempt, 2000)
+        marker = None
+        while True:
+            page = self.__retry_policy.execute(
+                self._get_node_page, self.__max_attempt, client, driver, marker, newest_by
+            )
+            for node in page:
+                yield node
+
+            if len(page) < self.__page_size:
+                return
+            marker = page[-1].uuid
+
+    def _iter_driver_nodes(self, client, driver, since):
+        """Gets the nodes of a driver page by page. When an update time is given,
+        the nodes are requested from the newest update and the paging stops at the
+        first node updated before it. The never updated nodes are sorted first or
+        last depending on the database, so they are requested apart, from the newest
+        creation, until the first node created before the update time.
+
+        :param client: the Ironic client.
+        :param driver: the driver of the nodes.
+        :param since: the update time of the oldest node to get, None to get all nodes.
+        :returns a generator of the nodes.
+        """
+        if since is None:
+            for node in self._iter_driver_pages(client, driver):
+                yield node
+            return
+
+        for node in self._iter_driver_pages(client, driver, 'updated_at'):
+            if node.updated_at is None:
+                continue
+            if node.updated_at < since:
+                break
+            yield node
+
+        for node in self._iter_driver_pages(client, driver, 'created_at'):
+            if node.created_at is None or node.created_at < since:
+                break
+            if node.updated_at is None:
+                yield node
+
+    def _iter_nodes(self, since=None):
+        """Gets the nodes of the supported drivers page by page.
+
+        :param since: the update time of the oldest node to get, None to get all nodes.
+        :returns a generator of the nodes.
+        """
+        client = self.__retry_policy.execute(self._get_ironic_client, self.__max_attempt)
+        for driver in const.SUPPORTED_DRIVERS:
+            for node in self._iter_driver_nodes(client, driver, since):
+                yield node
+
+    def _supports_projection(self):
+        """Checks if the Ironic API version filters the nodes by driver and projects its fields.
+        """
+        if str(self.__api_version).lower() == 'latest':
+            return True
+
+        try:
+            version = tuple(int(number) for number in str(self.__api_version).split('.'))
+        except ValueError:
+            return False
+
+        return version >= const.NODE_PROJECTION_API_VERSION
+
+    def get_node_list(self, since=None):
+        """Gets the nodes of the supported drivers, streamed page by page. If the
+        Ironic API version does not filter the nodes, all nodes are requested at
+        once, encapsulated into the retry policy of Ironic.
+
+        :param since: the update time of the oldest node to get, None to get all nodes.
+        :returns an iterable of the nodes.
+        """
+        if self._supports_projection():
+            return self._iter_nodes(since)
+
+        message = 'Ironic API version %s does not filter the nodes, requesting all of them' % \
+            self.__api_version
+        utils.print_log_message('Debug', message, LOG, self.__debug)
+        nodes = self.__retry_policy.execute(self._get_node_list, self.__max_attempt)
+        if since is None:
+            return nodes
+
+        # The never updated nodes are taken by its creation time
+        changed_nodes = []
+        for node in nodes:
+            changed_at = utils.extract_ironic_changed_at(node)
+            if changed_at is not None and changed_at >= since:
+                changed_nodes.append(node)
+        return changed_nodes
+
+    def get_node_associated_oneview(self, ironic_node):
+        """Gets the Node of the server hardware of an Ironic node.
+
+        :param ironic_node: an Ironic node.
+        :returns the Node, or None if the Ironic node is not associated to OneView.
+        """
+        if ironic_node.driver not in const.SUPPORTED_DRIVERS:
+            return None
+
+        oneview_uri = ironic_node.driver_info['server_hardware_uri']
+        server_hardware_uuid = utils.extract_oneview_uuid(oneview_uri)
+
+        dimensions = dict(const.TEMPLATE_DIMENSIONS)
+        dimensions['server_hardware_uuid'] = server_hardware_uuid
+        dimensions['service'] = const.SERVICE_NAME
+        dimensions['resource_id'] = utils.extract_ironic_uuid(ironic_node)
+
+        metrics = set()
+        metrics.add(Metric(const.METRIC_NAME, dimensions))
+        return Node(server_hardware_uuid, metrics)
 
     def get_nodes_associated_oneview(self, ironic_nodes):
         """Gets a set of Nodes of server hardware associated to HLM services.
@@ -118,18 +247,9 @@ class ManagerIronic(AbstractManagerIronic):
         interest_nodes = set()
         utils.print_log_message(
             'Debug', "Getting associated nodes from Ironic...", LOG, self.__debug)
-        for node in ironic_nodes:
-            if node.driver in const.SUPPORTED_DRIVERS:
-                oneview_uri = node.driver_info['server_hardware_uri']
-                server_hardware_uuid = utils.extract_oneview_uuid(oneview_uri)
-
-                dimensions = const.TEMPLATE_DIMENSIONS
-                dimensions['server_hardware_uuid'] = server_hardware_uuid
-                dimensions['service'] = const.SERVICE_NAME
-                dimensions['resource_id'] = utils.extract_ironic_uuid(node)
-
-                metrics = set()
-                metrics.add(Metric(const.METRIC_NAME, dimensions))
-                interest_nodes.add(Node(server_hardware_uuid, metrics))
+        for ironic_node in ironic_nodes:
+            node = self.get_node_associated_oneview(ironic_node)
+            if node is not None:
+                interest_nodes.add(node)
 
         return interest_nodes
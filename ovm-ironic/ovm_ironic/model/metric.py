@@ -19,25 +19,29 @@
 Representation of a Metric.
 """
 
+from ovm_ironic.model.dimensions import Dimensions
+
 
 class Metric(object):
     """This class represents a Metric.
 
     :param name: A string, the name of metric.
-    :param dimensions: A dict, the dimensions of metric.
+    :param dimensions: A dict, the dimensions of metric, kept as interned Dimensions.
     """
     def __init__(self, name, dimensions={}):
         self.name = name
-        self.dimensions = dimensions
+        self.dimensions = Dimensions.intern(dimensions)
 
     def __eq__(self, other):
         if isinstance(other, Metric):
-            return self.name == other.name and \
-                self.dimensions.items() == other.dimensions.items()
+            return self.name == other.name and self.dimensions == other.dimensions
         return False
 
+    def __ne__(self, other):
+        return not self == other
+
     def __hash__(self):
-        return hash(self.name)
+        return hash((self.name, self.dimensions))
 
     def __repr__(self):
         return 'name[%s], dimensions[%s]' % (
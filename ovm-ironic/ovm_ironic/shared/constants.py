@@ -38,3 +38,40 @@ TEMPLATE_DIMENSIONS = {
 SUPPORTED_DRIVERS = ["agent_pxe_oneview", "iscsi_pxe_oneview", "fake_oneview"]
 # API version of Ironic Client
 API_VERSION = 1
+
+''' RETRY POLICY '''
+# The backoff time (in milliseconds) before the first retry of a failed call,
+# doubled at each new retry.
+RETRY_BASE_WAIT = 1000
+# The max backoff time (in milliseconds) between two attempts of a call.
+RETRY_MAX_WAIT = 30000
+# The fraction of a retry that each call adds to the retry budget of its dependency.
+RETRY_BUDGET_RATIO = 0.2
+# The max number of retries kept in the retry budget of a dependency.
+RETRY_BUDGET_SIZE = 10
+# The number of consecutive failed calls to a dependency that opens its circuit
+# breaker. Use 0 to disable it.
+BREAKER_FAILURE_THRESHOLD = 5
+# The time (in seconds) that an open circuit breaker fails fast before letting a trial call through.
+BREAKER_RESET_TIMEOUT = 30
+# The value of each circuit breaker state in the breaker_state metric.
+BREAKER_STATES = {'closed': 0, 'half-open': 1, 'open': 2}
+# The HTTP status codes of a client error that are failures of the dependency
+# (timeout and throttling).
+RETRY_FAILURE_CLIENT_ERRORS = [408, 429]
+# The prefix of the names of the metrics published with the statistics of each retry policy.
+RETRY_METRIC_PREFIX = 'oneview.retry_policy.'
+
+''' NODE DISCOVERY '''
+# The fields of the Ironic nodes used by the discovery
+NODE_FIELDS = ['uuid', 'driver', 'driver_info', 'updated_at', 'created_at']
+# The max number of Ironic nodes requested at once
+NODE_PAGE_SIZE = 500
+# The min Ironic API version that filters the nodes by driver and returns only some fields
+NODE_PROJECTION_API_VERSION = (1, 16)
+# Seconds between two listings of all Ironic nodes, that catch the deleted nodes
+FULL_SYNC_INTERVAL = 600
+
+''' KEYSTONE SESSION '''
+# The attribute of the configuration with the Keystone session authenticated by its validation
+IRONIC_SESSION = 'ironic_session'
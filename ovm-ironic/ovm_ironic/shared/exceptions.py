@@ -25,3 +25,11 @@ class LoginFailException(Exception):
     """
     def __init__(self, message=None):
         Exception.__init__(self, message)
+
+
+class CircuitOpenException(Exception):
+    """ The exception class that is raised when a call fails fast because the circuit
+    breaker of its dependency is open.
+    """
+    def __init__(self, message=None):
+        Exception.__init__(self, message)
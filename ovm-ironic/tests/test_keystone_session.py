@@ -0,0 +1,86 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Unit test cases for the keystone_session.py module.
+"""
+
+from ovm_ironic.shared.keystone_session import KeystoneSession
+from tests.shared.config import ConfIronic
+from base import TestBase
+
+import mock
+
+
+class TestKeystoneSession(TestBase):
+    """This class test the keystone_session module from the ovm_ironic.shared.
+    """
+    def setUp(self):
+        super(TestKeystoneSession, self).setUp()
+
+        conf = ConfIronic()
+        self.keystone_session = KeystoneSession(
+            conf.auth_url, conf.admin_user, conf.admin_password, conf.admin_tenant_name,
+            conf.insecure
+        )
+
+    def tearDown(self):
+        super(TestKeystoneSession, self).tearDown()
+
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_get_session(self, mock_get_access):
+        """Test case regarding the token caching of the get_session method.
+                >>> Checks if the same session is returned by every call;
+                >>> Checks if the calls served by the cached token are counted as reuses; and,
+                >>> Checks if a new token (expired or rejected) is counted as an authentication.
+        """
+        token, renewed = mock.Mock(), mock.Mock()
+        mock_get_access.side_effect = [token, token, token, renewed]
+
+        session = self.keystone_session.get_session()
+        for _ in range(3):
+            self.assertIs(self.keystone_session.get_session(), session)
+
+        self.assertEqual(self.keystone_session.stats.get('authentications'), 2)
+        self.assertEqual(self.keystone_session.stats.get('reuses'), 2)
+
+    def test_get_session_shared(self):
+        """Test case regarding a session authenticated before the KeystoneSession.
+                >>> Checks if the session and its token are reused without an authentication.
+        """
+        session = mock.Mock()
+        session.auth.get_access.return_value = session.auth.auth_ref
+        keystone_session = KeystoneSession('http://127.0.0.1:5000/v2.0/', 'user', 'password',
+                                           session=session)
+
+        self.assertIs(keystone_session.get_session(), session)
+        self.assertEqual(keystone_session.stats.get('authentications'), 0)
+        self.assertEqual(keystone_session.stats.get('reuses'), 1)
+
+    @mock.patch("ironicclient.client.get_client")
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_get_client(self, mock_get_access, mock_get_client):
+        """Test case regarding the get_client method.
+                >>> Checks if the Ironic clients are created with the shared session.
+        """
+        self.keystone_session.get_client(1, os_ironic_api_version='1.16')
+        self.keystone_session.get_client(1, os_ironic_api_version='1.16')
+
+        session = self.keystone_session.get_session()
+        mock_get_client.assert_called_with(1, session=session, os_ironic_api_version='1.16')
+        self.assertEqual(mock_get_client.call_count, 2)
+        self.assertEqual(self.keystone_session.stats.get('authentications'), 1)
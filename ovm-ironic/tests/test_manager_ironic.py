@@ -38,14 +38,29 @@ class TestManagerIronic(TestBase):
         super(TestManagerIronic, self).setUp()
         conf = ConfIronic()
 
-        self.manager = ManagerIronic(
+        self.manager = self._create_manager(conf, conf.ironic_api_version)
+
+    @staticmethod
+    def _create_manager(conf, api_version, **kwargs):
+        """Creates a manager with the keystone v2 settings of the configuration.
+        """
+        return ManagerIronic(
             conf.admin_user,
             conf.admin_password,
             conf.auth_url,
             conf.admin_tenant_name,
-            conf.ironic_api_version,
+            api_version,
             conf.insecure,
-            max_attempt='2'
+            project_name=None,
+            region_name=None,
+            user_domain_id=None,
+            project_domain_id=None,
+            ironic_url=None,
+            project_id=None,
+            user_domain_name=None,
+            project_domain_name=None,
+            max_attempt='2',
+            **kwargs
         )
 
     def tearDown(self):
@@ -74,7 +89,8 @@ class TestManagerIronic(TestBase):
 
     @mock.patch("ironicclient.v1.node.NodeManager.list")
     @mock.patch("keystoneauth1.session.Session.get_endpoint")
-    def test_get_node_list(self, mock_get_endpoint, mock_node_list):
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_get_node_list(self, mock_get_access, mock_get_endpoint, mock_node_list):
 
         raised = False
         ironic_nodes = FakeNodeIronic.fake_get_node_list()
@@ -101,8 +117,73 @@ class TestManagerIronic(TestBase):
         self.assertEqual(result, ironic_nodes)
         self.assertTrue(mock_node_list.called)
 
+    @mock.patch("ironicclient.v1.node.NodeManager.list")
+    @mock.patch("keystoneauth1.session.Session.get_endpoint")
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_get_node_list_paged(self, mock_get_access, mock_get_endpoint, mock_node_list):
+        """Test case regarding the get_node_list method with the server-side filters.
+                >>> Checks if the nodes are requested by driver, with only the used fields;
+                >>> Checks if the next page starts after the last node of a full page; and,
+                >>> Checks if the nodes of all pages are streamed.
+        """
+        manager = self._create_manager(ConfIronic(), '1.16', page_size=2)
+        mock_get_endpoint.return_value = 'http://127.0.0.1:35357/v2.0'
+        first, second, third = [mock.Mock(uuid=str(number)) for number in range(3)]
+        mock_node_list.side_effect = [[first, second], [third]] + \
+            [[] for _ in const.SUPPORTED_DRIVERS[1:]]
+
+        nodes = manager.get_node_list()
+        self.assertFalse(mock_node_list.called)
+        self.assertEqual(list(nodes), [first, second, third])
+
+        driver = const.SUPPORTED_DRIVERS[0]
+        mock_node_list.assert_any_call(driver=driver, fields=const.NODE_FIELDS, limit=2,
+                                       marker=None, sort_key='uuid')
+        mock_node_list.assert_any_call(driver=driver, fields=const.NODE_FIELDS, limit=2,
+                                       marker=second.uuid, sort_key='uuid')
+        self.assertEqual(mock_node_list.call_count, len(const.SUPPORTED_DRIVERS) + 1)
+
+    @mock.patch("ironicclient.v1.node.NodeManager.list")
+    @mock.patch("keystoneauth1.session.Session.get_endpoint")
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_get_node_list_since(self, mock_get_access, mock_get_endpoint, mock_node_list):
+        """Test case regarding the get_node_list method with an update time.
+                >>> Checks if the nodes are requested from the newest update;
+                >>> Checks if the paging stops at the first node updated before the update time;
+                >>> Checks if the never updated nodes are requested from the newest creation; and,
+                >>> Checks if the paging stops at the first node created before the update time.
+        """
+        manager = self._create_manager(ConfIronic(), '1.16', page_size=3)
+        mock_get_endpoint.return_value = 'http://127.0.0.1:35357/v2.0'
+        newest = mock.Mock(uuid='1', updated_at='2017-01-01T10:05:00+00:00',
+                           created_at='2017-01-01T10:01:00+00:00')
+        never_updated = mock.Mock(uuid='2', updated_at=None, created_at='2017-01-01T10:03:00+00:00')
+        oldest = mock.Mock(uuid='3', updated_at='2017-01-01T09:00:00+00:00',
+                           created_at='2017-01-01T08:00:00+00:00')
+        old_never_updated = mock.Mock(uuid='4', updated_at=None,
+                                      created_at='2017-01-01T07:00:00+00:00')
+        mock_node_list.side_effect = [[newest, never_updated, oldest],
+                                      [never_updated, newest, oldest]] + \
+            [[] for _ in const.SUPPORTED_DRIVERS[1:] for _ in range(2)]
+
+        nodes = list(manager.get_node_list('2017-01-01T10:00:00+00:00'))
+        self.assertEqual(nodes, [newest, never_updated])
+        for sort_key in ['updated_at', 'created_at']:
+            mock_node_list.assert_any_call(driver=const.SUPPORTED_DRIVERS[0],
+                                           fields=const.NODE_FIELDS, limit=3, marker=None,
+                                           sort_key=sort_key, sort_dir='desc')
+        self.assertEqual(mock_node_list.call_count, 2 * len(const.SUPPORTED_DRIVERS))
+
+        manager = self._create_manager(ConfIronic(), '1.1')
+        with mock.patch.object(manager, '_get_node_list') as mock_get_node_list:
+            mock_get_node_list.return_value = [newest, never_updated, oldest, old_never_updated]
+            nodes = manager.get_node_list('2017-01-01T10:00:00+00:00')
+
+        self.assertEqual(nodes, [newest, never_updated])
+
     @mock.patch("keystoneauth1.session.Session.get_endpoint")
-    def test_get_ironic_client(self, mock_get_endpoint):
+    @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
+    def test_get_ironic_client(self, mock_get_access, mock_get_endpoint):
         mock_get_endpoint.return_value = 'http://127.0.0.1:35357/v2.0'
         client = self.manager._get_ironic_client()
 
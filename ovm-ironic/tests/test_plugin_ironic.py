@@ -24,6 +24,7 @@ from time import sleep
 from ovm_ironic.shared import utils
 from stevedore.extension import Extension
 from ovm_ironic.driver.ironic import DiscoveryNodeIronicProvider
+from ovm_ironic.model.node import Node
 
 from base import TestBase
 from tests.shared.config import Conf
@@ -100,6 +101,51 @@ class TestIronic(TestBase):
         ovm_ironic.stop()
         self.assertTrue(ovm_ironic._stopped)
 
+    def test_pull_nodes_incremental(self):
+        """Test case regarding the incremental pulling of the nodes.
+        Test flow:
+                >>> Pulls all nodes and checks if the interest nodes are available;
+                >>> Pulls the nodes updated since the watermark and checks if only the
+                changed node is notified;
+                >>> Pulls a never updated node and checks if its creation moves the watermark; and,
+                >>> Pulls all nodes again and checks if the deleted node is unavailable.
+        """
+        manager = mock.Mock()
+        manager.get_node_associated_oneview.side_effect = \
+            lambda ironic_node: Node(ironic_node.driver_info, set())
+        first = mock.Mock(uuid='1', driver_info='sh1', updated_at='2017-01-01T10:00:00+00:00')
+        second = mock.Mock(uuid='2', driver_info='sh2', updated_at='2017-01-01T11:00:00+00:00')
+        changed = mock.Mock(uuid='1', driver_info='sh3', updated_at='2017-01-01T12:00:00+00:00')
+
+        ovm_ironic = DiscoveryNodeIronicProvider(self.conf, manager_ironic=manager)
+        ovm_ironic.subscribe(self.fake_listener)
+        ovm_ironic._initialize()
+
+        manager.get_node_list.return_value = [first, second]
+        ovm_ironic._pull_nodes()
+        manager.get_node_list.assert_called_with(None)
+        self.assertEqual(self.fake_listener.nodes, {Node('sh1'), Node('sh2')})
+
+        manager.get_node_list.return_value = [changed]
+        ovm_ironic._pull_nodes()
+        manager.get_node_list.assert_called_with('2017-01-01T11:00:00+00:00')
+        self.assertEqual(self.fake_listener.nodes, {Node('sh2'), Node('sh3')})
+
+        created = mock.Mock(uuid='3', driver_info='sh4', updated_at=None,
+                            created_at='2017-01-01T13:00:00+00:00')
+        manager.get_node_list.return_value = [created]
+        ovm_ironic._pull_nodes()
+        manager.get_node_list.assert_called_with('2017-01-01T12:00:00+00:00')
+        self.assertEqual(self.fake_listener.nodes, {Node('sh2'), Node('sh3'), Node('sh4')})
+        self.assertEqual(ovm_ironic._watermark, '2017-01-01T13:00:00+00:00')
+
+        ovm_ironic._last_full_sync -= ovm_ironic._full_sync_interval
+        manager.get_node_list.return_value = [changed]
+        ovm_ironic._pull_nodes()
+        manager.get_node_list.assert_called_with(None)
+        self.assertEqual(self.fake_listener.nodes, {Node('sh3')})
+        self.assertEqual(ovm_ironic._watermark, '2017-01-01T13:00:00+00:00')
+
     def load_plugin(self):
         """Loads the plugin to make possible the test of the load_plugin_get_nodes method.
         """
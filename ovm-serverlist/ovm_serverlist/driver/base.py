@@ -38,6 +38,9 @@ class DiscoveryNodeProvider(object):
     def __init__(self, debug=False):
         self.debug = debug
         self.subscribers = {}
+        # The retry policies of the dependencies of the provider, whose statistics are
+        # published as metrics by the agent
+        self.retry_policies = []
 
     def subscribe(self, subscriber):
         """Subscribe a listener.
@@ -19,13 +19,18 @@
 
 from ovm_serverlist.manager.manager_server_list import ManagerServerList
 from ovm_serverlist.manager.manager_oneview import ManagerOneView
+from ovm_serverlist.manager.mac_index import MacIndex
 from ovm_serverlist.driver.base import DiscoveryNodeProvider
+from ovm_serverlist.shared.retry_policy import RetryPolicy
+from ovm_serverlist.shared import constants as const
 from ovm_serverlist.shared import utils as utils
 from ovm_serverlist.shared import log as logging
 
 from threading import Thread
 from threading import Lock
-from time import sleep
+
+import time
+import os
 
 LOG = logging.get_logger(__name__)
 
@@ -57,12 +62,16 @@ class DiscoveryNodeServerListProvider(DiscoveryNodeProvider, Thread):
 
         self._interest_nodes = set()
         self._retry_interval = int(self._conf.DEFAULT.retry_interval)
+        self._poll_interval = float(getattr(self._conf.serverlist, 'mac_file_poll_interval',
+                                            const.MAC_FILE_POLL_INTERVAL))
         if not self._manager_oneview:
             self._manager_oneview = ManagerOneView(
                 host=self._conf.oneview.host,
                 username=self._conf.oneview.username,
                 password=self._conf.oneview.password,
                 max_attempt=self._conf.DEFAULT.auth_retry_limit,
+                retry_policy=self._get_retry_policy('oneview', 'oneview'),
+                mac_index=self._get_mac_index()
             )
 
         self._manager_server_list = ManagerServerList(
@@ -73,6 +82,43 @@ class DiscoveryNodeServerListProvider(DiscoveryNodeProvider, Thread):
         # Loading from mac file
         self._manager_server_list.load_mac_file()
 
+    def _get_mac_index(self):
+        """Gets the persisted mac index, if its file is configured.
+        """
+        path = getattr(self._conf.serverlist, 'mac_index_file', None)
+        if not path:
+            return None
+
+        mac_index = MacIndex(
+            os.path.realpath(os.path.expanduser(path)),
+            rebuild_interval=getattr(self._conf.serverlist, 'mac_index_rebuild_interval',
+                                     const.MAC_INDEX_REBUILD_INTERVAL),
+            debug=self.debug
+        )
+        mac_index.load()
+        return mac_index
+
+    def _get_retry_policy(self, section, name):
+        """Gets the retry policy of a dependency configured in its section, kept
+        to publish its statistics.
+
+        :param section: the name of the configuration section of the dependency.
+        :param name: the name of the dependency.
+        """
+        settings = getattr(self._conf, section)
+        policy = RetryPolicy(
+            name,
+            base_wait=getattr(settings, 'retry_base_wait', const.RETRY_BASE_WAIT),
+            max_wait=getattr(settings, 'retry_max_wait', const.RETRY_MAX_WAIT),
+            budget_ratio=getattr(settings, 'retry_budget_ratio', const.RETRY_BUDGET_RATIO),
+            budget_size=getattr(settings, 'retry_budget_size', const.RETRY_BUDGET_SIZE),
+            failure_threshold=getattr(settings, 'breaker_failure_threshold',
+                                      const.BREAKER_FAILURE_THRESHOLD),
+            reset_timeout=getattr(settings, 'breaker_reset_timeout', const.BREAKER_RESET_TIMEOUT)
+        )
+        self.retry_policies.append(policy)
+        return policy
+
     def stop(self):
         """Stops the thread.
         """
@@ -88,11 +134,32 @@ class DiscoveryNodeServerListProvider(DiscoveryNodeProvider, Thread):
 
             # Starting Thread
             self._stopped = False
+            self.daemon = True
             self.start()
         except Exception as ex:
             message = 'Cannot starting server list plugin, fatal error caused by: %s.' % ex
             utils.print_log_message('Error', message, LOG)
 
+    def _notify(self, added_nodes, removed_nodes):
+        """Updates the interest nodes and notifies the subscribers. The removed
+        nodes are notified first, so a node whose dimensions changed (the same
+        server hardware in both sets) ends up available with its new metrics.
+
+        :param added_nodes: the nodes to be notified as available.
+        :param removed_nodes: the nodes to be notified as unavailable.
+        """
+        if removed_nodes:
+            self._interest_nodes.difference_update(removed_nodes)
+            self._lock.acquire()
+            self.unavailable(removed_nodes)
+            self._lock.release()
+
+        if added_nodes:
+            self._interest_nodes.update(added_nodes)
+            self._lock.acquire()
+            self.available(added_nodes)
+            self._lock.release()
+
     def _pull_nodes(self):
         """Verifies if exists changes in interest nodes and notify subscribers.
         """
@@ -102,31 +169,45 @@ class DiscoveryNodeServerListProvider(DiscoveryNodeProvider, Thread):
             interest_nodes = self._manager_server_list.get_nodes_associated_oneview()
 
             if interest_nodes != self._interest_nodes:
-                # Check if there new nodes to add in list of interest nodes
                 added_nodes = interest_nodes - self._interest_nodes
-                if added_nodes:
-                    self._interest_nodes.update(added_nodes)
-                    self._lock.acquire()
-                    self.available(added_nodes)
-                    self._lock.release()
-
-                # Check if there node to be removed from list of interest nodes
                 removed_nodes = self._interest_nodes - interest_nodes
-                if removed_nodes:
-                    self._interest_nodes.difference_update(removed_nodes)
-                    self._lock.acquire()
-                    self.unavailable(removed_nodes)
-                    self._lock.release()
+                self._notify(added_nodes, removed_nodes)
 
         except Exception as ex:
             self.stop()
             utils.print_log_message('Error', ex, LOG)
 
-    def run(self):
-        """Runs the thread.
+    def _reload_mac_file(self):
+        """Applies the changes of the mac file, notifying only the nodes added and removed.
         """
-        while True:
+        try:
+            if not self._manager_server_list.mac_file_changed():
+                return
+
+            added_nodes, removed_nodes = self._manager_server_list.reload_mac_file()
+
+            self._notify(added_nodes - self._interest_nodes, removed_nodes & self._interest_nodes)
+
+        except Exception as ex:
+            # The previous entries are kept until the mac file can be read again
+            utils.print_log_message('Error', 'Cannot reload the mac file: %s' % ex, LOG)
+
+    def _watch_mac_file(self):
+        """Polls the mac file for changes until the next pulling of the nodes.
+        """
+        if self._poll_interval <= 0 or self._stopped:
+            time.sleep(self._retry_interval)
+            return
+
+        deadline = time.time() + self._retry_interval
+        while not self._stopped and time.time() < deadline:
+            time.sleep(min(self._poll_interval, max(0, deadline - time.time())))
             if not self._stopped:
-                self._pull_nodes()
+                self._reload_mac_file()
 
-            sleep(self._retry_interval)
+    def run(self):
+        """Runs the thread.
+        """
+        while not self._stopped:
+            self._pull_nodes()
+            self._watch_mac_file()
@@ -38,3 +38,13 @@ class AbstractManagerOneView(object):
                 a resource. None otherwise.
         """
         raise NotImplementedError("NotImplementedException")
+
+    @abc.abstractmethod
+    def get_server_hardware_index(self):
+        """
+        Get the server hardware uuid of the mac of every resource associated.
+
+        :rtype: A dict: The server hardware uuid by normalized mac, as given by
+                utils.normalize_mac.
+        """
+        raise NotImplementedError("NotImplementedException")
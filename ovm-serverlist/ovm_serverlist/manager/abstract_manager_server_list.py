@@ -35,3 +35,11 @@ class AbstractManagerServerList(object):
         :rtype: A :set:`set <Nodes>`
         """
         raise NotImplementedError("NotImplementedException")
+
+    @abc.abstractmethod
+    def reload_mac_file(self):
+        """Read the mac file again, resolving only its added entries.
+
+        :rtype: A tuple with the :set:`set <Nodes>` added and removed.
+        """
+        raise NotImplementedError("NotImplementedException")
@@ -0,0 +1,166 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+Keeps the server hardware uuid of each mac in a local file.
+"""
+
+from ovm_serverlist.shared import constants as const
+from ovm_serverlist.shared import log as logging
+from ovm_serverlist.shared import utils as utils
+
+import json
+import time
+import zlib
+import os
+
+LOG = logging.get_logger(__name__)
+
+
+class MacIndex(object):
+    """
+    This class keeps the normalized macs of each server hardware and the
+    newest modified timestamp seen in the OneView inventory, persisted in a
+    json file with its checksum. Between two full rebuilds, the index is
+    updated only with the server hardware modified since that timestamp.
+    The server hardware removed from OneView are dropped at the next full
+    rebuild.
+    """
+    def __init__(self, path, rebuild_interval=const.MAC_INDEX_REBUILD_INTERVAL, debug=False):
+        self.__path = path
+        self.__rebuild_interval = int(rebuild_interval)
+        self.__debug = debug
+
+        self.__servers = {}
+        self.__macs = {}
+        self.__modified = None
+        self.__built = 0
+
+    @property
+    def modified(self):
+        """The newest modified timestamp of the indexed server hardware."""
+        return self.__modified
+
+    @property
+    def macs(self):
+        """A dict that maps each normalized mac to its server hardware uuid."""
+        return self.__macs
+
+    def needs_rebuild(self):
+        """Checks if the whole inventory must be indexed again.
+
+        :returns True if the index is empty, has no timestamp or its rebuild interval expired.
+        """
+        return not self.__servers or self.__modified is None or \
+            time.time() - self.__built >= self.__rebuild_interval
+
+    def load(self):
+        """Loads the index of the file, discarding it if it is unreadable or
+        its checksum does not match.
+        """
+        if not os.path.exists(self.__path):
+            return
+
+        try:
+            with open(self.__path, 'r') as index_file:
+                content = json.load(index_file)
+
+            if self._checksum(content['servers']) != content['checksum']:
+                utils.print_log_message('Warn', 'Discarding mac index with invalid checksum', LOG)
+                return
+
+            self.__servers = content['servers']
+            self.__modified = content['modified']
+            self.__built = content['built']
+            self._update_macs()
+
+            message = 'Loaded mac index with %d server hardware' % len(self.__servers)
+            utils.print_log_message('Info', message, LOG)
+        except (IOError, ValueError, KeyError, TypeError) as ex:
+            utils.print_log_message('Warn', 'Discarding unreadable mac index: %s' % ex, LOG)
+
+    def save(self):
+        """Writes the index in the file, replacing the previous one at once."""
+        content = {
+            'servers': self.__servers, 'modified': self.__modified, 'built': self.__built,
+            'checksum': self._checksum(self.__servers)
+        }
+
+        temporary = self.__path + '.tmp'
+        try:
+            with open(temporary, 'w') as index_file:
+                json.dump(content, index_file)
+                index_file.flush()
+                os.fsync(index_file.fileno())
+
+            os.rename(temporary, self.__path)
+        except (IOError, OSError) as ex:
+            # The index is still kept in memory
+            utils.print_log_message('Warn', 'Cannot write the mac index: %s' % ex, LOG)
+
+    def rebuild(self, servers, macs_of):
+        """Indexes the whole inventory again.
+
+        :param servers: the list of all server hardware dicts.
+        :param macs_of: a function that gives the macs of a server hardware dict.
+        :returns True, since the rebuild time changed.
+        """
+        self.__servers, self.__modified = {}, None
+        self.update(servers, macs_of)
+        self.__built = time.time()
+
+        message = 'Rebuilt mac index with %d server hardware' % len(self.__servers)
+        utils.print_log_message('Info', message, LOG)
+        return True
+
+    def update(self, servers, macs_of):
+        """Indexes the server hardware created or modified, replacing its previous macs.
+
+        :param servers: the list of server hardware dicts modified since the index timestamp.
+        :param macs_of: a function that gives the macs of a server hardware dict.
+        :returns True if the macs or the timestamp of the index changed.
+        """
+        changed = False
+        for server in servers:
+            macs = [utils.normalize_mac(mac) for mac in macs_of(server)]
+            if self.__servers.get(server['uuid']) != macs:
+                self.__servers[server['uuid']] = macs
+                changed = True
+
+            modified = server.get('modified')
+            if modified is not None and (self.__modified is None or modified > self.__modified):
+                self.__modified = modified
+                changed = True
+
+        if changed:
+            self._update_macs()
+        message = 'Updated mac index with %d server hardware' % len(servers)
+        utils.print_log_message('Debug', message, LOG, self.__debug)
+        return changed
+
+    def _update_macs(self):
+        """Maps each mac to its server hardware again."""
+        self.__macs = {}
+        for uuid in sorted(self.__servers):
+            for mac in self.__servers[uuid]:
+                self.__macs.setdefault(mac, uuid)
+
+    @staticmethod
+    def _checksum(servers):
+        """Gets the checksum of the indexed server hardware."""
+        return zlib.crc32(json.dumps(servers, sort_keys=True))
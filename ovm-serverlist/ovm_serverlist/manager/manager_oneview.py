@@ -21,6 +21,7 @@ Manages the OneView Component
 
 from ovm_serverlist.shared.exceptions import LoginFailException
 from ovm_serverlist.shared.exceptions import HTTPFailException
+from ovm_serverlist.shared.retry_policy import RetryPolicy
 from abstract_manager_oneview import AbstractManagerOneView
 from ovm_serverlist.shared import constants as const
 from ovm_serverlist.shared import log as logging
@@ -36,40 +37,29 @@ class ManagerOneView(AbstractManagerOneView):
     """
     The OneView Manager.
     """
-    def __init__(self, host, username, password, max_attempt=1):
+    def __init__(self, host, username, password, max_attempt=1, retry_policy=None, mac_index=None):
         super(ManagerOneView, self).__init__()
 
         self.__host = host
         self.__username = username
         self.__password = password
         self.__max_attempt = int(max_attempt)
+        self.__retry_policy = retry_policy if retry_policy is not None else RetryPolicy('oneview')
+        # With a persisted mac index, only the modified server hardware are downloaded
+        self.__mac_index = mac_index
 
-    def _get_server_hardware_uuid(self, mac):
-        """Gets the  server hardware based on the mac of any associated resource.
+    def _get_server_hardware_list(self, query_filter=''):
+        """Gets the server hardware inventory of the OneView appliance.
 
-        :param mac: A string, the MAC's name.
-        :rtype: a String with the server hardware uuid associated to the mac
-                None if the mac does not have a server hardware uuid.
+        :param query_filter: A OneView filter of the server hardware, all by default.
+        :rtype: a list with the server hardware dicts.
         """
         try:
             client = OneViewClient({
                 'ip': self.__host,
                 'credentials': {'userName': self.__username, 'password': self.__password}
             })
-            servers = client.server_hardware.get_all()
-            for server in servers:
-                if server and server['portMap'] and server['portMap']['deviceSlots']:
-                    for slot in server['portMap']['deviceSlots']:
-                        if slot['physicalPorts']:
-                            for port in slot['physicalPorts']:
-                                if mac == port['mac']:
-                                    return server['uuid']
-                                elif port['virtualPorts']:
-                                    for vport in port['virtualPorts']:
-                                        if mac == vport['mac']:
-                                            return server['uuid']
-
-            return None
+            return client.server_hardware.get_all(filter=query_filter)
 
         except HPOneViewException as hpex:
             if const.HTTP_ERROR_400 in str(hpex):
@@ -88,7 +78,72 @@ class ManagerOneView(AbstractManagerOneView):
             utils.print_log_message('Error', 'Critical Error >>>>>>> %s' % str(ex), LOG)
             raise
 
+    @staticmethod
+    def _get_server_hardware_macs(server):
+        """Gets the macs of the physical and virtual ports of a server hardware.
+
+        :param server: A server hardware dict.
+        :rtype: a generator of the macs, in the order of its ports.
+        """
+        if server and server['portMap'] and server['portMap']['deviceSlots']:
+            for slot in server['portMap']['deviceSlots']:
+                if slot['physicalPorts']:
+                    for port in slot['physicalPorts']:
+                        yield port['mac']
+                        if port['virtualPorts']:
+                            for vport in port['virtualPorts']:
+                                yield vport['mac']
+
+    def _get_server_hardware_uuid(self, mac):
+        """Gets the  server hardware based on the mac of any associated resource.
+
+        :param mac: A string, the MAC's name.
+        :rtype: a String with the server hardware uuid associated to the mac
+                None if the mac does not have a server hardware uuid.
+        """
+        mac = utils.normalize_mac(mac)
+        for server in self._get_server_hardware_list():
+            for server_mac in self._get_server_hardware_macs(server):
+                if mac == utils.normalize_mac(server_mac):
+                    return server['uuid']
+
+        return None
+
+    def _get_server_hardware_index(self):
+        """Gets the server hardware uuid of every mac, downloading the inventory once.
+        With a persisted mac index, only the server hardware modified since the last
+        download are requested, until the index must be rebuilt.
+
+        :rtype: a dict that maps each normalized mac to its server hardware uuid.
+        """
+        if self.__mac_index is not None:
+            if self.__mac_index.needs_rebuild():
+                changed = self.__mac_index.rebuild(
+                    self._get_server_hardware_list(), self._get_server_hardware_macs
+                )
+            else:
+                query_filter = const.SERVER_HARDWARE_MODIFIED_FILTER % self.__mac_index.modified
+                changed = self.__mac_index.update(
+                    self._get_server_hardware_list(query_filter), self._get_server_hardware_macs
+                )
+
+            if changed:
+                self.__mac_index.save()
+            return self.__mac_index.macs
+
+        index = {}
+        for server in self._get_server_hardware_list():
+            for server_mac in self._get_server_hardware_macs(server):
+                index.setdefault(utils.normalize_mac(server_mac), server['uuid'])
+
+        return index
+
     def get_server_hardware_uuid(self, mac):
-        """Call the function get_server_hardware_uuid encapsulate into try_execute function
+        """Call the function get_server_hardware_uuid encapsulate into the retry policy of OneView
+        """
+        return self.__retry_policy.execute(self._get_server_hardware_uuid, self.__max_attempt, mac)
+
+    def get_server_hardware_index(self):
+        """Call the function get_server_hardware_index encapsulate into the retry policy of OneView
         """
-        return utils.try_execute(self._get_server_hardware_uuid, self.__max_attempt, 2000, mac)
+        return self.__retry_policy.execute(self._get_server_hardware_index, self.__max_attempt)
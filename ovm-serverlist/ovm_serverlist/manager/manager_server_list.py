@@ -27,9 +27,13 @@ from ovm_serverlist.shared import constants as const
 from ovm_serverlist.manager.abstract_manager_server_list import AbstractManagerServerList
 
 import yaml
+import os
 
 LOG = logging.get_logger(__name__)
 
+# The C YAML loader is used when libyaml is available
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 class ManagerServerList(AbstractManagerServerList):
     """
@@ -47,6 +51,10 @@ class ManagerServerList(AbstractManagerServerList):
         self.__manager_oneview = manager_oneview
         self.__debug = debug
         self.__servers = []
+        # The node of each mac file entry, None if its mac is not associated to a server hardware
+        self.__nodes = {}
+        self.__mac_file_stat = None
+        self.__mac_file_checked = None
 
     def load_mac_file(self):
         """ Load a list of dicts. Each dict have two keys: 'mac-adrr' that will
@@ -54,20 +62,61 @@ class ManagerServerList(AbstractManagerServerList):
         metric.
         """
         try:
-            with open(self.__mac_file_path, 'r') as mac_file:
-                mac_file_loaded = yaml.safe_load(mac_file)
-                if mac_file_loaded:
-                    servers = mac_file_loaded['servers']
-                else:
-                    servers = []
-
-                mac_file.close()
-                utils.print_log_message('Debug', 'Reading successful mac file', LOG, self.__debug)
-                self.__servers = servers
+            self.__servers = self._read_mac_file()
+            utils.print_log_message('Debug', 'Reading successful mac file', LOG, self.__debug)
         except IOError as ex:
             utils.print_log_message('Error', 'Error reading the mac file: %s.' % ex, LOG)
             raise
 
+    def mac_file_changed(self):
+        """Checks if the mac file was modified since it was read. A file still
+        being written is not reported, its modification time and size must be
+        the same of the previous check.
+
+        :returns True if its modification time or size changed.
+        """
+        try:
+            stat = os.stat(self.__mac_file_path)
+        except OSError:
+            return False
+
+        checked, self.__mac_file_checked = self.__mac_file_checked, (stat.st_mtime, stat.st_size)
+        return checked == self.__mac_file_checked != self.__mac_file_stat
+
+    def reload_mac_file(self):
+        """Reads the mac file again and resolves only the entries added since
+        the previous read. The nodes of the unchanged entries are kept.
+
+        :returns a tuple with the set of nodes added and the set of nodes removed.
+        """
+        previous = dict((self._entry_key(server), server) for server in self.__servers)
+        servers = self._read_mac_file()
+        current = dict((self._entry_key(server), server) for server in servers)
+
+        added_keys = [key for key in current if key not in previous]
+        removed_keys = [key for key in previous if key not in current]
+
+        # The nodes still given by another entry are neither added nor removed
+        kept_nodes = set(node for key, node in self.__nodes.items() if key in current and node)
+        removed_nodes = set(self.__nodes.pop(key, None) for key in removed_keys) - kept_nodes
+        removed_nodes.discard(None)
+
+        added_nodes = set()
+        if added_keys:
+            index = self.__manager_oneview.get_server_hardware_index()
+            for key in added_keys:
+                node = self._resolve(current[key], index)
+                self.__nodes[key] = node
+                if node and node not in kept_nodes:
+                    added_nodes.add(node)
+
+        self.__servers = servers
+        message = 'Reloaded mac file: %(added)d entries added and %(removed)d removed' % {
+            'added': len(added_keys), 'removed': len(removed_keys)
+        }
+        utils.print_log_message('Info', message, LOG)
+        return added_nodes, removed_nodes
+
     def get_nodes_associated_oneview(self):
         """Get a set of Nodes of server hardware associated to HLM services.
 
@@ -77,15 +126,53 @@ class ManagerServerList(AbstractManagerServerList):
         message = 'Initialize get_nodes_associated_oneview method'
         utils.print_log_message('Info', message, LOG)
         nodes = set()
+        self.__nodes = {}
+        if not self.__servers:
+            return nodes
 
-        for mac in self.__servers:
-            server_hardware_uuid = self.__manager_oneview.get_server_hardware_uuid(mac['mac-addr'])
-            if server_hardware_uuid:
-                dimensions = {str(k): str(v) for k, v in mac['dimensions'].items()}
-                dimensions['server_hardware_uuid'] = server_hardware_uuid
-
-                metrics = set()
-                metrics.add(Metric(const.METRIC_NAME, dimensions))
-                nodes.add(Node(server_hardware_uuid, metrics))
+        # A single inventory download resolves all macs of the mac file
+        index = self.__manager_oneview.get_server_hardware_index()
+        for server in self.__servers:
+            node = self._resolve(server, index)
+            self.__nodes[self._entry_key(server)] = node
+            if node:
+                nodes.add(node)
 
         return nodes
+
+    def _read_mac_file(self):
+        """Parses the mac file, keeping its modification time and size.
+
+        :returns the list of server dicts of the mac file.
+        """
+        with open(self.__mac_file_path, 'r') as mac_file:
+            stat = os.fstat(mac_file.fileno())
+            mac_file_loaded = yaml.load(mac_file, Loader=YAML_LOADER)
+
+        self.__mac_file_stat = (stat.st_mtime, stat.st_size)
+        return mac_file_loaded['servers'] if mac_file_loaded else []
+
+    @staticmethod
+    def _resolve(server, index):
+        """Gets the node of a mac file entry.
+
+        :param server: A server dict of the mac file.
+        :param index: A dict that maps each normalized mac to its server hardware uuid.
+        :returns the node, or None if the mac is not associated to a server hardware.
+        """
+        server_hardware_uuid = index.get(utils.normalize_mac(server['mac-addr']))
+        if not server_hardware_uuid:
+            return None
+
+        dimensions = {str(k): str(v) for k, v in server['dimensions'].items()}
+        dimensions['server_hardware_uuid'] = server_hardware_uuid
+
+        metrics = set()
+        metrics.add(Metric(const.METRIC_NAME, dimensions))
+        return Node(server_hardware_uuid, metrics)
+
+    @staticmethod
+    def _entry_key(server):
+        """Gets the key that identifies a mac file entry by its mac and dimensions."""
+        dimensions = tuple(sorted((str(k), str(v)) for k, v in server['dimensions'].items()))
+        return utils.normalize_mac(server['mac-addr']), dimensions
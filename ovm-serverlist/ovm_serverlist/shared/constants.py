@@ -39,3 +39,38 @@ TEMPLATE_DIMENSIONS = {
 LOGIN_FAILED = 'Invalid username or password or directory.'
 # Error 400
 HTTP_ERROR_400 = 'response: 400'
+
+''' RETRY POLICY '''
+# The backoff time (in milliseconds) before the first retry of a failed call,
+# doubled at each new retry.
+RETRY_BASE_WAIT = 1000
+# The max backoff time (in milliseconds) between two attempts of a call.
+RETRY_MAX_WAIT = 30000
+# The fraction of a retry that each call adds to the retry budget of its dependency.
+RETRY_BUDGET_RATIO = 0.2
+# The max number of retries kept in the retry budget of a dependency.
+RETRY_BUDGET_SIZE = 10
+# The number of consecutive failed calls to a dependency that opens its circuit
+# breaker. Use 0 to disable it.
+BREAKER_FAILURE_THRESHOLD = 5
+# The time (in seconds) that an open circuit breaker fails fast before letting a trial call through.
+BREAKER_RESET_TIMEOUT = 30
+# The value of each circuit breaker state in the breaker_state metric.
+BREAKER_STATES = {'closed': 0, 'half-open': 1, 'open': 2}
+# The HTTP status codes of a client error that are failures of the dependency
+# (timeout and throttling).
+RETRY_FAILURE_CLIENT_ERRORS = [408, 429]
+# The prefix of the names of the metrics published with the statistics of each retry policy.
+RETRY_METRIC_PREFIX = 'oneview.retry_policy.'
+
+''' MAC INDEX '''
+# The time (in seconds) between two downloads of the whole server hardware
+# inventory, when the mac index is persisted.
+MAC_INDEX_REBUILD_INTERVAL = 3600
+# The filter of the server hardware modified at or after a timestamp. The server hardware
+# modified at the timestamp itself are indexed again, so none of the same tick is missed.
+SERVER_HARDWARE_MODIFIED_FILTER = "modified>='%s'"
+
+''' MAC FILE '''
+# The time (in seconds) between two checks of the mac file for changes.
+MAC_FILE_POLL_INTERVAL = 5
@@ -32,3 +32,11 @@ class HTTPFailException(Exception):
     """
     def __init__(self, message=None):
         Exception.__init__(self, message)
+
+
+class CircuitOpenException(Exception):
+    """ The exception class that is raised when a call fails fast because the circuit
+    breaker of its dependency is open.
+    """
+    def __init__(self, message=None):
+        Exception.__init__(self, message)
@@ -0,0 +1,89 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Thread safe counters used by the components to expose its internal statistics.
+"""
+
+from threading import Lock
+
+
+class Stats(object):
+    """
+    This class represents a named group of counters and gauges that can be
+    shared between threads.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._values = {}
+
+    def increment(self, name, value=1):
+        """ Increment a counter.
+
+        :param name: the name of the counter.
+        :param value: the value to be added to the counter.
+        """
+        self._lock.acquire()
+        self._values[name] = self._values.get(name, 0) + value
+        self._lock.release()
+
+    def set(self, name, value):
+        """ Set the current value of a gauge.
+
+        :param name: the name of the gauge.
+        :param value: the new value of the gauge.
+        """
+        self._lock.acquire()
+        self._values[name] = value
+        self._lock.release()
+
+    def observe(self, name, value):
+        """ Record a sample of a measure, keeping its count, total, max and last values.
+
+        :param name: the name of the measure.
+        :param value: the sampled value.
+        """
+        self._lock.acquire()
+        self._values[name + '.count'] = self._values.get(name + '.count', 0) + 1
+        self._values[name + '.total'] = self._values.get(name + '.total', 0) + value
+        self._values[name + '.max'] = max(self._values.get(name + '.max', value), value)
+        self._values[name + '.last'] = value
+        self._lock.release()
+
+    def get(self, name, default=0):
+        """ Get the current value of a counter or gauge.
+
+        :param name: the name of the counter or gauge.
+        :param default: the value returned if nothing was recorded yet.
+        """
+        self._lock.acquire()
+        value = self._values.get(name, default)
+        self._lock.release()
+        return value
+
+    def snapshot(self):
+        """ Get a copy of all current values.
+
+        :return: a dict that maps each name to its current value.
+        """
+        self._lock.acquire()
+        values = dict(self._values)
+        self._lock.release()
+        return values
+
+    def __repr__(self):
+        return ', '.join('%s=%s' % (name, value) for name, value in sorted(self.snapshot().items()))
@@ -36,3 +36,26 @@ class FakeComponentListener(DiscoveryNodeSubscriber):
         :param nodes: nodes collection to be unavailable.
         """
         self.nodes.difference_update(nodes)
+
+
+class FakeKeeperListener(DiscoveryNodeSubscriber):
+    """Simulates the Keeper of oneview-monasca, that keeps the metrics of each
+    server hardware and forgets the whole server hardware when it is unavailable.
+    """
+    def __init__(self):
+        DiscoveryNodeSubscriber.__init__(self)
+        self.metrics = {}
+
+    def available(self, nodes):
+        """Keeps the metrics of the nodes.
+        :param nodes: nodes collection to be available.
+        """
+        for node in nodes:
+            self.metrics[node.server_hardware_uuid] = node.metrics
+
+    def unavailable(self, nodes):
+        """Forgets the server hardware of the nodes.
+        :param nodes: nodes collection to be unavailable.
+        """
+        for node in nodes:
+            del self.metrics[node.server_hardware_uuid]
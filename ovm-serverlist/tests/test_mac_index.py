@@ -0,0 +1,116 @@
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Unit test cases for the mac_index.py module.
+"""
+
+from ovm_serverlist.manager.manager_oneview import ManagerOneView
+from ovm_serverlist.manager.mac_index import MacIndex
+
+from base import TestBase
+
+import tempfile
+import shutil
+import json
+import os
+
+
+class TestMacIndex(TestBase):
+    """This class test the mac_index module from the ovm_serverlist.manager.
+    """
+    def setUp(self):
+        """Setting up the server hardware used by the tests.
+        """
+        super(TestMacIndex, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'mac-index.json')
+        self.macs_of = ManagerOneView._get_server_hardware_macs
+        self.servers = [
+            self._server('uuid_1', 'aa:00:00:00:00:01', '2017-01-01T10:00:00.000Z'),
+            self._server('uuid_2', 'aa:00:00:00:00:02', '2017-01-01T11:00:00.000Z')
+        ]
+
+    def tearDown(self):
+        """Tearing down the tests.
+        """
+        super(TestMacIndex, self).tearDown()
+        shutil.rmtree(self.directory)
+
+    def test_rebuild_and_update(self):
+        """Test cases regarding the rebuild and update methods of the mac index.
+        Test flow:
+                >>> Rebuild an index with two server hardware;
+                >>> Update it with a modified server hardware, with a new mac;
+                >>> Verify if the old mac is removed and the timestamp moves forward;
+                >>> Update it again with the same server hardware and verify if nothing changed.
+        """
+        index = MacIndex(self.path)
+        self.assertTrue(index.needs_rebuild())
+
+        index.rebuild(self.servers, self.macs_of)
+        self.assertFalse(index.needs_rebuild())
+        self.assertEqual(index.modified, '2017-01-01T11:00:00.000Z')
+        self.assertEqual(index.macs, {'AA:00:00:00:00:01': 'uuid_1', 'AA:00:00:00:00:02': 'uuid_2'})
+
+        modified = self._server('uuid_1', 'bb:00:00:00:00:01', '2017-01-01T12:00:00.000Z')
+        self.assertTrue(index.update([modified], self.macs_of))
+        self.assertEqual(index.modified, '2017-01-01T12:00:00.000Z')
+        self.assertEqual(index.macs, {'BB:00:00:00:00:01': 'uuid_1', 'AA:00:00:00:00:02': 'uuid_2'})
+
+        self.assertFalse(index.update([modified], self.macs_of))
+        self.assertFalse(index.update([], self.macs_of))
+
+        self.assertTrue(MacIndex(self.path, rebuild_interval=0).needs_rebuild())
+
+    def test_save_and_load(self):
+        """Test cases regarding the persistence of the mac index.
+        Test flow:
+                >>> Save an index and load it in a new one;
+                >>> Verify if the new one has the same macs and does not need a rebuild;
+                >>> Corrupt the file and verify if it is discarded.
+        """
+        index = MacIndex(self.path)
+        index.rebuild(self.servers, self.macs_of)
+        index.save()
+
+        loaded = MacIndex(self.path)
+        loaded.load()
+        self.assertEqual(loaded.macs, index.macs)
+        self.assertEqual(loaded.modified, index.modified)
+        self.assertFalse(loaded.needs_rebuild())
+
+        with open(self.path) as index_file:
+            content = json.load(index_file)
+        content['servers']['uuid_3'] = ['AA:00:00:00:00:03']
+        with open(self.path, 'w') as index_file:
+            json.dump(content, index_file)
+
+        corrupted = MacIndex(self.path)
+        corrupted.load()
+        self.assertEqual(corrupted.macs, {})
+        self.assertTrue(corrupted.needs_rebuild())
+
+    @staticmethod
+    def _server(uuid, mac, modified):
+        """Builds a server hardware dict with a single port.
+        """
+        return {
+            'uuid': uuid, 'modified': modified,
+            'portMap': {'deviceSlots': [{'physicalPorts': [{'mac': mac, 'virtualPorts': []}]}]}
+        }
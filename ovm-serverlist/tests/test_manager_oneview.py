@@ -19,12 +19,16 @@ from base import TestBase
 from tests.shared.config import ConfOneview
 from ovm_serverlist.shared.exceptions import LoginFailException
 from ovm_serverlist.manager.manager_oneview import ManagerOneView
+from ovm_serverlist.manager.mac_index import MacIndex
 
 from hpOneView.exceptions import HPOneViewException
 from hpOneView.resources.servers.server_hardware import ServerHardware
 
+import tempfile
+import shutil
 import mock
 import uuid
+import os
 
 
 class TestManagerOneview(TestBase):
@@ -71,6 +75,63 @@ class TestManagerOneview(TestBase):
         expected_result = self.manager.get_server_hardware_uuid(mac2)
         self.assertEquals(sh_uuid2, expected_result)
 
+    @mock.patch('hpOneView.connection.login')
+    @mock.patch.object(ServerHardware, 'get_all')
+    def test_get_server_hardware_index(self, mock_get_all, mock_login):
+        sh_uuid1, sh_uuid2 = uuid.uuid4(), uuid.uuid4()
+        mock_get_all.return_value = [
+            {"portMap": {
+                "deviceSlots": [{
+                    "physicalPorts": [{
+                        "mac": 'aa:11:11:11:11:11',
+                        "virtualPorts": [{"mac": '22:22:22:22:22:22'}]}]}]},
+             "uuid": sh_uuid1},
+            {"portMap": {"deviceSlots": []}, "uuid": uuid.uuid4()},
+            {"portMap": {
+                "deviceSlots": [{
+                    "physicalPorts": [{
+                        "mac": '33:33:33:33:33:33', "virtualPorts": []}]}]},
+             "uuid": sh_uuid2},
+        ]
+        # test if all macs are indexed by a single inventory download
+        self.assertEqual(self.manager.get_server_hardware_index(), {
+            'AA:11:11:11:11:11': sh_uuid1,
+            '22:22:22:22:22:22': sh_uuid1,
+            '33:33:33:33:33:33': sh_uuid2
+        })
+        mock_get_all.assert_called_once_with(filter='')
+
+    @mock.patch('hpOneView.connection.login')
+    @mock.patch.object(ServerHardware, 'get_all')
+    def test_get_server_hardware_index_persisted(self, mock_get_all, mock_login):
+        directory = tempfile.mkdtemp()
+        mac_index = MacIndex(os.path.join(directory, 'mac-index.json'))
+        conf = ConfOneview()
+        manager = ManagerOneView(
+            host=conf.host, username=conf.username, password=conf.password, mac_index=mac_index
+        )
+        mock_get_all.return_value = [{
+            "portMap": {"deviceSlots": [{"physicalPorts": [{
+                "mac": '11:11:11:11:11:11', "virtualPorts": []}]}]},
+            "uuid": 'uuid_1', "modified": '2017-01-01T10:00:00.000Z'
+        }]
+        # test if the first index downloads the whole inventory
+        self.assertEqual(manager.get_server_hardware_index(), {'11:11:11:11:11:11': 'uuid_1'})
+        mock_get_all.assert_called_with(filter='')
+
+        # test if the next ones only download the server hardware modified since the newest
+        # timestamp, without writing the file again when nothing changed
+        with mock.patch.object(mac_index, 'save') as mock_save:
+            self.assertEqual(manager.get_server_hardware_index(), {'11:11:11:11:11:11': 'uuid_1'})
+            mock_get_all.assert_called_with(filter="modified>='2017-01-01T10:00:00.000Z'")
+            mock_save.assert_not_called()
+
+        # test if a restart loads the index from its file
+        restarted = MacIndex(os.path.join(directory, 'mac-index.json'))
+        restarted.load()
+        self.assertEqual(restarted.macs, {'11:11:11:11:11:11': 'uuid_1'})
+        shutil.rmtree(directory)
+
     @mock.patch('hpOneView.connection.login')
     @mock.patch.object(ServerHardware, 'get_all')
     def test_get_server_hardware_with_error(self, mock_get_all, mock_login):
@@ -73,8 +73,8 @@ class TestManagerServerList(TestBase):
 
         self.assertTrue(raised)
 
-    @mock.patch.object(ManagerOneView, 'get_server_hardware_uuid', return_value=None)
-    def test_mac_file_empty(self, mock_get_sh_uuid):
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index', return_value={})
+    def test_mac_file_empty(self, mock_get_sh_index):
         """Test if the manager work with existent, but empty mac file.
         Test flow:
                 >>> Write a empty mac file;
@@ -88,11 +88,12 @@ class TestManagerServerList(TestBase):
 
         manager = ManagerServerList(self.mac_file, self.ov_manager)
         self.assertEqual(manager.get_nodes_associated_oneview(), set([]))
+        mock_get_sh_index.assert_not_called()
 
         os.remove(self.mac_file)
 
-    @mock.patch.object(ManagerOneView, 'get_server_hardware_uuid')
-    def test_manager_get_nodes_associated_oneview(self, mock_get_sh_uuid):
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index')
+    def test_manager_get_nodes_associated_oneview(self, mock_get_sh_index):
         """Test if the manager can process a mac file and returns
         the correct set of nodes.
         Test flow:
@@ -101,7 +102,7 @@ class TestManagerServerList(TestBase):
                 >>> Run get_nodes_associated_oneview();
                 >>> Verify if it returns a correct set of nodes.
         """
-        sh_mac, sh_uuid = '00:00:00:00:00:00', uuid.uuid4()
+        sh_mac, sh_uuid = 'aa-00-00-00-00-00', uuid.uuid4()
 
         # Writing in mac_file
         with open(self.mac_file, 'w') as mac_file:
@@ -113,7 +114,7 @@ class TestManagerServerList(TestBase):
             )
             mac_file.close()
 
-        mock_get_sh_uuid.return_value = sh_uuid
+        mock_get_sh_index.return_value = {'AA:00:00:00:00:00': sh_uuid}
         manager = ManagerServerList(self.mac_file, self.ov_manager)
 
         manager.load_mac_file()
@@ -126,4 +127,65 @@ class TestManagerServerList(TestBase):
         expected_result = manager.get_nodes_associated_oneview()
 
         self.assertEqual(expected_result, {Node(sh_uuid, {metric})})
+        # The inventory is downloaded once per discovery, not once per mac
+        mock_get_sh_index.assert_called_once_with()
         os.remove(self.mac_file)
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index')
+    def test_reload_mac_file(self, mock_get_sh_index):
+        """Test if the manager reloads a changed mac file resolving only its
+        added entries.
+        Test flow:
+                >>> Write a mac file with two macs and get its nodes;
+                >>> Replace a mac by a new one in the mac file;
+                >>> Verify if the change is detected once the file is not being written;
+                >>> Verify if only the new mac is resolved and the nodes of the
+                replaced and new macs are returned.
+        """
+        mock_get_sh_index.return_value = {
+            '00:00:00:00:00:01': 'uuid_1',
+            '00:00:00:00:00:02': 'uuid_2',
+            '00:00:00:00:00:03': 'uuid_3'
+        }
+        self._write_mac_file(['00:00:00:00:00:01', '00:00:00:00:00:02'])
+
+        manager = ManagerServerList(self.mac_file, self.ov_manager)
+        manager.load_mac_file()
+        self.assertFalse(manager.mac_file_changed())
+        self.assertEqual(len(manager.get_nodes_associated_oneview()), 2)
+
+        self._write_mac_file(['00:00:00:00:00:01', '00:00:00:00:00:03', '00:00:00:00:00:04'])
+        # test if the change is reported only after a check without new changes
+        self.assertFalse(manager.mac_file_changed())
+        self.assertTrue(manager.mac_file_changed())
+
+        mock_get_sh_index.reset_mock()
+        added_nodes, removed_nodes = manager.reload_mac_file()
+
+        mock_get_sh_index.assert_called_once_with()
+        self.assertEqual(added_nodes, {self._node('uuid_3')})
+        self.assertEqual(removed_nodes, {self._node('uuid_2')})
+        self.assertFalse(manager.mac_file_changed())
+
+        # test if an unchanged mac file is not resolved again
+        mock_get_sh_index.reset_mock()
+        self.assertEqual(manager.reload_mac_file(), (set(), set()))
+        mock_get_sh_index.assert_not_called()
+        os.remove(self.mac_file)
+
+    def _write_mac_file(self, macs):
+        """Writes a mac file with the same dimensions for all macs.
+        """
+        with open(self.mac_file, 'w') as mac_file:
+            mac_file.write('servers:\n' + ''.join(
+                '- mac-addr: "%s"\n  dimensions:\n       service: "compute"\n' % mac for mac in macs
+            ))
+
+    @staticmethod
+    def _node(sh_uuid):
+        """Builds the node of a server hardware with the dimensions of the mac file.
+        """
+        metric = Metric(
+            'oneview.server_hardware', {'service': 'compute', 'server_hardware_uuid': sh_uuid}
+        )
+        return Node(sh_uuid, {metric})
@@ -25,6 +25,7 @@ from ovm_serverlist.shared import utils
 from stevedore.extension import Extension
 from ovm_serverlist.model.node import Node
 from ovm_serverlist.model.metric import Metric
+from tests.shared.fake import FakeKeeperListener
 from tests.shared.fake import FakeComponentListener
 from hpOneView.exceptions import HPOneViewException
 from ovm_serverlist.manager.manager_oneview import ManagerOneView
@@ -71,8 +72,8 @@ class TestServerList(TestBase):
         # test if it is an instance of DiscoveryNodeHLMProvider
         self.assertTrue(self.load_plugin() is DiscoveryNodeServerListProvider)
 
-    @mock.patch.object(ManagerOneView, 'get_server_hardware_uuid')
-    def test_pull_nodes(self, mock_get_sh_uuid):
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index')
+    def test_pull_nodes(self, mock_get_sh_index):
         """Test case regarding the instance after calling the load_plugin method.
         Test flow:
                 >>> Create a mac file;
@@ -101,7 +102,7 @@ class TestServerList(TestBase):
             )
             mac_file.close()
 
-        mock_get_sh_uuid.return_value = sh_uuid
+        mock_get_sh_index.return_value = {sh_mac: sh_uuid}
         server_list = DiscoveryNodeServerListProvider(self.conf)
 
         server_list.subscribe(self.fake_component)
@@ -114,7 +115,7 @@ class TestServerList(TestBase):
         )}
         self.assertIn(Node(sh_uuid, metrics), self.fake_component.nodes)
 
-        mock_get_sh_uuid.return_value = []
+        mock_get_sh_index.return_value = {}
 
         sleep(3)
         self.assertEqual(len(self.fake_component.nodes), 0)
@@ -122,8 +123,8 @@ class TestServerList(TestBase):
         server_list.stop()
         os.remove(self.mac_file)
 
-    @mock.patch.object(ManagerOneView, 'get_server_hardware_uuid')
-    def test_fail_pull_nodes(self, mock_get_sh_uuid):
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index')
+    def test_fail_pull_nodes(self, mock_get_sh_index):
         sh_mac = '00:00:00:00:00:00'
 
         # Writing in mac_file
@@ -135,7 +136,7 @@ class TestServerList(TestBase):
             )
             mac_file.close()
 
-        mock_get_sh_uuid.side_effect = HPOneViewException('response: 400')
+        mock_get_sh_index.side_effect = HPOneViewException('response: 400')
         server_list = DiscoveryNodeServerListProvider(self.conf)
 
         server_list.subscribe(self.fake_component)
@@ -145,6 +146,75 @@ class TestServerList(TestBase):
         self.assertTrue(server_list._stopped)
         self.assertEqual(len(self.fake_component.nodes), 0)
 
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index')
+    def test_reload_mac_file(self, mock_get_sh_index):
+        """Test case regarding the hot reload of the mac file.
+        Test flow:
+                >>> Create a mac file with a mac and discover its node;
+                >>> Replace the mac by another one in the mac file;
+                >>> Checks if the listener receives the new node and loses the old
+                one before the next pulling of the nodes.
+        """
+        sh_uuid1, sh_uuid2 = uuid.uuid4(), uuid.uuid4()
+        mock_get_sh_index.return_value = {
+            '00:00:00:00:00:01': sh_uuid1, '00:00:00:00:00:02': sh_uuid2
+        }
+
+        self._write_mac_file('00:00:00:00:00:01')
+        self.conf.DEFAULT.retry_interval = '60'
+        self.conf.serverlist.mac_file_poll_interval = '0.1'
+        server_list = DiscoveryNodeServerListProvider(self.conf)
+
+        server_list.subscribe(self.fake_component)
+        server_list.discover()
+        sleep(1)
+
+        nodes = [node.server_hardware_uuid for node in self.fake_component.nodes]
+        self.assertEqual(nodes, [sh_uuid1])
+
+        self._write_mac_file('00:00:00:00:00:02')
+        sleep(1)
+
+        nodes = [node.server_hardware_uuid for node in self.fake_component.nodes]
+        self.assertEqual(nodes, [sh_uuid2])
+        self.assertEqual(mock_get_sh_index.call_count, 2)
+
+        server_list.stop()
+        os.remove(self.mac_file)
+
+    @mock.patch.object(ManagerOneView, 'get_server_hardware_index')
+    def test_reload_mac_file_dimensions(self, mock_get_sh_index):
+        """Test case regarding the hot reload of the dimensions of an entry.
+        Test flow:
+                >>> Create a mac file with a mac and discover its node;
+                >>> Change the dimensions of the mac in the mac file; and,
+                >>> Checks if a listener that forgets the unavailable server hardware
+                still keeps it, with the new dimensions.
+        """
+        sh_uuid = uuid.uuid4()
+        mock_get_sh_index.return_value = {'00:00:00:00:00:01': sh_uuid}
+        keeper = FakeKeeperListener()
+
+        self._write_mac_file('00:00:00:00:00:01')
+        self.conf.DEFAULT.retry_interval = '60'
+        self.conf.serverlist.mac_file_poll_interval = '0.1'
+        server_list = DiscoveryNodeServerListProvider(self.conf)
+
+        server_list.subscribe(keeper)
+        server_list.discover()
+        sleep(1)
+        self.assertEqual(list(keeper.metrics), [sh_uuid])
+
+        self._write_mac_file('00:00:00:00:00:01', 'host_2')
+        sleep(1)
+
+        self.assertEqual(list(keeper.metrics), [sh_uuid])
+        dimensions = [metric.dimensions['hostname'] for metric in keeper.metrics[sh_uuid]]
+        self.assertEqual(dimensions, ['host_2'])
+
+        server_list.stop()
+        os.remove(self.mac_file)
+
     def test_error_to_load_mac_file(self):
         self.conf.serverlist.mac_file_path = '~/mac-file-test.yaml'
         server_list = DiscoveryNodeServerListProvider(self.conf)
@@ -156,6 +226,16 @@ class TestServerList(TestBase):
         self.assertTrue(server_list._stopped)
         self.assertEqual(len(self.fake_component.nodes), 0)
 
+    def _write_mac_file(self, mac, hostname='host_1'):
+        """Writes a mac file with a single mac.
+        """
+        with open(self.mac_file, 'w') as mac_file:
+            mac_file.write(
+                'servers:\n' +
+                '- mac-addr: "' + mac +
+                '"\n  dimensions:\n       service: "compute"\n       hostname: "' + hostname + '"'
+            )
+
     def load_plugin(self):
         """Loads the plugin to make possible the test of the load_plugin_get_nodes method.
         """
@@ -71,6 +71,15 @@ class TestUtils(TestBase):
             self.assertEqual(array, [10])
             self.assertFalse(utils.not_retry_if_login_fail(ex))
 
+    def test_normalize_mac(self):
+        """ Test cases regarding the normalize_mac method of the utils module
+            Test flow:
+                    >>> test if the macs separated by hyphens or in lower case are
+                    normalized to the same mac.
+        """
+        self.assertEqual(utils.normalize_mac('aa-bb-cc-00-11-22'), 'AA:BB:CC:00:11:22')
+        self.assertEqual(utils.normalize_mac(' aa:bb:cc:00:11:22 '), 'AA:BB:CC:00:11:22')
+
     @staticmethod
     def n_appends(element, array):
         """ Auxiliary function to test a retry decorator
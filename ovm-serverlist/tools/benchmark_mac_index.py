@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+# Copyright 2016 Universidade Federal de Campina Grande
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+Benchmark of the ServerList discovery, resolving the macs of a mac file one by
+one against the OneView inventory versus resolving them from a single index.
+
+The OneView appliance is simulated by a synthetic inventory, and each
+inventory download costs the given latency.
+
+Usage: python tools/benchmark_mac_index.py [--servers 1200] [--macs 800] [--latency 50]
+"""
+
+from ovm_serverlist.manager.manager_server_list import ManagerServerList
+from ovm_serverlist.manager.manager_oneview import ManagerOneView
+
+import argparse
+import tempfile
+import time
+import yaml
+import os
+
+
+class SyntheticManagerOneView(ManagerOneView):
+    """ A Manager OneView that downloads a synthetic inventory """
+    def __init__(self, servers, latency):
+        super(SyntheticManagerOneView, self).__init__('127.0.0.1', 'user', 'password')
+        self.downloads = 0
+        self._latency = latency
+        self._inventory = [{
+            'uuid': 'uuid-%d' % index,
+            'portMap': {'deviceSlots': [{'physicalPorts': [{
+                'mac': mac_address(index, 0),
+                'virtualPorts': [{'mac': mac_address(index, port)} for port in range(1, 4)]
+            }]}]}
+        } for index in range(servers)]
+
+    def _get_server_hardware_list(self, query_filter=''):
+        self.downloads += 1
+        time.sleep(self._latency)
+        return self._inventory
+
+
+def mac_address(index, port):
+    """ Get the mac of a port of a synthetic server hardware """
+    octets = (0x10, port, index >> 16 & 0xff, index >> 8 & 0xff, index & 0xff, 0)
+    return ':'.join('%02X' % octet for octet in octets)
+
+
+def per_mac(manager_oneview, servers):
+    """ Resolve each mac with its own inventory download, as before the index """
+    return [manager_oneview.get_server_hardware_uuid(server['mac-addr']) for server in servers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the ServerList mac resolution.')
+    parser.add_argument('--servers', type=int, default=1200,
+                        help='number of server hardware in OneView')
+    parser.add_argument('--macs', type=int, default=800, help='number of macs in the mac file')
+    parser.add_argument('--latency', type=float, default=50,
+                        help='milliseconds of each inventory download')
+    args = parser.parse_args()
+
+    # The macs in the mac file, spread over the inventory and in lower case
+    step = max(1, args.servers // args.macs)
+    servers = [{'mac-addr': mac_address(index * step % args.servers, index % 4).lower(),
+                'dimensions': {'hostname': 'host-%d' % index}} for index in range(args.macs)]
+
+    mac_file = tempfile.NamedTemporaryFile(suffix='.yaml', delete=False)
+    yaml.safe_dump({'servers': servers}, mac_file)
+    mac_file.close()
+
+    try:
+        manager_oneview = SyntheticManagerOneView(args.servers, args.latency / 1000)
+        start = time.time()
+        per_mac(manager_oneview, servers)
+        before, before_downloads = time.time() - start, manager_oneview.downloads
+
+        manager_oneview = SyntheticManagerOneView(args.servers, args.latency / 1000)
+        manager_server_list = ManagerServerList(mac_file.name, manager_oneview)
+        manager_server_list.load_mac_file()
+        start = time.time()
+        nodes = manager_server_list.get_nodes_associated_oneview()
+        after, after_downloads = time.time() - start, manager_oneview.downloads
+    finally:
+        os.remove(mac_file.name)
+
+    print('%d macs, %d server hardware, %d ms by inventory download' % (
+        args.macs, args.servers, args.latency))
+    print('%-10s %12s %12s' % ('', 'downloads', 'seconds'))
+    print('%-10s %12d %12.3f' % ('per mac', before_downloads, before))
+    print('%-10s %12d %12.3f' % ('index', after_downloads, after))
+    print('%d nodes resolved, %.1fx faster' % (len(nodes), before / after))
+
+
+if __name__ == '__main__':
+    main()